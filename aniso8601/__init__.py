@@ -6,8 +6,47 @@
 # This software may be modified and distributed under the terms
 # of the BSD license.  See the LICENSE file for details.
 
+import sys
+
 #Import the main parsing functions so they are readily available
 from aniso8601.time import parse_datetime, parse_time, get_time_resolution
-from aniso8601.date import parse_date, get_date_resolution
+from aniso8601.date import parse_date, get_date_resolution, classify_date
 from aniso8601.duration import parse_duration
-from aniso8601.interval import parse_interval, parse_repeating_interval
+from aniso8601.interval import parse_interval, parse_repeating_interval, Interval
+from aniso8601.batch import parse_date_many, parse_time_many, parse_datetime_many, parse_duration_many, DatetimeParser
+
+#The validators and try_parse_* functions are only imported once one of
+#them is used, so importing aniso8601 to parse doesn't pay for them, module
+#__getattr__ requires Python 3.7 or later
+_LAZY_MODULES = {
+    'validate_date': 'validate',
+    'validate_time': 'validate',
+    'validate_datetime': 'validate',
+    'validate_duration': 'validate',
+    'validate_interval': 'validate',
+    'try_parse_date': 'tryparse',
+    'try_parse_time': 'tryparse',
+    'try_parse_datetime': 'tryparse',
+    'try_parse_timezone': 'tryparse',
+    'try_parse_duration': 'tryparse',
+    'try_parse_interval': 'tryparse'
+}
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name not in _LAZY_MODULES:
+            raise AttributeError('module \'aniso8601\' has no attribute \'{0}\''.format(name))
+
+        module = __import__('aniso8601.' + _LAZY_MODULES[name], fromlist=[name])
+        value = getattr(module, name)
+
+        #Later lookups find it without calling __getattr__
+        globals()[name] = value
+
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY_MODULES))
+else:
+    from aniso8601.validate import validate_date, validate_time, validate_datetime, validate_duration, validate_interval
+    from aniso8601.tryparse import try_parse_date, try_parse_time, try_parse_datetime, try_parse_timezone, try_parse_duration, try_parse_interval
@@ -0,0 +1,988 @@
+/*
+ * -*- coding: utf-8 -*-
+ *
+ * Copyright (c) 2016, Brandon Nielsen
+ * All rights reserved.
+ *
+ * This software may be modified and distributed under the terms
+ * of the BSD license.  See the LICENSE file for details.
+ */
+
+/*
+ * Compiled parsers for the common ISO 8601 date, time, date time and UTC
+ * offset formats, see speedups.py.
+ *
+ * Every parser returns None for a string it doesn't handle, including every
+ * invalid string, in which case the pure Python parser is used, so the
+ * results, and the exceptions raised, are always the same. Only ASCII str,
+ * and bytes-like objects, which are read in place, with two digit time
+ * elements and fractions of at most nine digits, are handled.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <datetime.h>
+
+#if PY_MAJOR_VERSION < 3
+#error "aniso8601._speedups requires Python 3"
+#endif
+
+#define MAX_FRACTION_DIGITS 9
+#define DAY_MICROSECONDS 86400000000LL
+
+/* date(9999, 12, 31).toordinal() */
+#define MAX_ORDINAL 3652059
+
+/* date(1970, 1, 1).toordinal() */
+#define EPOCH_ORDINAL 719163
+
+static const int month_days[13] = {0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31};
+
+typedef struct {
+    int year;
+    int month;
+    int day;
+} date_fields;
+
+typedef struct {
+    int hour;
+    int minute;
+    int second;
+    int microsecond;
+    const char *tz;
+    Py_ssize_t tzlength;
+} time_fields;
+
+/* Reads length ASCII digits, returns -1 if any character isn't a digit */
+static int
+read_digits(const char *text, Py_ssize_t length, long long *value)
+{
+    Py_ssize_t index;
+
+    *value = 0;
+
+    for (index = 0; index < length; index++) {
+        if (text[index] < '0' || text[index] > '9') {
+            return -1;
+        }
+
+        *value = *value * 10 + (text[index] - '0');
+    }
+
+    return 0;
+}
+
+static int
+read_int(const char *text, Py_ssize_t length, int *value)
+{
+    long long result;
+
+    if (read_digits(text, length, &result) == -1) {
+        return -1;
+    }
+
+    *value = (int)result;
+
+    return 0;
+}
+
+static int
+is_leap(int year)
+{
+    return year % 4 == 0 && (year % 100 != 0 || year % 400 == 0);
+}
+
+static int
+days_in_month(int year, int month)
+{
+    if (month == 2 && is_leap(year)) {
+        return 29;
+    }
+
+    return month_days[month];
+}
+
+/* The proleptic Gregorian ordinal of the first day of the year, as
+ * date.toordinal */
+static long
+year_ordinal(int year)
+{
+    long previous = year - 1;
+
+    return previous * 365 + previous / 4 - previous / 100 + previous / 400 + 1;
+}
+
+/* Sets the fields from a proleptic Gregorian ordinal, as date.fromordinal */
+static void
+set_from_ordinal(date_fields *fields, long ordinal)
+{
+    int year = (int)((ordinal - 1) / 366) + 1;
+    int month = 1;
+    long day;
+
+    while (year < 9999 && year_ordinal(year + 1) <= ordinal) {
+        year++;
+    }
+
+    day = ordinal - year_ordinal(year) + 1;
+
+    while (day > days_in_month(year, month)) {
+        day -= days_in_month(year, month);
+        month++;
+    }
+
+    fields->year = year;
+    fields->month = month;
+    fields->day = (int)day;
+}
+
+static int
+set_from_ordinal_checked(date_fields *fields, long ordinal)
+{
+    if (ordinal < 1 || ordinal > MAX_ORDINAL) {
+        return -1;
+    }
+
+    set_from_ordinal(fields, ordinal);
+
+    return 0;
+}
+
+/* The proleptic Gregorian ordinal of the date, as date.toordinal */
+static long
+date_ordinal(date_fields *fields)
+{
+    long ordinal = year_ordinal(fields->year) + fields->day - 1;
+    int month;
+
+    for (month = 1; month < fields->month; month++) {
+        ordinal += days_in_month(fields->year, month);
+    }
+
+    return ordinal;
+}
+
+static int
+build_ordinal_date(date_fields *fields, int year, int ordinalday)
+{
+    /* Day 366 of a non-leap year is the first day of the following year */
+    if (year < 1 || ordinalday < 1 || ordinalday > 366) {
+        return -1;
+    }
+
+    return set_from_ordinal_checked(fields, year_ordinal(year) + ordinalday - 1);
+}
+
+static int
+build_week_date(date_fields *fields, int year, int week, int weekday)
+{
+    long fourthjan;
+    long yearstart;
+
+    if (year < 1 || week == 0) {
+        return -1;
+    }
+
+    /* The ISO year starts on the Monday of the week with the 4th of
+     * January, ordinal 1 is a Monday */
+    fourthjan = year_ordinal(year) + 3;
+    yearstart = fourthjan - (fourthjan + 6) % 7;
+
+    return set_from_ordinal_checked(fields, yearstart + (long)(week - 1) * 7 + weekday - 1);
+}
+
+static int
+build_calendar_date(date_fields *fields, int year, int month, int day)
+{
+    if (year < 1 || month < 1 || month > 12 || day < 1 || day > days_in_month(year, month)) {
+        return -1;
+    }
+
+    fields->year = year;
+    fields->month = month;
+    fields->day = day;
+
+    return 0;
+}
+
+/* Parses the date formats classify_date does, other than truncated years,
+ * returns -1 if the date isn't handled */
+static int
+parse_date_fields(const char *text, Py_ssize_t length, date_fields *fields)
+{
+    int year;
+    int month;
+    int day;
+    int week;
+
+    if (length < 4 || read_int(text, 4, &year) == -1) {
+        return -1;
+    }
+
+    if (length == 4) {
+        /* YYYY */
+        return build_calendar_date(fields, year, 1, 1);
+    } else if (length == 7) {
+        if (text[4] == '-') {
+            /* YYYY-MM */
+            if (read_int(text + 5, 2, &month) == -1) {
+                return -1;
+            }
+
+            return build_calendar_date(fields, year, month, 1);
+        } else if (text[4] == 'W') {
+            /* YYYYWww */
+            if (read_int(text + 5, 2, &week) == -1) {
+                return -1;
+            }
+
+            return build_week_date(fields, year, week, 1);
+        }
+
+        /* YYYYDDD */
+        if (read_int(text + 4, 3, &day) == -1) {
+            return -1;
+        }
+
+        return build_ordinal_date(fields, year, day);
+    } else if (length == 8) {
+        if (text[4] == '-') {
+            if (text[5] == 'W') {
+                /* YYYY-Www */
+                if (read_int(text + 6, 2, &week) == -1) {
+                    return -1;
+                }
+
+                return build_week_date(fields, year, week, 1);
+            }
+
+            /* YYYY-DDD */
+            if (read_int(text + 5, 3, &day) == -1) {
+                return -1;
+            }
+
+            return build_ordinal_date(fields, year, day);
+        } else if (text[4] == 'W') {
+            /* YYYYWwwD */
+            if (read_int(text + 5, 2, &week) == -1 || read_int(text + 7, 1, &day) == -1) {
+                return -1;
+            }
+
+            return build_week_date(fields, year, week, day);
+        }
+
+        /* YYYYMMDD */
+        if (read_int(text + 4, 2, &month) == -1 || read_int(text + 6, 2, &day) == -1) {
+            return -1;
+        }
+
+        return build_calendar_date(fields, year, month, day);
+    } else if (length == 10 && text[4] == '-') {
+        if (text[5] == 'W') {
+            /* YYYY-Www-D */
+            if (text[8] != '-' || read_int(text + 6, 2, &week) == -1 || read_int(text + 9, 1, &day) == -1) {
+                return -1;
+            }
+
+            return build_week_date(fields, year, week, day);
+        }
+
+        /* YYYY-MM-DD */
+        if (text[7] != '-' || read_int(text + 5, 2, &month) == -1 || read_int(text + 8, 2, &day) == -1) {
+            return -1;
+        }
+
+        return build_calendar_date(fields, year, month, day);
+    }
+
+    return -1;
+}
+
+/* The microseconds represented by the digits of a decimal fraction of a
+ * unit unitmicroseconds long, rounded half to even */
+static long long
+fraction_to_microseconds(long long fraction, Py_ssize_t fractiondigits, long long unitmicroseconds)
+{
+    long long scale = 1;
+    long long microseconds;
+    long long remainder;
+    Py_ssize_t index;
+
+    for (index = 0; index < fractiondigits; index++) {
+        scale *= 10;
+    }
+
+    /* At most nine digits, so this can't overflow */
+    microseconds = fraction * unitmicroseconds / scale;
+    remainder = (fraction * unitmicroseconds % scale) * 2;
+
+    if (remainder > scale || (remainder == scale && microseconds % 2 == 1)) {
+        microseconds++;
+    }
+
+    return microseconds;
+}
+
+static void
+set_from_microseconds(time_fields *fields, long long microseconds)
+{
+    microseconds %= DAY_MICROSECONDS;
+
+    fields->microsecond = (int)(microseconds % 1000000);
+    microseconds /= 1000000;
+    fields->second = (int)(microseconds % 60);
+    microseconds /= 60;
+    fields->minute = (int)(microseconds % 60);
+    fields->hour = (int)(microseconds / 60);
+}
+
+static void
+set_midnight(time_fields *fields)
+{
+    fields->hour = 0;
+    fields->minute = 0;
+    fields->second = 0;
+    fields->microsecond = 0;
+}
+
+/* Checks the UTC offset is ±hh:mm, ±hhmm, ±hh or Z, returns -1 if it isn't
+ * handled */
+static int
+check_tz(const char *text, Py_ssize_t length)
+{
+    int hour;
+    int minute = 0;
+
+    if (length == 1) {
+        return text[0] == 'Z' ? 0 : -1;
+    }
+
+    /* Buffers aren't NUL terminated, so the length is checked before
+     * anything is read */
+    if ((length != 3 && length != 5 && length != 6) || read_int(text + 1, 2, &hour) == -1) {
+        return -1;
+    }
+
+    if (length == 6) {
+        if (text[3] != ':' || read_int(text + 4, 2, &minute) == -1) {
+            return -1;
+        }
+    } else if (length == 5) {
+        if (read_int(text + 3, 2, &minute) == -1) {
+            return -1;
+        }
+    }
+
+    /* A negative offset cannot be 0 */
+    if (text[0] == '-' && hour == 0 && minute == 0) {
+        return -1;
+    }
+
+    return 0;
+}
+
+/* The seconds east of UTC of a UTC offset check_tz has accepted */
+static int
+tz_seconds(const char *text, Py_ssize_t length)
+{
+    int hour = 0;
+    int minute = 0;
+    int seconds;
+
+    if (length == 1) {
+        /* Z */
+        return 0;
+    }
+
+    read_int(text + 1, 2, &hour);
+
+    if (length == 6) {
+        read_int(text + 4, 2, &minute);
+    } else if (length == 5) {
+        read_int(text + 3, 2, &minute);
+    }
+
+    seconds = (hour * 60 + minute) * 60;
+
+    return text[0] == '-' ? -seconds : seconds;
+}
+
+/* Parses the time formats parse_time does, returns -1 if the time isn't
+ * handled */
+static int
+parse_time_fields(const char *text, Py_ssize_t length, time_fields *fields)
+{
+    const char *tz;
+    const char *fractiontext = NULL;
+    Py_ssize_t timelength;
+    Py_ssize_t integerlength;
+    Py_ssize_t fractiondigits = 0;
+    long long fraction = 0;
+    int hour;
+    int minute = 0;
+    int second = 0;
+
+    /* The UTC offset is split as _split_tz does */
+    tz = memchr(text, '+', length);
+
+    if (tz == NULL) {
+        tz = memchr(text, '-', length);
+    }
+
+    if (tz == NULL && length > 0 && text[length - 1] == 'Z') {
+        tz = text + length - 1;
+    }
+
+    if (tz == NULL) {
+        fields->tz = NULL;
+        fields->tzlength = 0;
+        timelength = length;
+    } else {
+        fields->tz = tz;
+        fields->tzlength = length - (tz - text);
+        timelength = tz - text;
+
+        if (check_tz(fields->tz, fields->tzlength) == -1) {
+            return -1;
+        }
+    }
+
+    fractiontext = memchr(text, '.', timelength);
+
+    if (fractiontext == NULL) {
+        integerlength = timelength;
+    } else {
+        integerlength = fractiontext - text;
+        fractiontext++;
+        fractiondigits = timelength - integerlength - 1;
+
+        if (fractiondigits < 1 || fractiondigits > MAX_FRACTION_DIGITS || read_digits(fractiontext, fractiondigits, &fraction) == -1) {
+            return -1;
+        }
+    }
+
+    if (integerlength < 2 || read_int(text, 2, &hour) == -1) {
+        return -1;
+    }
+
+    if (integerlength == 8 || integerlength == 6) {
+        /* hh:mm:ss, hhmmss */
+        if (integerlength == 8) {
+            if (text[2] != ':' || text[5] != ':' || read_int(text + 3, 2, &minute) == -1 || read_int(text + 6, 2, &second) == -1) {
+                return -1;
+            }
+        } else if (read_int(text + 2, 2, &minute) == -1 || read_int(text + 4, 2, &second) == -1) {
+            return -1;
+        }
+
+        fields->microsecond = (int)fraction_to_microseconds(fraction, fractiondigits, 1000000);
+
+        /* Rounding may carry in to the seconds */
+        if (fields->microsecond == 1000000) {
+            second++;
+            fields->microsecond = 0;
+        }
+
+        if (second >= 60 || minute > 60) {
+            return -1;
+        }
+
+        if (hour == 24) {
+            /* Midnight */
+            set_midnight(fields);
+            return 0;
+        }
+
+        if (hour > 23 || minute > 59) {
+            return -1;
+        }
+
+        fields->hour = hour;
+        fields->minute = minute;
+        fields->second = second;
+
+        return 0;
+    } else if (integerlength == 5 || integerlength == 4) {
+        /* hh:mm, hhmm */
+        if (integerlength == 5) {
+            if (text[2] != ':' || read_int(text + 3, 2, &minute) == -1) {
+                return -1;
+            }
+        } else if (read_int(text + 2, 2, &minute) == -1) {
+            return -1;
+        }
+
+        if (minute > 60 || (minute == 60 && fraction != 0) || hour > 24) {
+            return -1;
+        }
+
+        if (hour == 24) {
+            set_midnight(fields);
+            return 0;
+        }
+
+        /* Any overflow is carried up, past midnight wraps around */
+        set_from_microseconds(fields, (hour * 60LL + minute) * 60000000LL + fraction_to_microseconds(fraction, fractiondigits, 60000000LL));
+
+        return 0;
+    } else if (integerlength == 2) {
+        /* hh */
+        if (hour > 24) {
+            return -1;
+        }
+
+        set_from_microseconds(fields, hour * 3600000000LL + fraction_to_microseconds(fraction, fractiondigits, 3600000000LL));
+
+        return 0;
+    }
+
+    return -1;
+}
+
+/* Returns a new reference to the tzinfo of the time, None if it has none,
+ * built by tzfunc */
+static PyObject *
+build_tzinfo(time_fields *fields, PyObject *tzfunc)
+{
+    PyObject *tzstr;
+    PyObject *tzinfo;
+
+    if (fields->tz == NULL) {
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+
+    tzstr = PyUnicode_FromStringAndSize(fields->tz, fields->tzlength);
+
+    if (tzstr == NULL) {
+        return NULL;
+    }
+
+    tzinfo = PyObject_CallFunctionObjArgs(tzfunc, tzstr, NULL);
+    Py_DECREF(tzstr);
+
+    return tzinfo;
+}
+
+/* The characters of a string, either an ASCII str, or a bytes-like object,
+ * which is read in place */
+typedef struct {
+    const char *text;
+    Py_ssize_t length;
+    Py_buffer buffer;
+    int hasbuffer;
+} text_view;
+
+/* Returns -1 if the object isn't an ASCII str or a bytes-like object */
+static int
+open_text(PyObject *value, text_view *view)
+{
+    view->hasbuffer = 0;
+
+    if (PyUnicode_Check(value)) {
+        if (PyUnicode_READY(value) == -1 || PyUnicode_IS_ASCII(value) == 0) {
+            PyErr_Clear();
+            return -1;
+        }
+
+        view->text = PyUnicode_AsUTF8AndSize(value, &view->length);
+
+        if (view->text == NULL) {
+            PyErr_Clear();
+            return -1;
+        }
+
+        return 0;
+    }
+
+    if (PyObject_CheckBuffer(value) == 0 || PyObject_GetBuffer(value, &view->buffer, PyBUF_SIMPLE) == -1) {
+        PyErr_Clear();
+        return -1;
+    }
+
+    view->hasbuffer = 1;
+    view->text = view->buffer.buf;
+    view->length = view->buffer.len;
+
+    return 0;
+}
+
+static void
+close_text(text_view *view)
+{
+    if (view->hasbuffer) {
+        PyBuffer_Release(&view->buffer);
+        view->hasbuffer = 0;
+    }
+}
+
+static PyObject *
+speedups_parse_date(PyObject *self, PyObject *args)
+{
+    PyObject *isodatestr;
+    text_view view;
+    date_fields date;
+    int parsed;
+
+    if (!PyArg_ParseTuple(args, "O:parse_date", &isodatestr)) {
+        return NULL;
+    }
+
+    if (open_text(isodatestr, &view) == -1) {
+        Py_RETURN_NONE;
+    }
+
+    parsed = parse_date_fields(view.text, view.length, &date);
+    close_text(&view);
+
+    if (parsed == -1) {
+        Py_RETURN_NONE;
+    }
+
+    return PyDate_FromDate(date.year, date.month, date.day);
+}
+
+static PyObject *
+speedups_parse_time(PyObject *self, PyObject *args)
+{
+    PyObject *isotimestr;
+    PyObject *tzfunc;
+    PyObject *tzinfo;
+    PyObject *result;
+    text_view view;
+    time_fields time;
+
+    if (!PyArg_ParseTuple(args, "OO:parse_time", &isotimestr, &tzfunc)) {
+        return NULL;
+    }
+
+    if (open_text(isotimestr, &view) == -1) {
+        Py_RETURN_NONE;
+    }
+
+    if (parse_time_fields(view.text, view.length, &time) == -1) {
+        close_text(&view);
+        Py_RETURN_NONE;
+    }
+
+    tzinfo = build_tzinfo(&time, tzfunc);
+    close_text(&view);
+
+    if (tzinfo == NULL) {
+        return NULL;
+    }
+
+    result = PyDateTimeAPI->Time_FromTime(time.hour, time.minute, time.second, time.microsecond, tzinfo, PyDateTimeAPI->TimeType);
+    Py_DECREF(tzinfo);
+
+    return result;
+}
+
+/* Splits the date time in to its date and time, returns -1 if the
+ * delimiter doesn't occur exactly once, as split requires */
+static int
+split_datetime(text_view *view, text_view *delimiterview, date_fields *date, time_fields *time)
+{
+    const char *text = view->text;
+    const char *delimitertext = delimiterview->text;
+    const char *split = NULL;
+    Py_ssize_t length = view->length;
+    Py_ssize_t delimiterlength = delimiterview->length;
+    Py_ssize_t index;
+
+    if (delimiterlength == 0) {
+        return -1;
+    }
+
+    for (index = 0; index + delimiterlength <= length; index++) {
+        if (memcmp(text + index, delimitertext, delimiterlength) == 0) {
+            if (split != NULL) {
+                return -1;
+            }
+
+            split = text + index;
+            index += delimiterlength - 1;
+        }
+    }
+
+    if (split == NULL || parse_date_fields(text, split - text, date) == -1) {
+        return -1;
+    }
+
+    return parse_time_fields(split + delimiterlength, length - (split - text) - delimiterlength, time);
+}
+
+static PyObject *
+speedups_parse_datetime(PyObject *self, PyObject *args)
+{
+    PyObject *isodatetimestr;
+    PyObject *delimiter;
+    PyObject *tzfunc;
+    PyObject *tzinfo;
+    PyObject *result;
+    text_view view;
+    text_view delimiterview;
+    date_fields date;
+    time_fields time;
+
+    if (!PyArg_ParseTuple(args, "OOO:parse_datetime", &isodatetimestr, &delimiter, &tzfunc)) {
+        return NULL;
+    }
+
+    if (open_text(isodatetimestr, &view) == -1) {
+        Py_RETURN_NONE;
+    }
+
+    if (open_text(delimiter, &delimiterview) == -1) {
+        close_text(&view);
+        Py_RETURN_NONE;
+    }
+
+    if (split_datetime(&view, &delimiterview, &date, &time) == -1) {
+        close_text(&delimiterview);
+        close_text(&view);
+        Py_RETURN_NONE;
+    }
+
+    tzinfo = build_tzinfo(&time, tzfunc);
+    close_text(&delimiterview);
+    close_text(&view);
+
+    if (tzinfo == NULL) {
+        return NULL;
+    }
+
+    result = PyDateTimeAPI->DateTime_FromDateAndTime(date.year, date.month, date.day, time.hour, time.minute, time.second, time.microsecond, tzinfo, PyDateTimeAPI->DateTimeType);
+    Py_DECREF(tzinfo);
+
+    return result;
+}
+
+/* Parses the date time in to its fields, and the seconds east of UTC of
+ * its UTC offset, hasoffset is 0 if it has none, returns -1 if the date
+ * time isn't handled */
+static int
+parse_datetime_offset(PyObject *isodatetimestr, PyObject *delimiter, date_fields *date, time_fields *time, int *offset, int *hasoffset)
+{
+    text_view view;
+    text_view delimiterview;
+    int parsed;
+
+    if (open_text(isodatetimestr, &view) == -1) {
+        return -1;
+    }
+
+    if (open_text(delimiter, &delimiterview) == -1) {
+        close_text(&view);
+        return -1;
+    }
+
+    parsed = split_datetime(&view, &delimiterview, date, time);
+
+    if (parsed == 0) {
+        /* The offset points in to the string, so it is read before the
+         * string is released */
+        *hasoffset = time->tz != NULL;
+        *offset = *hasoffset ? tz_seconds(time->tz, time->tzlength) : 0;
+    }
+
+    close_text(&delimiterview);
+    close_text(&view);
+
+    return parsed;
+}
+
+static PyObject *
+speedups_parse_datetime_tuple(PyObject *self, PyObject *args)
+{
+    PyObject *isodatetimestr;
+    PyObject *delimiter;
+    date_fields date;
+    time_fields time;
+    int offset;
+    int hasoffset;
+
+    if (!PyArg_ParseTuple(args, "OO:parse_datetime_tuple", &isodatetimestr, &delimiter)) {
+        return NULL;
+    }
+
+    if (parse_datetime_offset(isodatetimestr, delimiter, &date, &time, &offset, &hasoffset) == -1) {
+        Py_RETURN_NONE;
+    }
+
+    if (hasoffset) {
+        return Py_BuildValue("(iiiiiiii)", date.year, date.month, date.day, time.hour, time.minute, time.second, time.microsecond, offset);
+    }
+
+    return Py_BuildValue("(iiiiiiiO)", date.year, date.month, date.day, time.hour, time.minute, time.second, time.microsecond, Py_None);
+}
+
+static PyObject *
+speedups_parse_datetime_epoch(PyObject *self, PyObject *args)
+{
+    PyObject *isodatetimestr;
+    PyObject *delimiter;
+    date_fields date;
+    time_fields time;
+    int offset;
+    int hasoffset;
+    long long seconds;
+
+    if (!PyArg_ParseTuple(args, "OO:parse_datetime_epoch", &isodatetimestr, &delimiter)) {
+        return NULL;
+    }
+
+    if (parse_datetime_offset(isodatetimestr, delimiter, &date, &time, &offset, &hasoffset) == -1) {
+        Py_RETURN_NONE;
+    }
+
+    seconds = (date_ordinal(&date) - EPOCH_ORDINAL) * 86400LL + (time.hour * 60LL + time.minute) * 60LL + time.second - offset;
+
+    return PyLong_FromLongLong(seconds * 1000000LL + time.microsecond);
+}
+
+static PyObject *
+speedups_validate_date(PyObject *self, PyObject *args)
+{
+    PyObject *isodatestr;
+    text_view view;
+    date_fields date;
+    int parsed;
+
+    if (!PyArg_ParseTuple(args, "O:validate_date", &isodatestr)) {
+        return NULL;
+    }
+
+    if (open_text(isodatestr, &view) == -1) {
+        Py_RETURN_NONE;
+    }
+
+    parsed = parse_date_fields(view.text, view.length, &date);
+    close_text(&view);
+
+    if (parsed == -1) {
+        Py_RETURN_NONE;
+    }
+
+    Py_RETURN_TRUE;
+}
+
+static PyObject *
+speedups_validate_time(PyObject *self, PyObject *args)
+{
+    PyObject *isotimestr;
+    text_view view;
+    time_fields time;
+    int parsed;
+
+    if (!PyArg_ParseTuple(args, "O:validate_time", &isotimestr)) {
+        return NULL;
+    }
+
+    if (open_text(isotimestr, &view) == -1) {
+        Py_RETURN_NONE;
+    }
+
+    parsed = parse_time_fields(view.text, view.length, &time);
+    close_text(&view);
+
+    if (parsed == -1) {
+        Py_RETURN_NONE;
+    }
+
+    Py_RETURN_TRUE;
+}
+
+static PyObject *
+speedups_validate_datetime(PyObject *self, PyObject *args)
+{
+    PyObject *isodatetimestr;
+    PyObject *delimiter;
+    date_fields date;
+    time_fields time;
+    int offset;
+    int hasoffset;
+
+    if (!PyArg_ParseTuple(args, "OO:validate_datetime", &isodatetimestr, &delimiter)) {
+        return NULL;
+    }
+
+    if (parse_datetime_offset(isodatetimestr, delimiter, &date, &time, &offset, &hasoffset) == -1) {
+        Py_RETURN_NONE;
+    }
+
+    Py_RETURN_TRUE;
+}
+
+static PyObject *
+speedups_parse_timezone(PyObject *self, PyObject *args)
+{
+    PyObject *tzstr;
+    text_view view;
+    const char *text;
+    Py_ssize_t length;
+    int seconds;
+
+    if (!PyArg_ParseTuple(args, "O:parse_timezone", &tzstr)) {
+        return NULL;
+    }
+
+    if (open_text(tzstr, &view) == -1) {
+        Py_RETURN_NONE;
+    }
+
+    text = view.text;
+    length = view.length;
+
+    if (length <= 1 || (text[0] != '+' && text[0] != '-') || check_tz(text, length) == -1) {
+        close_text(&view);
+        Py_RETURN_NONE;
+    }
+
+    seconds = tz_seconds(text, length);
+    close_text(&view);
+
+    return PyDelta_FromDSU(0, seconds, 0);
+}
+
+static PyMethodDef speedups_methods[] = {
+    {"parse_date", speedups_parse_date, METH_VARARGS,
+     "parse_date(isodatestr) -> date, or None if the string isn't handled"},
+    {"parse_time", speedups_parse_time, METH_VARARGS,
+     "parse_time(isotimestr, tzfunc) -> time, or None if the string isn't handled"},
+    {"parse_datetime", speedups_parse_datetime, METH_VARARGS,
+     "parse_datetime(isodatetimestr, delimiter, tzfunc) -> datetime, or None if the string isn't handled"},
+    {"parse_datetime_tuple", speedups_parse_datetime_tuple, METH_VARARGS,
+     "parse_datetime_tuple(isodatetimestr, delimiter) -> (year, month, day, hour, minute, second, microsecond, offset), or None if the string isn't handled"},
+    {"parse_datetime_epoch", speedups_parse_datetime_epoch, METH_VARARGS,
+     "parse_datetime_epoch(isodatetimestr, delimiter) -> microseconds since the epoch, or None if the string isn't handled"},
+    {"validate_date", speedups_validate_date, METH_VARARGS,
+     "validate_date(isodatestr) -> True, or None if the string isn't handled"},
+    {"validate_time", speedups_validate_time, METH_VARARGS,
+     "validate_time(isotimestr) -> True, or None if the string isn't handled"},
+    {"validate_datetime", speedups_validate_datetime, METH_VARARGS,
+     "validate_datetime(isodatetimestr, delimiter) -> True, or None if the string isn't handled"},
+    {"parse_timezone", speedups_parse_timezone, METH_VARARGS,
+     "parse_timezone(tzstr) -> timedelta, or None if the string isn't handled"},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef speedups_module = {
+    PyModuleDef_HEAD_INIT,
+    "aniso8601._speedups",
+    "Compiled parsers for the common ISO 8601 formats.",
+    -1,
+    speedups_methods
+};
+
+PyMODINIT_FUNC
+PyInit__speedups(void)
+{
+    PyDateTime_IMPORT;
+
+    if (PyDateTimeAPI == NULL) {
+        return NULL;
+    }
+
+    return PyModule_Create(&speedups_module);
+}
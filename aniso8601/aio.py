@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+#parse_lines is an async generator, it reads ISO 8601 strings, one per
+#line, from an async iterable, an asyncio.StreamReader, say, and yields
+#what each is parsed to, in order. This module requires Python 3.7 or
+#later.
+#
+#The source yields lines, str or bytes-like, surrounding whitespace and
+#line endings are ignored. With chunked=True, it yields chunks of text
+#instead, which are split in to lines on \n, as StreamReader.read does.
+#
+#Lines are parsed in micro-batches, and control is given back to the event
+#loop after each, so it is only blocked for as long as a batch takes to
+#parse, even when the source never has to wait for more lines. A batch is
+#parsed once it has batchsize lines, once maxlatency seconds have passed
+#since its first line was read, if maxlatency is given, or at the end of
+#the source.
+#
+#If an executor is given, batches of at least offloadsize lines are parsed
+#by it instead, and more lines are read while they are. At most maxpending
+#batches are parsed, or waiting to be yielded, at once, once there are
+#that many, no more lines are read until the first has been yielded.
+#Smaller batches are parsed in the event loop. A ProcessPoolExecutor can
+#be used, UTC offsets can be pickled.
+#
+#Nothing is read from the source until the results before it are asked
+#for, so a slow consumer slows the reading of the source.
+#
+#The errors argument determines what happens when a line fails to parse:
+#
+#'raise' - The exception is raised, after the results of the lines before
+#          it are yielded, this is the default
+#'coerce' - None is yielded for the line
+#'skip' - Nothing is yielded for the line
+#
+#A line that isn't a str, or bytes-like, fails with a TypeError, as with the
+#parse_*_many functions, see batch.py. With chunked=True, a chunk that
+#isn't raises the TypeError whatever errors is, as it can't be split in to
+#lines.
+
+import asyncio
+import collections
+import functools
+
+from aniso8601.batch import _FAILURES, _check_string
+from aniso8601.date import parse_date
+from aniso8601.duration import parse_duration
+from aniso8601.time import parse_time, parse_datetime
+
+#The most lines parsed at a time
+AIO_BATCHSIZE = 1024
+
+#The fewest lines parsed by the executor, if one is given
+AIO_OFFLOADSIZE = 512
+
+#The most batches being parsed, or waiting to be yielded, at once
+AIO_MAXPENDING = 4
+
+async def parse_lines(source, kind='datetime', delimiter='T', errors='raise', chunked=False, batchsize=AIO_BATCHSIZE,
+                      maxlatency=None, executor=None, offloadsize=AIO_OFFLOADSIZE, maxpending=AIO_MAXPENDING):
+    #Given an async iterable of lines, or chunks, of strings of the given
+    #kind, 'datetime', 'date', 'time' or 'duration', yield the
+    #datetime.datetime, datetime.date, datetime.time or datetime.timedelta
+    #each is parsed to
+    if kind not in _kind_map:
+        raise ValueError('kind must be one of \'datetime\', \'date\', \'time\' or \'duration\'.')
+
+    if errors not in ('raise', 'coerce', 'skip'):
+        raise ValueError('errors must be one of \'raise\', \'coerce\' or \'skip\'.')
+
+    if batchsize < 1 or maxpending < 1:
+        raise ValueError('batchsize and maxpending must be at least 1.')
+
+    loop = asyncio.get_running_loop()
+    iterator = source.__aiter__()
+
+    #The lines of the batch being read, the time by which it must be
+    #parsed, the rest of the last chunk, and the task reading the next
+    #line or chunk, which is only used when there is something else to
+    #wait for
+    batch = []
+    deadline = None
+    remainder = None
+    nextitem = None
+
+    #The futures of the batches being parsed, or waiting to be yielded, in
+    #order
+    pending = collections.deque()
+
+    try:
+        while True:
+            try:
+                if nextitem is None and deadline is None and len(pending) == 0:
+                    item = await iterator.__anext__()
+                else:
+                    if nextitem is None:
+                        nextitem = asyncio.ensure_future(iterator.__anext__())
+
+                    waiting = [nextitem]
+
+                    if len(pending) != 0:
+                        waiting.append(pending[0])
+
+                    if deadline is None:
+                        timeout = None
+                    else:
+                        timeout = max(0, deadline - loop.time())
+
+                    await asyncio.wait(waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                    if nextitem.done() is False:
+                        if deadline is not None and loop.time() >= deadline:
+                            pending.append(_parse_batch(loop, executor, offloadsize, kind, delimiter, batch))
+                            batch = []
+                            deadline = None
+
+                        while len(pending) != 0 and (pending[0].done() is True or len(pending) >= maxpending):
+                            for result in _batch_results(await pending.popleft(), errors):
+                                yield result
+
+                        continue
+
+                    item = nextitem.result()
+                    nextitem = None
+            except StopAsyncIteration:
+                nextitem = None
+                break
+
+            if isinstance(item, memoryview) is True:
+                #A memoryview can't be split, or stripped
+                item = item.tobytes()
+
+            if chunked is False:
+                lines = [item]
+            else:
+                _check_string(item)
+
+                if remainder is not None:
+                    item = remainder + item
+
+                lines = item.split(b'\n' if isinstance(item, (bytes, bytearray)) is True else '\n')
+                remainder = lines.pop()
+
+            if len(lines) != 0 and len(batch) == 0 and maxlatency is not None:
+                deadline = loop.time() + maxlatency
+
+            batch.extend(lines)
+
+            if len(batch) >= batchsize:
+                start = 0
+
+                while len(batch) - start >= batchsize:
+                    pending.append(_parse_batch(loop, executor, offloadsize, kind, delimiter, batch[start:start + batchsize]))
+                    start += batchsize
+
+                    await asyncio.sleep(0)
+
+                    while len(pending) >= maxpending:
+                        for result in _batch_results(await pending.popleft(), errors):
+                            yield result
+
+                batch = batch[start:]
+
+                if len(batch) == 0 or maxlatency is None:
+                    deadline = None
+                else:
+                    #The lines left over start the next batch
+                    deadline = loop.time() + maxlatency
+
+            #Results are yielded as soon as they are ready
+            while len(pending) != 0 and pending[0].done() is True:
+                for result in _batch_results(await pending.popleft(), errors):
+                    yield result
+
+        if remainder is not None and len(remainder) != 0:
+            batch.append(remainder)
+
+        if len(batch) != 0:
+            pending.append(_parse_batch(loop, executor, offloadsize, kind, delimiter, batch))
+
+        while len(pending) != 0:
+            for result in _batch_results(await pending.popleft(), errors):
+                yield result
+    finally:
+        #If the generator is closed early, the line being read, and the
+        #batches being parsed, are abandoned
+        if nextitem is not None:
+            nextitem.cancel()
+
+        for future in pending:
+            future.cancel()
+
+def _parse_batch(loop, executor, offloadsize, kind, delimiter, lines):
+    #Returns a future of the results of the batch, parsed by the executor
+    #if it is large enough, otherwise it is parsed now
+    if executor is not None and len(lines) >= offloadsize:
+        return loop.run_in_executor(executor, _parse_lines, kind, delimiter, lines)
+
+    future = loop.create_future()
+    future.set_result(_parse_lines(kind, delimiter, lines))
+
+    return future
+
+def _parse_lines(kind, delimiter, lines):
+    #Returns a tuple of the list of results of the lines, None for those
+    #that failed to parse, and a list of (index, exception) tuples for them
+    if kind == 'datetime':
+        parse = functools.partial(parse_datetime, delimiter=delimiter)
+    else:
+        parse = _kind_map[kind]
+
+    try:
+        #Most batches have no invalid lines, so every line is parsed in one
+        #go, and the batch is only parsed one line at a time if one fails
+        return (list(map(parse, [line.strip() for line in lines])), [])
+    except _FAILURES + (AttributeError,):
+        #A line that isn't a string can fail with an AttributeError, each
+        #line is checked as batch.py does below
+        pass
+
+    results = []
+    failures = []
+
+    for index, line in enumerate(lines):
+        try:
+            _check_string(line)
+
+            results.append(parse(line.strip()))
+        except _FAILURES as e:
+            results.append(None)
+            failures.append((index, e))
+
+    return (results, failures)
+
+def _batch_results(batchresult, errors):
+    #Yields the results of a batch, as errors determines
+    results, failures = batchresult
+
+    if len(failures) == 0 or errors == 'coerce':
+        return results
+    elif errors == 'skip':
+        return [result for result in results if result is not None]
+
+    #errors='raise', the results before the first failure are yielded
+    #before it is raised
+    return _raise_after(results[0:failures[0][0]], failures[0][1])
+
+def _raise_after(results, exception):
+    for result in results:
+        yield result
+
+    raise exception
+
+_kind_map = {
+    'datetime': parse_datetime,
+    'date': parse_date,
+    'time': parse_time,
+    'duration': parse_duration
+}
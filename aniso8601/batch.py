@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+#The parse_*_many functions parse every string in the given iterable, and
+#return a list of the results, in order. The errors argument determines
+#what happens when a string fails to parse:
+#
+#'raise' - The exception is raised, and parsing stops, this is the default
+#'coerce' - None is given in place of the result
+#'collect' - None is given in place of the result, and a tuple of the list
+#            of results, and a list of (index, exception) tuples for the
+#            strings that failed to parse is returned
+#
+#A string fails to parse if it is invalid, out of range, or not a string
+#at all, a TypeError is raised for anything that isn't a string, or
+#bytes-like
+
+import datetime
+import operator
+
+from aniso8601 import compat
+from aniso8601.date import parse_date, get_date_resolution, \
+     _resolution_map as _date_resolution_map
+from aniso8601.duration import parse_duration
+from aniso8601.error import ErrorCode, build_exception
+from aniso8601.resolution import DateResolution, TimeResolution
+from aniso8601.time import parse_time, parse_datetime, get_time_resolution, \
+     _build_hour_time, _build_minute_time, _build_second_time, \
+     _parse_tzinfo, _split_tz
+
+#The most shapes of string a DatetimeParser compiles plans for
+DATETIMEPARSER_MAXSHAPES = 256
+
+#The exceptions raised for a string that fails to parse, TypeError is only
+#raised by _check_string
+_FAILURES = (ValueError, NotImplementedError, OverflowError, TypeError)
+
+#Maps every digit to the same character, so strings with the same layout,
+#but different values, have the same shape
+_SHAPE_TABLE = compat.maketrans(b'0123456789', b'##########')
+
+#The widths of the fields of each date resolution, truncated years are
+#handled separately
+_DATE_FIELD_WIDTHS = {
+    DateResolution.Month: (4, 2),
+    DateResolution.Week: (4, 2),
+    DateResolution.Weekday: (4, 2, 1),
+    DateResolution.Day: (4, 2, 2),
+    DateResolution.Ordinal: (4, 3)
+}
+
+def parse_date_many(isodatestrs, errors='raise'):
+    #Given an iterable of strings in any ISO 8601 date format, return a list
+    #of datetime.date objects
+    _check_errors(errors)
+
+    results = []
+    failures = []
+
+    for index, isodatestr in enumerate(isodatestrs):
+        try:
+            _check_string(isodatestr)
+            results.append(parse_date(isodatestr))
+        except _FAILURES as e:
+            if errors == 'raise':
+                raise
+
+            _record_failure(index, e, errors, results, failures)
+
+    return _build_result(results, failures, errors)
+
+def parse_time_many(isotimestrs, errors='raise'):
+    #Given an iterable of strings in any ISO 8601 time format, return a list
+    #of datetime.time objects
+    #
+    #The layout of the time is only determined once for each shape of
+    #string, see DatetimeParser
+    _check_errors(errors)
+
+    results = []
+    failures = []
+
+    plans = {}
+
+    for index, isotimestr in enumerate(isotimestrs):
+        try:
+            _check_string(isotimestr)
+
+            if isinstance(isotimestr, compat.str_types) is False:
+                isotimestr = compat.decode(isotimestr)
+
+            shape = _shape(isotimestr)
+            plan = plans.get(shape)
+
+            if plan is None:
+                results.append(parse_time(isotimestr))
+
+                if shape is not None and len(plans) < DATETIMEPARSER_MAXSHAPES:
+                    plans[shape] = _compile_time_plan(isotimestr, 0)
+            else:
+                results.append(plan(isotimestr))
+        except _FAILURES as e:
+            if errors == 'raise':
+                raise
+
+            _record_failure(index, e, errors, results, failures)
+
+    return _build_result(results, failures, errors)
+
+def parse_datetime_many(isodatetimestrs, delimiter='T', errors='raise'):
+    #Given an iterable of strings in ISO 8601 date time format, return a list
+    #of datetime.datetime objects
+    #
+    #The layout of the date time is only determined once for each shape of
+    #string, see DatetimeParser
+    return DatetimeParser(delimiter=delimiter).parse_many(isodatetimestrs, errors=errors)
+
+def parse_duration_many(isodurationstrs, relative=False, errors='raise'):
+    #Given an iterable of strings representing ISO 8601 durations, return a
+    #list of datetime.timedelta (or dateutil.relativedelta.relativedelta if
+    #relative=True) objects
+    _check_errors(errors)
+
+    results = []
+    failures = []
+
+    for index, isodurationstr in enumerate(isodurationstrs):
+        try:
+            _check_string(isodurationstr)
+            results.append(parse_duration(isodurationstr, relative=relative))
+        except _FAILURES as e:
+            if errors == 'raise':
+                raise
+
+            _record_failure(index, e, errors, results, failures)
+
+    return _build_result(results, failures, errors)
+
+class DatetimeParser(object):
+    #Parses ISO 8601 date time strings, as parse_datetime does, remembering
+    #the layout of each shape of string it has seen. The shape of a string
+    #is the string with every digit replaced by the same character, so it
+    #captures the length, and the position of every separator. The first
+    #string of each shape is parsed in full, and a plan of where each field
+    #is sliced from, and how it is built, is compiled from it. Later strings
+    #with the same shape skip straight to slicing and building, every field
+    #is still range checked.
+    #
+    #Plans are never modified once compiled, so a parser can be warmed up
+    #with samples, and shared between threads. At most maxshapes plans are
+    #kept, strings of other shapes are still parsed in full.
+    #
+    #Bytes-like strings are decoded.
+    def __init__(self, delimiter='T', maxshapes=None):
+        self._delimiter = delimiter
+        self._maxshapes = DATETIMEPARSER_MAXSHAPES if maxshapes is None else maxshapes
+        self._plans = {}
+
+        #A delimiter containing digits would be hidden by the shape
+        self._compile = set(delimiter).isdisjoint('0123456789')
+
+    @property
+    def delimiter(self):
+        return self._delimiter
+
+    @property
+    def maxshapes(self):
+        return self._maxshapes
+
+    @property
+    def shapecount(self):
+        #The number of shapes a plan has been compiled for
+        return len(self._plans)
+
+    def parse(self, isodatetimestr):
+        #Given a string in ISO 8601 date time format, return a
+        #datetime.datetime object that corresponds to the given date time
+        if isinstance(isodatetimestr, compat.str_types) is False:
+            isodatetimestr = compat.decode(isodatetimestr)
+
+        shape = _shape(isodatetimestr)
+        plan = self._plans.get(shape)
+
+        if plan is None:
+            return self._learn(isodatetimestr, shape)
+
+        dateplan, timeplan = plan
+
+        return datetime.datetime.combine(dateplan(isodatetimestr), timeplan(isodatetimestr))
+
+    def parse_many(self, isodatetimestrs, errors='raise'):
+        #Given an iterable of strings in ISO 8601 date time format, return a
+        #list of datetime.datetime objects, the errors argument is handled as
+        #for the parse_*_many functions
+        _check_errors(errors)
+
+        results = []
+        failures = []
+
+        parse = self.parse
+
+        for index, isodatetimestr in enumerate(isodatetimestrs):
+            try:
+                _check_string(isodatetimestr)
+                results.append(parse(isodatetimestr))
+            except _FAILURES as e:
+                if errors == 'raise':
+                    raise
+
+                _record_failure(index, e, errors, results, failures)
+
+        return _build_result(results, failures, errors)
+
+    def warm(self, isodatetimestrs):
+        #Compiles plans for the shapes of the given sample strings, a
+        #ValueError is raised if any of them fail to parse
+        for isodatetimestr in isodatetimestrs:
+            self.parse(isodatetimestr)
+
+    def _learn(self, isodatetimestr, shape):
+        #Parses the string in full, which checks it is valid, before a plan
+        #is compiled from it
+        result = parse_datetime(isodatetimestr, delimiter=self._delimiter)
+
+        if shape is not None and self._compile is True and len(self._plans) < self._maxshapes:
+            datestr, timestr = isodatetimestr.split(self._delimiter)
+
+            self._plans[shape] = (_compile_date_plan(datestr),
+                                  _compile_time_plan(timestr, len(datestr) + len(self._delimiter)))
+
+        return result
+
+def _shape(isostr):
+    #Returns the shape of the string, or None if it has no shape because it
+    #isn't ASCII, in which case it is always parsed in full
+    try:
+        return isostr.encode('ascii').translate(_SHAPE_TABLE)
+    except UnicodeError:
+        return None
+
+def _field_slices(isostr, start, widths):
+    #Returns a list of slices for the fields of the given widths in isostr,
+    #skipping over any separators between them
+    slices = []
+    index = 0
+
+    for width in widths:
+        while isostr[index] not in '0123456789':
+            index += 1
+
+        slices.append(slice(start + index, start + index + width))
+        index += width
+
+    return slices
+
+def _date_layout(datestr):
+    #Returns a tuple of the resolution of datestr, the slices of its fields,
+    #and the scale applied to the year, which is only not 1 for truncated
+    #years
+    resolution = get_date_resolution(datestr)
+
+    if resolution == DateResolution.Year:
+        #A single field, truncated years are expanded
+        return (resolution, _field_slices(datestr, 0, (len(datestr),)), 10 ** (4 - len(datestr)))
+
+    return (resolution, _field_slices(datestr, 0, _DATE_FIELD_WIDTHS[resolution]), 1)
+
+def _time_layout(isotimestr, timestart):
+    #Returns a tuple of the resolution of the time, found at timestart, the
+    #slices of its integer fields, the slice of the digits of its fraction,
+    #which is empty if there is none, and the slice of its UTC offset, None
+    #if there is none
+    timestr, tzstr = _split_tz(isotimestr)
+    resolution = get_time_resolution(timestr)
+
+    integerstr, _, fractionstr = timestr.partition('.')
+
+    if integerstr.find(':') == -1:
+        #hhmmss, hhmm, hh
+        widths = (2,) * (len(integerstr) // 2)
+    else:
+        #hh:mm:ss, hh:mm
+        widths = tuple(len(fieldstr) for fieldstr in integerstr.split(':'))
+
+    fractionstart = timestart + len(integerstr) + 1
+    fractionslice = slice(fractionstart, max(fractionstart, timestart + len(timestr)))
+
+    if tzstr is None:
+        tzslice = None
+    else:
+        tzslice = slice(timestart + len(timestr), None)
+
+    return (resolution, _field_slices(timestr, timestart, widths), fractionslice, tzslice)
+
+def _compile_date_plan(datestr):
+    #Returns a function that builds the date from a string of the same
+    #shape as datestr
+    resolution, slices, yearscale = _date_layout(datestr)
+    builder = _date_resolution_map[resolution]
+    getter = operator.itemgetter(*slices)
+
+    if resolution == DateResolution.Year:
+        def dateplan(isostr):
+            return builder(int(getter(isostr)) * yearscale)
+    else:
+        def dateplan(isostr):
+            return builder(*map(int, getter(isostr)))
+
+    return dateplan
+
+def _compile_time_plan(isotimestr, timestart, tzfunc=_parse_tzinfo):
+    #Returns a function that builds the time, found at timestart, from a
+    #string of the same shape as isotimestr, tzfunc builds the tzinfo from
+    #the UTC offset
+    resolution, slices, fractionslice, tzslice = _time_layout(isotimestr, timestart)
+
+    #The fraction is always sliced, if there is none, the slice is empty
+    getter = operator.itemgetter(*(slices + [fractionslice]))
+
+    if resolution == TimeResolution.Seconds:
+        def buildtime(isostr):
+            hourstr, minutestr, secondstr, fractionstr = getter(isostr)
+
+            return _build_second_time(int(hourstr), int(minutestr), int(secondstr), fractionstr)
+    elif resolution == TimeResolution.Minutes:
+        def buildtime(isostr):
+            hourstr, minutestr, fractionstr = getter(isostr)
+
+            return _build_minute_time(int(hourstr), int(minutestr), fractionstr)
+    else:
+        def buildtime(isostr):
+            hourstr, fractionstr = getter(isostr)
+
+            return _build_hour_time(int(hourstr), fractionstr)
+
+    if tzslice is None:
+        return buildtime
+
+    def timeplan(isostr):
+        return buildtime(isostr).replace(tzinfo=tzfunc(isostr[tzslice]))
+
+    return timeplan
+
+def _check_string(isostr):
+    #The parsers fail on anything that isn't a string with whatever they
+    #first try to do with it, a TypeError is raised for it instead
+    if isinstance(isostr, compat.str_types) is False and isinstance(isostr, compat.bytes_types) is False:
+        raise build_exception(ErrorCode.NotString)
+
+def _check_errors(errors):
+    if errors not in ('raise', 'coerce', 'collect'):
+        raise ValueError('errors must be one of \'raise\', \'coerce\' or \'collect\'.')
+
+def _record_failure(index, exception, errors, results, failures):
+    results.append(None)
+
+    if errors == 'collect':
+        failures.append((index, exception))
+
+def _build_result(results, failures, errors):
+    if errors == 'collect':
+        return (results, failures)
+
+    return results
@@ -14,3 +14,77 @@ if PY2:
     range = xrange
 else:
     range = range
+
+if PY2:
+    import string
+
+    maketrans = string.maketrans
+else:
+    maketrans = bytes.maketrans
+
+#The parsers work on str, bytes-like strings are decoded as UTF-8
+if PY2:
+    str_types = (str, unicode)
+    bytes_types = (bytearray, memoryview)
+else:
+    str_types = str
+    bytes_types = (bytes, bytearray, memoryview)
+
+def decode(isostr):
+    #Anything that isn't bytes-like is returned as is
+    if isinstance(isostr, memoryview):
+        #A memoryview may not be contiguous
+        return isostr.tobytes().decode('utf-8')
+    elif isinstance(isostr, bytes_types):
+        return isostr.decode('utf-8')
+
+    return isostr
+
+#int and float accept the digits isdecimal does, isdigit also accepts
+#superscripts and the like, which they raise on
+if PY2:
+    def isdecimal(isostr):
+        if isinstance(isostr, unicode):
+            return isostr.isdecimal()
+
+        return isostr.isdigit()
+else:
+    isdecimal = str.isdecimal
+
+#The strings int and float accept, without raising, Python 3.6 added
+#underscores between digits, exponents are never needed, since every
+#letter of a string being parsed is a designator. The expressions are only
+#compiled once a string that isn't all digits is checked, so importing
+#aniso8601 doesn't import re
+if sys.version_info >= (3, 6):
+    _DIGITPART = r'\d(?:_?\d)*'
+else:
+    _DIGITPART = r'\d+'
+
+_INT_PATTERN = r'\s*[+-]?{0}\s*\Z'.format(_DIGITPART)
+_FLOAT_PATTERN = r'\s*[+-]?(?:{0}(?:\.(?:{0})?)?|\.{0})\s*\Z'.format(_DIGITPART)
+
+_expressions = {}
+
+def isint(valuestr):
+    if isdecimal(valuestr) is True:
+        return True
+
+    return _expression(_INT_PATTERN).match(valuestr) is not None
+
+def isfloat(valuestr):
+    if isdecimal(valuestr) is True:
+        return True
+
+    return _expression(_FLOAT_PATTERN).match(valuestr) is not None
+
+def _expression(pattern):
+    expression = _expressions.get(pattern)
+
+    if expression is None:
+        import re
+
+        expression = re.compile(pattern, re.UNICODE)
+        _expressions[pattern] = expression
+
+    return expression
@@ -8,6 +8,8 @@
 
 import datetime
 
+from aniso8601 import compat, speedups
+from aniso8601.error import ErrorCode, build_exception
 from aniso8601.resolution import DateResolution
 
 def get_date_resolution(isodatestr):
@@ -23,65 +25,128 @@ def get_date_resolution(isodatestr):
     #YYYYWwwD
     #YYYY-DDD
     #YYYYDDD
-    if isodatestr.startswith('+') or isodatestr.startswith('-'):
-        raise NotImplementedError('ISO 8601 extended year representation not supported.')
+    return classify_date(isodatestr)[0]
 
-    isodatestrlen = len(isodatestr)
-
-    if isodatestr.find('W') != -1:
-        #Handle ISO 8601 week date format
-        hyphens_present = 1 if isodatestr.find('-') != -1 else 0
-        week_date_len = 7 + hyphens_present
-        weekday_date_len = 8 + 2 * hyphens_present
-
-        if isodatestrlen == week_date_len:
-            #YYYY-Www
-            #YYYYWww
-            return DateResolution.Week
-        elif isodatestrlen == weekday_date_len:
-            #YYYY-Www-D
-            #YYYYWwwD
-            return DateResolution.Weekday
-        else:
-            raise ValueError('String is not a valid ISO 8601 week date.')
-
-    #If the size of the string of 4 or less, assume its a truncated year representation
-    if len(isodatestr) <= 4:
-        return DateResolution.Year
+def classify_date(isodatestr):
+    #Given a string in any ISO 8601 date format, return a tuple of the
+    #DateResolution of the string, and a tuple of the integer fields it
+    #contains, without building a date. The fields are:
+    #
+    #DateResolution.Year: (year,)
+    #DateResolution.Month: (year, month)
+    #DateResolution.Week: (year, week)
+    #DateResolution.Weekday: (year, week, day)
+    #DateResolution.Day: (year, month, day)
+    #DateResolution.Ordinal: (year, day)
+    #
+    #Only the layout of the string is checked, the values of the fields are
+    #range checked when the date is built.
+    #
+    #The formats all have fixed widths, so the length of the string, and the
+    #separator following the year, are enough to tell them apart.
+    if isinstance(isodatestr, compat.str_types) is False:
+        isodatestr = compat.decode(isodatestr)
 
-    #An ISO string may be a calendar represntation if:
-    # 1) When split on a hyphen, the sizes of the parts are 4, 2, 2 or 4, 2
-    # 2) There are no hyphens, and the length is 8
-    datestrsplit = isodatestr.split('-')
+    result = _classify_date(isodatestr)
 
-    #Check case 1
-    if len(datestrsplit) == 2:
-        if len(datestrsplit[0]) == 4 and len(datestrsplit[1]) == 2:
-            return DateResolution.Month
+    if result is None:
+        raise build_exception(_date_layout_error(isodatestr))
 
-    if len(datestrsplit) == 3:
-        if len(datestrsplit[0]) == 4 and len(datestrsplit[1]) == 2 and len(datestrsplit[2]) == 2:
-            return DateResolution.Day
+    return result
 
-    #Check case 2
-    if len(isodatestr) == 8 and isodatestr.find('-') == -1:
-        return DateResolution.Day
+def _classify_date(isodatestr):
+    #Returns what classify_date does, or None if the string isn't laid out
+    #as any date, without raising, the validators share it
+    if isodatestr.startswith(('+', '-')):
+        return None
 
-    #An ISO string may be a ordinal date representation if:
-    # 1) When split on a hyphen, the sizes of the parts are 4, 3
-    # 2) There are no hyphens, and the length is 7
+    isodatestrlen = len(isodatestr)
 
-    #Check case 1
-    if len(datestrsplit) == 2:
-        if len(datestrsplit[0]) == 4 and len(datestrsplit[1]) == 3:
-            return DateResolution.Ordinal
+    if isodatestrlen == 10:
+        if isodatestr[4] == '-':
+            if isodatestr[5] == 'W':
+                #YYYY-Www-D
+                yearstr = isodatestr[0:4]
+                weekstr = isodatestr[6:8]
+                daystr = isodatestr[9:10]
+
+                if isodatestr[8] == '-' and compat.isdecimal(yearstr + weekstr + daystr) is True:
+                    return (DateResolution.Weekday, (int(yearstr), int(weekstr), int(daystr)))
+            else:
+                #YYYY-MM-DD
+                yearstr = isodatestr[0:4]
+                monthstr = isodatestr[5:7]
+                daystr = isodatestr[8:10]
+
+                if isodatestr[7] == '-' and compat.isdecimal(yearstr + monthstr + daystr) is True:
+                    return (DateResolution.Day, (int(yearstr), int(monthstr), int(daystr)))
+    elif isodatestrlen == 8:
+        separator = isodatestr[4]
+
+        if separator == '-':
+            if isodatestr[5] == 'W':
+                #YYYY-Www
+                yearstr = isodatestr[0:4]
+                weekstr = isodatestr[6:8]
+
+                if compat.isdecimal(yearstr + weekstr) is True:
+                    return (DateResolution.Week, (int(yearstr), int(weekstr)))
+            else:
+                #YYYY-DDD
+                yearstr = isodatestr[0:4]
+                daystr = isodatestr[5:8]
+
+                if compat.isdecimal(yearstr + daystr) is True:
+                    return (DateResolution.Ordinal, (int(yearstr), int(daystr)))
+        elif separator == 'W':
+            #YYYYWwwD
+            yearstr = isodatestr[0:4]
+            weekstr = isodatestr[5:7]
+            daystr = isodatestr[7:8]
+
+            if compat.isdecimal(yearstr + weekstr + daystr) is True:
+                return (DateResolution.Weekday, (int(yearstr), int(weekstr), int(daystr)))
+        elif compat.isdecimal(isodatestr) is True:
+            #YYYYMMDD
+            return (DateResolution.Day, (int(isodatestr[0:4]), int(isodatestr[4:6]), int(isodatestr[6:8])))
+    elif isodatestrlen == 7:
+        separator = isodatestr[4]
+
+        if separator == '-':
+            #YYYY-MM
+            yearstr = isodatestr[0:4]
+            monthstr = isodatestr[5:7]
+
+            if compat.isdecimal(yearstr + monthstr) is True:
+                return (DateResolution.Month, (int(yearstr), int(monthstr)))
+        elif separator == 'W':
+            #YYYYWww
+            yearstr = isodatestr[0:4]
+            weekstr = isodatestr[5:7]
+
+            if compat.isdecimal(yearstr + weekstr) is True:
+                return (DateResolution.Week, (int(yearstr), int(weekstr)))
+        elif compat.isdecimal(isodatestr) is True:
+            #YYYYDDD
+            return (DateResolution.Ordinal, (int(isodatestr[0:4]), int(isodatestr[4:7])))
+    elif isodatestrlen <= 4:
+        #Y[YYY], truncated years are shifted 0s in from the right to form a
+        #complete year, '19' refers to 1900-1999 inclusive, so parses to 1900
+        if compat.isdecimal(isodatestr) is True:
+            return (DateResolution.Year, (int(isodatestr.ljust(4, '0')),))
+
+    return None
+
+def _date_layout_error(isodatestr):
+    #Returns the ErrorCode of a string _classify_date returns None for
+    if isodatestr.startswith(('+', '-')):
+        return ErrorCode.ExtendedYear
 
-    #Check case 2
-    if len(isodatestr) == 7 and isodatestr.find('-') == -1:
-        return DateResolution.Ordinal
+    if isodatestr.find('W') != -1:
+        return ErrorCode.InvalidWeekDate
 
     #None of the date representations match
-    raise ValueError('String is not an ISO 8601 date, perhaps it represents a time or datetime.')
+    return ErrorCode.InvalidDate
 
 def parse_date(isodatestr):
     #Given a string in any ISO 8601 date format, return a datetime.date
@@ -99,7 +164,18 @@ def parse_date(isodatestr):
     #YYYYDDD
     #
     #Note that the ISO 8601 date format of ±YYYYY is expressly not supported
-    return _resolution_map[get_date_resolution(isodatestr)](isodatestr)
+    #
+    #The string may also be given as bytes, a bytearray or a memoryview, the
+    #compiled parsers read them in place, otherwise they are decoded
+    if speedups.compiled is not None:
+        result = speedups.compiled.parse_date(isodatestr)
+
+        if result is not None:
+            return result
+
+    resolution, fields = classify_date(isodatestr)
+
+    return _resolution_map[resolution](*fields)
 
 def _parse_year(yearstr):
     #yearstr is of the format Y[YYY]
@@ -112,152 +188,117 @@ def _parse_year(yearstr):
     #
     #Since no additional resolution is provided, the month is set to 1, and
     #day is set to 1
-
-    if len(yearstr) == 4:
-        return datetime.date(int(yearstr), 1, 1)
-    else:
-        #Shift 0s in from the left to form complete year
-        return datetime.date(int(yearstr.ljust(4, '0')), 1, 1)
+    return _parse_resolution(yearstr, DateResolution.Year, 'String is not a valid ISO 8601 year.')
 
 def _parse_calendar_day(datestr):
     #datestr is of the format YYYY-MM-DD or YYYYMMDD
-    datestrlen = len(datestr)
+    return _parse_resolution(datestr, DateResolution.Day, 'String is not a valid ISO 8601 calendar day.')
 
-    if datestrlen == 10:
-        #YYYY-MM-DD
-        strformat = '%Y-%m-%d'
-    elif datestrlen == 8:
-        #YYYYMMDD
-        strformat = '%Y%m%d'
-    else:
-        raise ValueError('String is not a valid ISO 8601 calendar day.')
+def _parse_calendar_month(datestr):
+    #datestr is of the format YYYY-MM
+    return _parse_resolution(datestr, DateResolution.Month, 'String is not a valid ISO 8601 calendar month.')
 
-    parseddatetime = datetime.datetime.strptime(datestr, strformat)
+def _parse_week_day(datestr):
+    #datestr is of the format YYYY-Www-D, YYYYWwwD
+    return _parse_resolution(datestr, DateResolution.Weekday, 'String is not a valid ISO 8601 week date.')
 
-    #Since no 'time' is given, cast to a date
-    return parseddatetime.date()
+def _parse_week(datestr):
+    #datestr is of the format YYYY-Www, YYYYWww
+    return _parse_resolution(datestr, DateResolution.Week, 'String is not a valid ISO 8601 week date.')
 
-def _parse_calendar_month(datestr):
-    #datestr is of the format YYYY-MM
-    datestrlen = len(datestr)
+def _parse_ordinal_date(datestr):
+    #datestr is of the format YYYY-DDD or YYYYDDD
+    return _parse_resolution(datestr, DateResolution.Ordinal, 'String is not a valid ISO 8601 ordinal date.')
 
-    if datestrlen != 7:
-        raise ValueError('String is not a valid ISO 8601 calendar month.')
+def _parse_resolution(datestr, expectedresolution, errorstr):
+    #Parses datestr, raising a ValueError with the given message if it
+    #is not of the expected resolution
+    resolution, fields = classify_date(datestr)
 
-    parseddatetime = datetime.datetime.strptime(datestr, '%Y-%m')
+    if resolution != expectedresolution:
+        raise ValueError(errorstr)
 
-    #Since no 'time' is given, cast to a date
-    return parseddatetime.date()
+    return _resolution_map[resolution](*fields)
 
-def _parse_week_day(datestr):
-    #datestr is of the format YYYY-Www-D, YYYYWwwD
-    #
+def _build_year(isoyear):
+    return datetime.date(isoyear, 1, 1)
+
+def _build_calendar_day(isoyear, isomonth, isoday):
+    #The date constructor does the range checking for us
+    return datetime.date(isoyear, isomonth, isoday)
+
+def _build_calendar_month(isoyear, isomonth):
+    #Since no day is given, the first day of the month is used
+    return datetime.date(isoyear, isomonth, 1)
+
+def _build_week_day(isoyear, isoweeknumber, isoday):
     #W is the week number prefix, ww is the week number, between 1 and 53
     #0 is not a valid week number, which differs from the Python implementation
     #
     #D is the weekday number, between 1 and 7, which differs from the Python
     #implementation which is between 0 and 6
-
-    isoyear = int(datestr[0:4])
-    gregorianyearstart = _iso_year_start(isoyear)
-
-    #Week number will be the two characters after the W
-    windex = datestr.find('W')
-    isoweeknumber = int(datestr[windex + 1:windex + 3])
-
     if isoweeknumber == 0:
         raise ValueError('00 is not a valid ISO 8601 weeknumber.')
 
-    datestrlen = len(datestr)
-
-    if datestr.find('-') != -1:
-        if datestrlen == 10:
-            #YYYY-Www-D
-            isoday = int(datestr[9:10])
-
-            return gregorianyearstart + datetime.timedelta(weeks=isoweeknumber - 1, days=isoday - 1)
-        else:
-            raise ValueError('String is not a valid ISO 8601 week date.')
-    else:
-        if datestrlen == 8:
-            #YYYYWwwD
-            isoday = int(datestr[7:8])
-
-            return gregorianyearstart + datetime.timedelta(weeks=isoweeknumber - 1, days=isoday - 1)
-        else:
-            raise ValueError('String is not a valid ISO 8601 week date.')
+    return _date_from_ordinal(_iso_year_start_ordinal(isoyear) + (isoweeknumber - 1) * 7 + isoday - 1)
 
-def _parse_week(datestr):
-    #datestr is of the format YYYY-Www, YYYYWww
-    #
+def _build_week(isoyear, isoweeknumber):
     #W is the week number prefix, ww is the week number, between 1 and 53
     #0 is not a valid week number, which differs from the Python implementation
+    if isoweeknumber == 0:
+        raise ValueError('00 is not a valid ISO 8601 weeknumber.')
 
-    isoyear = int(datestr[0:4])
-    gregorianyearstart = _iso_year_start(isoyear)
+    return _date_from_ordinal(_iso_year_start_ordinal(isoyear) + (isoweeknumber - 1) * 7)
 
-    #Week number will be the two characters after the W
-    windex = datestr.find('W')
-    isoweeknumber = int(datestr[windex + 1:windex + 3])
+def _build_ordinal_date(isoyear, isoday):
+    #DDD can be from 1 - 366, this matches Python's definition, note that
+    #day 366 of a non-leap year is the first day of the following year
+    if isoday < 1 or isoday > 366:
+        raise ValueError('ISO 8601 ordinal day must be between 1 and 366.')
 
-    if isoweeknumber == 0:
-        raise ValueError('00 is not a valid ISO 8601 weeknumber.')
+    #Count forward from the first day of the year, the date constructor
+    #makes sure the year is valid
+    return datetime.date.fromordinal(datetime.date(isoyear, 1, 1).toordinal() + isoday - 1)
 
-    datestrlen = len(datestr)
-
-    if datestr.find('-') != -1:
-        if datestrlen == 8:
-            #YYYY-Www
-            #Suss out the date
-            return gregorianyearstart + datetime.timedelta(weeks=isoweeknumber - 1, days=0)
-        else:
-            raise ValueError('String is not a valid ISO 8601 week date.')
-    else:
-        if datestrlen == 7:
-            #YYYYWww
-            return gregorianyearstart + datetime.timedelta(weeks=isoweeknumber - 1, days=0)
-        else:
-            raise ValueError('String is not a valid ISO 8601 week date.')
+def _iso_year_start_ordinal(isoyear):
+    #Given an ISO year, returns the ordinal of the start of the year on the
+    #Gregorian calendar (which is used by Python), the ordinals are memoized
+    #as they are first used, there is at most one for each year Python
+    #supports
+    #http://en.wikipedia.org/wiki/ISO_week_date
+    try:
+        return _iso_year_start_ordinals[isoyear]
+    except KeyError:
+        pass
 
-def _parse_ordinal_date(datestr):
-    #datestr is of the format YYYY-DDD or YYYYDDD
-    #DDD can be from 1 - 365, this matches Python's definition
+    #The date constructor makes sure the year is valid
+    fourth_jan = datetime.date(isoyear, 1, 4)
 
-    if datestr.find('-') != -1:
-        #YYYY-DDD
-        parseddatetime = datetime.datetime.strptime(datestr, '%Y-%j')
+    #The ISO year starts on the Monday of the week containing the 4th of
+    #January, weekday is 0 for a Monday
+    ordinal = fourth_jan.toordinal() - fourth_jan.weekday()
 
-        #Since no 'time' is given, cast to a date
-        return parseddatetime.date()
-    else:
-        #YYYYDDD
-        parseddatetime = datetime.datetime.strptime(datestr, '%Y%j')
+    _iso_year_start_ordinals[isoyear] = ordinal
 
-        #Since no 'time' is given, cast to a date
-        return parseddatetime.date()
+    return ordinal
 
-def _iso_year_start(isoyear):
-    #Given an ISO year, returns the equivalent of the start of the year on the
-    #Gregorian calendar (which is used by Python)
-    #Stolen from:
-    #http://stackoverflow.com/questions/304256/whats-the-best-way-to-find-the-inverse-of-datetime-isocalendar
+def _date_from_ordinal(ordinal):
+    #Week dates can fall outside of the range of Python dates, that is raised
+    #as an OverflowError, as date arithmetic would
+    if ordinal < 1 or ordinal > _MAX_ORDINAL:
+        raise OverflowError('date value out of range')
 
-    #Determine the location of the 4th of January, the first week of the ISO
-    #year in the week containing the 4th of January
-    #http://en.wikipedia.org/wiki/ISO_week_date
-    fourth_jan = datetime.date(isoyear, 1, 4)
+    return datetime.date.fromordinal(ordinal)
 
-    #Note the conversion from ISO day (1 - 7) and Python day (0 - 6)
-    delta = datetime.timedelta(fourth_jan.isoweekday() - 1)
+_iso_year_start_ordinals = {}
 
-    #Return the start of the year
-    return fourth_jan - delta
+_MAX_ORDINAL = datetime.date.max.toordinal()
 
 _resolution_map = {
-    DateResolution.Day: _parse_calendar_day,
-    DateResolution.Ordinal: _parse_ordinal_date,
-    DateResolution.Month: _parse_calendar_month,
-    DateResolution.Week: _parse_week,
-    DateResolution.Weekday: _parse_week_day,
-    DateResolution.Year: _parse_year
-}
+    DateResolution.Day: _build_calendar_day,
+    DateResolution.Ordinal: _build_ordinal_date,
+    DateResolution.Month: _build_calendar_month,
+    DateResolution.Week: _build_week,
+    DateResolution.Weekday: _build_week_day,
+    DateResolution.Year: _build_year
+}
\ No newline at end of file
@@ -7,11 +7,11 @@
 # of the BSD license.  See the LICENSE file for details.
 
 import datetime
-import dateutil.relativedelta
 
 from aniso8601.date import parse_date
 from aniso8601.time import parse_time
 from aniso8601 import compat
+from aniso8601.error import ErrorCode, build_exception
 
 def parse_duration(isodurationstr, relative=False):
     #Given a string representing an ISO 8601 duration, return a
@@ -20,6 +20,10 @@ def parse_duration(isodurationstr, relative=False):
     #
     #PnYnMnDTnHnMnS (or any reduced precision equivalent)
     #P<date>T<time>
+    #
+    #The string may also be bytes-like, in which case it is decoded
+    if isinstance(isodurationstr, compat.str_types) is False:
+        isodurationstr = compat.decode(isodurationstr)
 
     if isodurationstr[0] != 'P':
         raise ValueError('ISO 8601 duration must start with a P.')
@@ -32,171 +36,205 @@ def parse_duration(isodurationstr, relative=False):
 
 def _parse_duration_prescribed(durationstr, relative):
     #durationstr can be of the form PnYnMnDTnHnMnS or PnW
+    error, dateelements, timeelements = _split_duration_prescribed(durationstr)
 
-    #Make sure the end character is valid
-    #https://bitbucket.org/nielsenb/aniso8601/issues/9/durations-with-trailing-garbage-are-parsed
-    if durationstr[-1] not in ['Y', 'M', 'D', 'H', 'S', 'W']:
-        raise ValueError('ISO 8601 duration must end with a valid character.')
-
-    #Make sure only the lowest order element has decimal precision
-    if durationstr.count('.') > 1:
-        raise ValueError('ISO 8601 allows only lowest order element to have a decimal fraction.')
-    elif durationstr.count('.') == 1:
-        #There should only ever be 1 letter after a decimal if there is more
-        #then one, the string is invalid
-        lettercount = 0;
-
-        for character in durationstr.split('.')[1]:
-            if character.isalpha() is True:
-                lettercount += 1
+    if error is not None:
+        raise build_exception(error[0])
 
-            if lettercount > 1:
-                raise ValueError('ISO 8601 duration must end with a single valid character.')
-
-    #Do not allow W in combination with other designators
-    #https://bitbucket.org/nielsenb/aniso8601/issues/2/week-designators-should-not-be-combinable
-    if durationstr.find('W') != -1 and _has_any_component(durationstr, ['Y', 'M', 'D', 'H', 'S']) is True:
-        raise ValueError('ISO 8601 week designators may not be combined with other time designators.')
-
-    #Parse the elements of the duration
-    if durationstr.find('T') == -1:
-        #Make sure no time portion is included
-        #https://bitbucket.org/nielsenb/aniso8601/issues/7/durations-with-time-components-before-t
-        if _has_any_component(durationstr, ['H', 'S']):
-            raise ValueError('ISO 8601 time components not allowed in duration without prescribed time.')
-
-        if _component_order_correct(durationstr, ['P', 'Y', 'M', 'D', 'W']) is False:
-            raise ValueError('ISO 8601 duration components must be in the correct order.')
-
-        if durationstr.find('Y') != -1:
-            years = _parse_duration_element(durationstr, 'Y')
-        else:
-            years = 0
-
-        if durationstr.find('M') != -1:
-            months = _parse_duration_element(durationstr, 'M')
-        else:
-            months = 0
-
-        if durationstr.find('W') != -1:
-            weeks = _parse_duration_element(durationstr, 'W')
-        else:
-            weeks = 0
-
-        if durationstr.find('D') != -1:
-            days = _parse_duration_element(durationstr, 'D')
-        else:
-            days = 0
+    if timeelements is None:
+        years = _parse_duration_value(dateelements, 'Y')
+        months = _parse_duration_value(dateelements, 'M')
+        weeks = _parse_duration_value(dateelements, 'W')
+        days = _parse_duration_value(dateelements, 'D')
 
         #No hours, minutes or seconds
         hours = 0
         minutes = 0
         seconds = 0
     else:
-        firsthalf = durationstr[:durationstr.find('T')]
-        secondhalf = durationstr[durationstr.find('T'):]
-
-        #Make sure no time portion is included in the date half
-        #https://bitbucket.org/nielsenb/aniso8601/issues/7/durations-with-time-components-before-t
-        if _has_any_component(firsthalf, ['H', 'S']):
-            raise ValueError('ISO 8601 time components not allowed in date portion of duration.')
-
-        if _component_order_correct(firsthalf, ['P', 'Y', 'M', 'D', 'W']) is False:
-            raise ValueError('ISO 8601 duration components must be in the correct order.')
-
-        #Make sure no date component is included in the time half
-        if _has_any_component(secondhalf, ['Y', 'D']):
-            raise ValueError('ISO 8601 time components not allowed in date portion of duration.')
-
-        if _component_order_correct(secondhalf, ['T', 'H', 'M', 'S']) is False:
-            raise ValueError('ISO 8601 time components in duration must be in the correct order.')
-
-        if firsthalf.find('Y') != -1:
-            years = _parse_duration_element(firsthalf, 'Y')
-        else:
-            years = 0
-
-        if firsthalf.find('M') != -1:
-            months = _parse_duration_element(firsthalf, 'M')
-        else:
-            months = 0
-
-        if firsthalf.find('D') != -1:
-            days = _parse_duration_element(firsthalf, 'D')
-        else:
-            days = 0
-
-        if secondhalf.find('H') != -1:
-            hours = _parse_duration_element(secondhalf, 'H')
-        else:
-            hours = 0
-
-        if secondhalf.find('M') != -1:
-            minutes = _parse_duration_element(secondhalf, 'M')
-        else:
-            minutes = 0
-
-        if secondhalf.find('S') != -1:
-            seconds = _parse_duration_element(secondhalf, 'S')
-        else:
-            seconds = 0
+        years = _parse_duration_value(dateelements, 'Y')
+        months = _parse_duration_value(dateelements, 'M')
+        days = _parse_duration_value(dateelements, 'D')
+        hours = _parse_duration_value(timeelements, 'H')
+        minutes = _parse_duration_value(timeelements, 'M')
+        seconds = _parse_duration_value(timeelements, 'S')
 
         #Weeks can't be included
         weeks = 0
 
+    return _build_duration_prescribed(years, months, weeks, days, hours, minutes, seconds, relative)
+
+def _build_duration_prescribed(years, months, weeks, days, hours, minutes, seconds, relative):
+    #Builds the duration from the values of its elements
     if relative == True:
         if int(years) != years or int(months) != months:
             #https://github.com/dateutil/dateutil/issues/40
             raise ValueError('Fractional months and years are not defined for relative intervals.')
 
-        return dateutil.relativedelta.relativedelta(years=int(years), months=int(months), weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds)
+        return _relativedelta()(years=int(years), months=int(months), weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds)
     else:
         #Note that weeks can be handled without conversion to days
         totaldays = years * 365 + months * 30 + days
 
         return datetime.timedelta(weeks=weeks, days=totaldays, hours=hours, minutes=minutes, seconds=seconds)
 
+def _split_duration_prescribed(durationstr):
+    #Returns a tuple of the first problem with durationstr, of the form
+    #PnYnMnDTnHnMnS or PnW, as an (ErrorCode, position) tuple, None if
+    #there is none, and the text of the elements of its date and time
+    #halves, the time half is None if there is no T, without raising, the
+    #validators share it
+    #
+    #The string is tokenized in a single pass, left to right, the text of
+    #each element is collected, and the position of the first of each
+    #problem is noted as it is found, they are then reported in order of
+    #precedence
+
+    #Make sure the end character is valid
+    #https://bitbucket.org/nielsenb/aniso8601/issues/9/durations-with-trailing-garbage-are-parsed
+    if durationstr[-1] not in ['Y', 'M', 'D', 'H', 'S', 'W']:
+        return ((ErrorCode.DurationEnd, len(durationstr) - 1), None, None)
+
+    #The text of the first of each element in the date and time halves, an
+    #element is the text between a designator and the letter before it
+    dateelements = {}
+    timeelements = None
+
+    elements = dateelements
+    elementstart = 1
+
+    componentorder = 'PYMDW'
+    componentindex = 0
+
+    fractioncount = 0
+    fractionlettercount = 0
+
+    #The positions of the first of each problem, -1 if it hasn't been found
+    fractionposition = -1
+    fractionendposition = -1
+    weekposition = -1
+    otherposition = -1
+    timeindate = -1
+    dateintime = -1
+    dateorder = -1
+    timeorder = -1
+
+    for index, character in enumerate(durationstr):
+        if character == '.' or character == ',':
+            fractioncount += 1
+
+            if fractioncount == 2 and fractionposition == -1:
+                fractionposition = index
+        elif character.isalpha() is True:
+            if fractioncount > 0:
+                #There should only ever be 1 letter after a decimal
+                fractionlettercount += 1
+
+                if fractionlettercount == 2 and fractionendposition == -1:
+                    fractionendposition = index
+
+            if character == 'W':
+                if weekposition == -1:
+                    weekposition = index
+            elif character in 'YMDHS':
+                if otherposition == -1:
+                    otherposition = index
+
+            if timeelements is None and character == 'T':
+                #The time half starts here
+                timeelements = {}
+                elements = timeelements
+                componentorder = 'THMS'
+                componentindex = 0
+            elif timeelements is None and character in 'HS':
+                #https://bitbucket.org/nielsenb/aniso8601/issues/7/durations-with-time-components-before-t
+                if timeindate == -1:
+                    timeindate = index
+            elif timeelements is not None and character in 'YD':
+                if dateintime == -1:
+                    dateintime = index
+
+            #https://bitbucket.org/nielsenb/aniso8601/issues/8/durations-with-components-in-wrong-order
+            if character in componentorder:
+                componentposition = componentorder.find(character, componentindex)
+
+                if componentposition != -1:
+                    componentindex = componentposition
+                elif timeelements is not None:
+                    if timeorder == -1:
+                        timeorder = index
+                elif dateorder == -1:
+                    dateorder = index
+
+            if index > 0:
+                if character not in elements:
+                    elements[character] = durationstr[elementstart:index]
+
+                elementstart = index + 1
+
+    #Make sure only the lowest order element has decimal precision
+    if fractionposition != -1:
+        return ((ErrorCode.DurationFraction, fractionposition), None, None)
+
+    if fractionendposition != -1:
+        return ((ErrorCode.DurationFractionEnd, fractionendposition), None, None)
+
+    #Do not allow W in combination with other designators
+    #https://bitbucket.org/nielsenb/aniso8601/issues/2/week-designators-should-not-be-combinable
+    if weekposition != -1 and otherposition != -1:
+        return ((ErrorCode.DurationWeek, max(weekposition, otherposition)), None, None)
+
+    #Make sure no time portion is included in the date half
+    if timeindate != -1:
+        if timeelements is None:
+            return ((ErrorCode.DurationTimeWithoutDesignator, timeindate), None, None)
+
+        return ((ErrorCode.DurationTimeInDate, timeindate), None, None)
+
+    if dateorder != -1:
+        return ((ErrorCode.DurationOrder, dateorder), None, None)
+
+    #Make sure no date component is included in the time half
+    if dateintime != -1:
+        return ((ErrorCode.DurationDateInTime, dateintime), None, None)
+
+    if timeorder != -1:
+        return ((ErrorCode.DurationTimeOrder, timeorder), None, None)
+
+    return (None, dateelements, timeelements)
+
 def _parse_duration_combined(durationstr, relative):
     #Period of the form P<date>T<time>
 
     #Split the string in to its component parts
     datepart, timepart = durationstr[1:].split('T') #We skip the 'P'
 
-    datevalue = parse_date(datepart)
-    timevalue = parse_time(timepart)
+    return _build_duration_combined(parse_date(datepart), parse_time(timepart), relative)
 
+def _build_duration_combined(datevalue, timevalue, relative):
+    #The year, month and day of the date, and the time, are the elements
+    #of the duration
     if relative is True:
-        return dateutil.relativedelta.relativedelta(years=datevalue.year, months=datevalue.month, days=datevalue.day, hours=timevalue.hour, minutes=timevalue.minute, seconds=timevalue.second, microseconds=timevalue.microsecond)
+        return _relativedelta()(years=datevalue.year, months=datevalue.month, days=datevalue.day, hours=timevalue.hour, minutes=timevalue.minute, seconds=timevalue.second, microseconds=timevalue.microsecond)
     else:
         totaldays = datevalue.year * 365 + datevalue.month * 30 + datevalue.day
 
         return datetime.timedelta(days=totaldays, hours=timevalue.hour, minutes=timevalue.minute, seconds=timevalue.second, microseconds=timevalue.microsecond)
 
-def _parse_duration_element(durationstr, elementstr):
-    #Extracts the specified portion of a duration, for instance, given:
-    #durationstr = 'T4H5M6.1234S'
-    #elementstr = 'H'
-    #
-    #returns 4
-    #
-    #Note that the string must start with a character, so its assumed the
-    #full duration string would be split at the 'T'
-
-    durationstartindex = 0
-    durationendindex = durationstr.find(elementstr)
-
-    for characterindex in compat.range(durationendindex - 1, 0, -1):
-        if durationstr[characterindex].isalpha() is True:
-            durationstartindex = characterindex
-            break
+def _relativedelta():
+    #dateutil is only imported once a relative duration is parsed, so
+    #importing aniso8601 doesn't pay for it
+    import dateutil.relativedelta
 
-    durationstartindex += 1
+    return dateutil.relativedelta.relativedelta
 
-    if ',' in durationstr:
-        #Replace the comma with a 'full-stop'
-        durationstr = durationstr.replace(',', '.')
+def _parse_duration_value(elements, designator):
+    #Returns the value of the element with the given designator, 0 if it
+    #isn't present, a comma may be used in place of a full-stop
+    if designator not in elements:
+        return 0
 
-    return float(durationstr[durationstartindex:durationendindex])
+    return float(elements[designator].replace(',', '.'))
 
 def _has_any_component(durationstr, components):
     #Given a duration string, and a list of components, returns True
@@ -218,42 +256,3 @@ def _has_any_component(durationstr, components):
             return True
 
     return False
-
-def _component_order_correct(durationstr, componentorder):
-    #Given a duration string, and a list of components, returns
-    #True if the components are in the same order as the
-    #component order list, False otherwise. Characters that
-    #are present in the component order list but not in the
-    #duration string are ignored.
-    #
-    #https://bitbucket.org/nielsenb/aniso8601/issues/8/durations-with-components-in-wrong-order
-    #
-    #durationstr = 'P1Y1M1D'
-    #components = ['P', 'Y', 'M', 'D']
-    #
-    #returns True
-    #
-    #durationstr = 'P1Y1M'
-    #components = ['P', 'Y', 'M', 'D']
-    #
-    #returns True
-    #
-    #durationstr = 'P1D1Y1M'
-    #components = ['P', 'Y', 'M', 'D']
-    #
-    #returns False
-
-    componentindex = 0
-
-    for characterindex in compat.range(len(durationstr)):
-        character = durationstr[characterindex]
-
-        if character in componentorder:
-            #This is a character we need to check the order of
-            if character in componentorder[componentindex:]:
-                componentindex = componentorder.index(character)
-            else:
-                #A character is out of order
-                return False
-
-    return True
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+from aniso8601 import compat
+
+class ErrorCode(object):
+    #The reasons a string isn't valid ISO 8601, as reported by the
+    #validate_* and try_parse_* functions, along with the position of the
+    #problem
+    (NotString, InvalidEncoding,
+     InvalidDate, InvalidWeekDate, ExtendedYear, YearOutOfRange, MonthOutOfRange, DayOutOfRange, WeekZero, DateOutOfRange,
+     InvalidTime, HourOutOfRange, MinuteOutOfRange, SecondOutOfRange,
+     InvalidTimezone, TimezoneNotInteger, NegativeZeroOffset,
+     InvalidDatetime,
+     InvalidDuration, DurationPrefix, DurationEnd, DurationFraction, DurationFractionEnd, DurationWeek,
+     DurationTimeWithoutDesignator, DurationTimeInDate, DurationDateInTime, DurationOrder, DurationTimeOrder,
+     DurationRelativeFraction, DurationOutOfRange,
+     InvalidInterval, IntervalTimezone, IntervalOutOfRange) = list(compat.range(34))
+
+#The exceptions raised by the parsers for the errors found by the layout
+#checks they share with the validators
+_EXCEPTIONS = {
+    ErrorCode.NotString: (TypeError, 'ISO 8601 string must be a str, or bytes-like object.'),
+    ErrorCode.InvalidDate: (ValueError, 'String is not an ISO 8601 date, perhaps it represents a time or datetime.'),
+    ErrorCode.InvalidWeekDate: (ValueError, 'String is not a valid ISO 8601 week date.'),
+    ErrorCode.ExtendedYear: (NotImplementedError, 'ISO 8601 extended year representation not supported.'),
+    ErrorCode.InvalidTime: (ValueError, 'String is not a valid ISO 8601 time.'),
+    ErrorCode.InvalidTimezone: (ValueError, 'String is not a valid ISO 8601 time offset.'),
+    ErrorCode.TimezoneNotInteger: (ValueError, 'invalid literal for int() with base 10: {0!r}'),
+    ErrorCode.NegativeZeroOffset: (ValueError, 'Negative ISO 8601 time offset cannot be 0.'),
+    ErrorCode.DurationEnd: (ValueError, 'ISO 8601 duration must end with a valid character.'),
+    ErrorCode.DurationFraction: (ValueError, 'ISO 8601 allows only lowest order element to have a decimal fraction.'),
+    ErrorCode.DurationFractionEnd: (ValueError, 'ISO 8601 duration must end with a single valid character.'),
+    ErrorCode.DurationWeek: (ValueError, 'ISO 8601 week designators may not be combined with other time designators.'),
+    ErrorCode.DurationTimeWithoutDesignator: (ValueError, 'ISO 8601 time components not allowed in duration without prescribed time.'),
+    ErrorCode.DurationTimeInDate: (ValueError, 'ISO 8601 time components not allowed in date portion of duration.'),
+    ErrorCode.DurationDateInTime: (ValueError, 'ISO 8601 date components not allowed in time portion of duration.'),
+    ErrorCode.DurationOrder: (ValueError, 'ISO 8601 duration components must be in the correct order.'),
+    ErrorCode.DurationTimeOrder: (ValueError, 'ISO 8601 time components in duration must be in the correct order.')
+}
+
+def build_exception(errorcode, text=None):
+    #Returns the exception a parser raises for the given ErrorCode, text is
+    #the part of the string the message quotes, if it quotes one
+    exceptiontype, message = _EXCEPTIONS[errorcode]
+
+    if text is not None:
+        message = message.format(text)
+
+    return exceptiontype(message)
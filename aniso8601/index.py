@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+#An IntervalIndex is built from ISO 8601 interval strings, and answers
+#which of them contain a date or datetime, and which of them overlap a
+#span of time, in time logarithmic in the number of intervals, plus the
+#number of intervals found.
+#
+#Intervals are half open, they contain their start, but not their end, and
+#<duration>/<end> intervals, or any other whose end is before its start,
+#are put in order. Empty intervals contain nothing, and overlap nothing.
+#Dates are taken as midnight, so intervals with date and datetime endpoints
+#can be mixed, and datetimes with a UTC offset are compared in UTC, but, as
+#when _parse_interval_parts combines a date with a datetime, dates and
+#datetimes without one can't be mixed with datetimes with one.
+#
+#The intervals are stored in a centered interval tree, each node has a
+#center, the intervals that contain it, sorted by their starts and by
+#their ends, and the nodes for the intervals entirely before, and
+#entirely after, it.
+#
+#A SortedColumn answers the same kind of queries for a sorted sequence of
+#date, or date time, strings, without parsing them. Strings with the same
+#shape, the same UTC offset, and no fraction finer than a microsecond, sort
+#as the dates and times they represent, so a value is formatted as such a
+#string, and the strings are bisected directly. Only the first and last
+#strings are parsed up front, the rest are checked for their shape and
+#order as strings. A time of 24:00 is parsed as midnight of the same day,
+#so strings with one don't sort, and aren't allowed.
+
+import bisect
+import datetime
+import itertools
+import operator
+
+from aniso8601 import compat
+from aniso8601.batch import _shape
+from aniso8601.date import parse_date, get_date_resolution
+from aniso8601.interval import _comparable, _decode, _parse_interval_parts
+from aniso8601.resolution import DateResolution, TimeResolution
+from aniso8601.time import parse_datetime, get_time_resolution, _split_tz
+
+_DAY_MICROSECONDS = 86400000000
+
+class IntervalIndex(object):
+    def __init__(self, isointervalstrs, intervaldelimiter='/', datetimedelimiter='T', relative=False):
+        #Given an iterable of strings representing ISO 8601 intervals, parse
+        #them as parse_interval would, raising if any can't be, and index
+        #them, the results of a query are their positions in the iterable
+        starts = []
+        ends = []
+        aware = None
+
+        for isointervalstr in isointervalstrs:
+            isointervalstr, intervaldelimiter, datetimedelimiter = _decode(isointervalstr, intervaldelimiter, datetimedelimiter)
+
+            start, end, _ = _parse_interval_parts(isointervalstr, intervaldelimiter, datetimedelimiter, relative)
+
+            aware = _check_aware(start, aware)
+            aware = _check_aware(end, aware)
+
+            start = _key(start)
+            end = _key(end)
+
+            if start > end:
+                start, end = end, start
+
+            starts.append(start)
+            ends.append(end)
+
+        self._aware = aware
+        self._length = len(starts)
+
+        #Every interval that isn't empty, sorted by start, for the overlap
+        #queries
+        self._order = sorted([position for position in compat.range(self._length) if starts[position] != ends[position]],
+                             key=starts.__getitem__)
+        self._sortedstarts = [starts[position] for position in self._order]
+
+        #The tree, each node is a list of its center, the starts and
+        #positions of its intervals sorted by start, the ends and positions
+        #sorted by end, and its child nodes, None if there isn't one
+        self._root = self._build(self._order, starts, ends)
+
+    def __len__(self):
+        return self._length
+
+    def containing(self, value):
+        #Returns a list of the positions of the intervals containing value,
+        #a date or datetime, in no particular order
+        point = self._query_key(value)
+
+        result = []
+        node = self._root
+
+        while node is not None:
+            center, nodestarts, startpositions, nodeends, endpositions, before, after = node
+
+            if point < center:
+                #Every interval of the node ends after point, those that
+                #have started by then contain it
+                result.extend(startpositions[:bisect.bisect_right(nodestarts, point)])
+                node = before
+            else:
+                #Every interval of the node has started by point, those
+                #that end after it contain it
+                result.extend(endpositions[bisect.bisect_right(nodeends, point):])
+                node = after
+
+        return result
+
+    def overlapping(self, start, end):
+        #Returns a list of the positions of the intervals that overlap the
+        #span from start, up to but not including end, dates or datetimes,
+        #in no particular order. As with the intervals, the span is put in
+        #order. Those are the intervals containing the start of the span,
+        #and those that start after it, and before its end
+        startpoint = self._query_key(start)
+        endpoint = self._query_key(end)
+
+        if startpoint > endpoint:
+            start = end
+            startpoint, endpoint = endpoint, startpoint
+        elif startpoint == endpoint:
+            return []
+
+        result = self.containing(start)
+
+        first = bisect.bisect_right(self._sortedstarts, startpoint)
+        last = bisect.bisect_left(self._sortedstarts, endpoint, first)
+
+        result.extend(self._order[first:last])
+
+        return result
+
+    def _query_key(self, value):
+        _check_aware(value, self._aware)
+
+        return _key(value)
+
+    def _build(self, positions, starts, ends):
+        #Builds the node for the intervals at positions, which are sorted by
+        #start. The center is the median start, so at most half of the
+        #intervals are entirely after it, and at most half entirely before
+        if len(positions) == 0:
+            return None
+
+        center = starts[positions[len(positions) // 2]]
+
+        before = []
+        after = []
+        contained = []
+
+        for position in positions:
+            if ends[position] <= center:
+                before.append(position)
+            elif starts[position] > center:
+                after.append(position)
+            else:
+                contained.append(position)
+
+        byend = sorted(contained, key=ends.__getitem__)
+
+        return [center, [starts[position] for position in contained], contained, [ends[position] for position in byend], byend,
+                self._build(before, starts, ends), self._build(after, starts, ends)]
+
+class SortedColumn(object):
+    def __init__(self, isostrs, delimiter='T'):
+        #Given a sequence of strings representing ISO 8601 dates, or date
+        #times, sorted from earliest to latest, raises a ValueError unless
+        #they share a shape that sorts as they do. Only the first and last
+        #strings are parsed, others that can't be raise when accessed
+        self._isostrs = [compat.decode(isostr) for isostr in isostrs]
+        self._delimiter = compat.decode(delimiter)
+
+        self._format = None
+        self._tzinfo = None
+        self._aware = None
+
+        if len(self._isostrs) == 0:
+            return
+
+        first = self._isostrs[0]
+        shape = _shape(first)
+
+        if shape is None or set(self._delimiter).isdisjoint('0123456789') is False:
+            raise ValueError('String is not an ASCII ISO 8601 date or date time.')
+
+        if len(set(map(_shape, self._isostrs))) != 1:
+            raise ValueError('Strings do not all have the same shape.')
+
+        if first.find(self._delimiter) == -1:
+            self._parse = parse_date
+            datestr = first
+            timestr = None
+        else:
+            self._parse = self._parse_datetime
+            datestr, timestr = first.split(self._delimiter)
+
+        firstvalue = self._parse(first)
+
+        if timestr is None:
+            self._aware = False
+            self._format = _date_format(datestr)
+        else:
+            timestr, tzstr = _split_tz(timestr)
+
+            self._tzinfo = firstvalue.tzinfo
+            self._aware = self._tzinfo is not None
+            self._format = _datetime_format(datestr, self._delimiter, timestr, tzstr)
+
+            timestart = len(datestr) + len(self._delimiter)
+
+            if '24' in set(map(operator.itemgetter(slice(timestart, timestart + 2)), self._isostrs)):
+                raise ValueError('Strings with a time of 24:00 do not sort.')
+
+            if tzstr is not None and tzstr != 'Z' and \
+               len(set(map(operator.itemgetter(slice(timestart + len(timestr), None)), self._isostrs))) != 1:
+                raise ValueError('Strings do not all have the same UTC offset.')
+
+        if all(map(operator.le, self._isostrs, itertools.islice(self._isostrs, 1, None))) is False:
+            raise ValueError('Strings are not sorted.')
+
+        self._parse(self._isostrs[-1])
+
+    def __len__(self):
+        return len(self._isostrs)
+
+    def __getitem__(self, index):
+        #Parses the string, or strings, at index
+        if isinstance(index, slice) is True:
+            return [self._parse(isostr) for isostr in self._isostrs[index]]
+
+        return self._parse(self._isostrs[index])
+
+    @property
+    def isostrs(self):
+        return self._isostrs
+
+    def bisect_left(self, value):
+        #Returns the position of the first string not before value, a date
+        #or datetime
+        isostr, exact = self._query(value)
+
+        if exact is False:
+            #Every string up to, and including, isostr is before value
+            return bisect.bisect_right(self._isostrs, isostr)
+
+        return bisect.bisect_left(self._isostrs, isostr)
+
+    def bisect_right(self, value):
+        #Returns the position of the first string after value, a date or
+        #datetime
+        return bisect.bisect_right(self._isostrs, self._query(value)[0])
+
+    def between(self, start, end):
+        #Returns the slice of the strings from start, up to but not
+        #including end, dates or datetimes
+        first = self.bisect_left(start)
+
+        return slice(first, max(first, self.bisect_left(end)))
+
+    def _parse_datetime(self, isostr):
+        return parse_datetime(isostr, delimiter=self._delimiter)
+
+    def _query(self, value):
+        #Returns a tuple of value, as a string of the shape of the column,
+        #truncated to its resolution, and whether that is exactly value,
+        #with value made comparable to the values of the column
+        if _check_aware(value, self._aware) is True:
+            value = value.astimezone(self._tzinfo)
+        else:
+            value = _comparable(value)
+
+        if self._format is None:
+            return ('', True)
+
+        isostr = self._format(value)
+
+        try:
+            exact = _comparable(self._parse(isostr)) == value
+        except ValueError:
+            #A truncated year of 0, before the first century, decade or
+            #millennium, sorts before every string, and is never exact
+            exact = False
+
+        return (isostr, exact)
+
+def _check_aware(value, aware):
+    #Returns whether value, a date or datetime, has a UTC offset, raising
+    #a TypeError if that differs from aware, unless aware is None
+    if isinstance(value, datetime.datetime) is True:
+        valueaware = value.utcoffset() is not None
+    elif isinstance(value, datetime.date) is True:
+        valueaware = False
+    else:
+        raise TypeError('Only dates and datetimes can be compared.')
+
+    if aware is not None and valueaware != aware:
+        raise TypeError('Can\'t compare offset-naive and offset-aware datetimes.')
+
+    return valueaware
+
+def _key(value):
+    #Returns the microseconds since the start of 0001-01-01, in UTC for a
+    #datetime with a UTC offset, a date is taken as midnight
+    key = value.toordinal() * _DAY_MICROSECONDS
+
+    if isinstance(value, datetime.datetime) is False:
+        return key
+
+    key += ((value.hour * 60 + value.minute) * 60 + value.second) * 1000000 + value.microsecond
+
+    offset = value.utcoffset()
+
+    if offset is not None:
+        key -= (offset.days * 86400 + offset.seconds) * 1000000 + offset.microseconds
+
+    return key
+
+def _date_format(datestr):
+    #Returns a function formatting the date of a date or datetime as a
+    #string of the same layout as datestr, truncated to its resolution
+    resolution = get_date_resolution(datestr)
+    separator = '-' if datestr.find('-') != -1 else ''
+
+    if resolution == DateResolution.Year:
+        #Truncated years are truncated to the same number of digits
+        template = '{0:0' + str(len(datestr)) + 'd}'
+        scale = 10 ** (4 - len(datestr))
+
+        return lambda value: template.format(value.year // scale)
+    elif resolution == DateResolution.Month:
+        return lambda value: '{0:04d}-{1:02d}'.format(value.year, value.month)
+    elif resolution == DateResolution.Day:
+        template = '{0:04d}' + separator + '{1:02d}' + separator + '{2:02d}'
+
+        return lambda value: template.format(value.year, value.month, value.day)
+    elif resolution == DateResolution.Ordinal:
+        template = '{0:04d}' + separator + '{1:03d}'
+
+        return lambda value: template.format(value.year, value.timetuple().tm_yday)
+    elif resolution == DateResolution.Week:
+        template = '{0:04d}' + separator + 'W{1:02d}'
+
+        return lambda value: template.format(*value.isocalendar()[0:2])
+
+    #DateResolution.Weekday
+    template = '{0:04d}' + separator + 'W{1:02d}' + separator + '{2:d}'
+
+    return lambda value: template.format(*value.isocalendar())
+
+def _datetime_format(datestr, delimiter, timestr, tzstr):
+    #Returns a function formatting a datetime as a string of the same
+    #layout as datestr, delimiter, timestr and the UTC offset tzstr, which
+    #is None if there is none, truncated to its resolution
+    if get_date_resolution(datestr) not in (DateResolution.Day, DateResolution.Ordinal, DateResolution.Weekday):
+        #The time of a value in a later day of the same week, month or year
+        #could sort before those of the strings
+        raise ValueError('Only date times with a complete date are sorted by.')
+
+    dateformat = _date_format(datestr)
+    resolution = get_time_resolution(timestr)
+    separator = ':' if timestr.find(':') != -1 else ''
+
+    fractionstr = timestr.partition('.')[2]
+
+    if fractionstr != '' and (resolution != TimeResolution.Seconds or len(fractionstr) > 6):
+        raise ValueError('Only fractions of seconds, of at most 6 digits, are sorted by.')
+
+    if resolution == TimeResolution.Hours:
+        template = '{0:02d}'
+    elif resolution == TimeResolution.Minutes:
+        template = '{0:02d}' + separator + '{1:02d}'
+    else:
+        template = '{0:02d}' + separator + '{1:02d}' + separator + '{2:02d}'
+
+    fractionlength = len(fractionstr)
+    suffix = tzstr if tzstr is not None else ''
+
+    def datetimeformat(value):
+        timestr = template.format(value.hour, value.minute, value.second)
+
+        if fractionlength != 0:
+            timestr += '.' + '{0:06d}'.format(value.microsecond)[0:fractionlength]
+
+        return dateformat(value) + delimiter + timestr + suffix
+
+    return datetimeformat
@@ -6,12 +6,16 @@
 # This software may be modified and distributed under the terms
 # of the BSD license.  See the LICENSE file for details.
 
-from datetime import datetime
+import itertools
+import operator
+
+from datetime import datetime, timedelta, MINYEAR, MAXYEAR
+from aniso8601 import compat
 from aniso8601.duration import parse_duration
 from aniso8601.time import parse_datetime
 from aniso8601.date import parse_date
 
-def parse_interval(isointervalstr, intervaldelimiter='/', datetimedelimiter='T', relative=False):
+def parse_interval(isointervalstr, intervaldelimiter='/', datetimedelimiter='T', relative=False, lazy=False):
     #Given a string representing an ISO 8601 interval, return a
     #tuple of datetime.date or date.datetime objects representing the beginning
     #and end of the specified interval. Valid formats are:
@@ -29,18 +33,36 @@ def parse_interval(isointervalstr, intervaldelimiter='/', datetimedelimiter='T',
     #
     #Is expressly not supported as there is no way to provide the addtional
     #required context.
+    #
+    #The string, and the delimiters, may also be bytes-like, in which case
+    #they are decoded
+    #
+    #With lazy=True, an Interval is returned instead, which only parses
+    #each part of the string when it is first used
+    if lazy is True:
+        return Interval(isointervalstr, intervaldelimiter, datetimedelimiter, relative)
+
+    isointervalstr, intervaldelimiter, datetimedelimiter = _decode(isointervalstr, intervaldelimiter, datetimedelimiter)
 
     interval_parts = _parse_interval_parts(isointervalstr, intervaldelimiter, datetimedelimiter, relative)
 
     return (interval_parts[0], interval_parts[1])
 
-def parse_repeating_interval(isointervalstr, intervaldelimiter='/', datetimedelimiter='T', relative=False):
+def parse_repeating_interval(isointervalstr, intervaldelimiter='/', datetimedelimiter='T', relative=False, as_array=False, limit=None, end=None):
     #Given a string representing an ISO 8601 interval repating, return a
-    #generator of datetime.date or date.datetime objects representing the
-    #dates specified by the repeating interval. Valid formats are:
+    #RepeatingInterval, a sequence of datetime.date or date.datetime objects
+    #representing the dates specified by the repeating interval. Valid
+    #formats are:
     #
     #Rnn/<interval>
     #R/<interval>
+    #
+    #The repeating interval is cut short at limit occurrences, and at end, a
+    #date or datetime, in the direction the occurrences go in, if either is
+    #given. With as_array=True, the occurrences are returned as a NumPy
+    #datetime64 array instead, see aniso8601.numpy, so an unbounded
+    #repeating interval requires a limit or an end.
+    isointervalstr, intervaldelimiter, datetimedelimiter = _decode(isointervalstr, intervaldelimiter, datetimedelimiter)
 
     if isointervalstr[0] != 'R':
         raise ValueError('ISO 8601 repeating interval must start with an R.')
@@ -55,11 +77,27 @@ def parse_repeating_interval(isointervalstr, intervaldelimiter='/', datetimedeli
 
     interval_parts = _parse_interval_parts(intervalpart, intervaldelimiter, datetimedelimiter, relative=relative)
 
-    #Now, build and return the generator
-    if iterations != None:
-        return _date_generator(interval_parts[0], interval_parts[2], iterations)
-    else:
-        return _date_generator_unbounded(interval_parts[0], interval_parts[2])
+    result = RepeatingInterval(interval_parts[0], interval_parts[2], iterations)
+
+    if end is not None:
+        result = result[:result._bisect(end)]
+
+    if limit is not None:
+        if limit < 0:
+            raise ValueError('A repeating interval limit must not be negative.')
+
+        result = result[:limit]
+
+    if as_array is True:
+        #NumPy is only imported when an array is asked for
+        from aniso8601.numpy import repeating_interval_array
+
+        return repeating_interval_array(result)
+
+    return result
+
+def _decode(isointervalstr, intervaldelimiter, datetimedelimiter):
+    return (compat.decode(isointervalstr), compat.decode(intervaldelimiter), compat.decode(datetimedelimiter))
 
 def _parse_interval_parts(isointervalstr, intervaldelimiter='/', datetimedelimiter='T', relative=False):
     #Returns a tuple containing the start of the interval, the end of the interval, and the interval timedelta
@@ -71,86 +109,621 @@ def _parse_interval_parts(isointervalstr, intervaldelimiter='/', datetimedelimit
         #is to maintain consistency with parsing <start>/<end> durations, as
         #well as making repeating interval code cleaner. Users who desire
         #durations to be in order can use the 'sorted' operator.
+        duration = parse_duration(firstpart, relative=relative)
+        end = _parse_endpoint(secondpart, datetimedelimiter)
+
+        return (end, _resolve_endpoint(end, firstpart, datetimedelimiter) - duration, -duration)
+    elif secondpart[0] == 'P':
+        #<start>/<duration>
+        duration = parse_duration(secondpart, relative=relative)
+        start = _parse_endpoint(firstpart, datetimedelimiter)
+
+        return (start, _resolve_endpoint(start, secondpart, datetimedelimiter) + duration, duration)
+    else:
+        #<start>/<end>
+        start = _parse_endpoint(firstpart, datetimedelimiter)
+        end = _parse_endpoint(secondpart, datetimedelimiter)
+
+        return (start, end, _endpoint_difference(start, end))
+
+def _parse_endpoint(isostr, datetimedelimiter):
+    #We need to figure out if the endpoint is a date, or a datetime
+    if isostr.find(datetimedelimiter) != -1:
+        return parse_datetime(isostr, delimiter=datetimedelimiter)
+
+    return parse_date(isostr)
+
+def _resolve_endpoint(endpoint, durationstr, datetimedelimiter):
+    #Returns the endpoint a duration is applied to, a date is upconverted to
+    #a datetime to preserve the resolution of a duration with a time
+    if isinstance(endpoint, datetime) is False and durationstr.find(datetimedelimiter) != -1:
+        return datetime.combine(endpoint, datetime.min.time())
+
+    return endpoint
+
+def _endpoint_difference(start, end):
+    #A date is compared as midnight when the other endpoint is a datetime
+    if isinstance(start, datetime) is isinstance(end, datetime):
+        return end - start
+    elif isinstance(start, datetime) is True:
+        return datetime.combine(end, datetime.min.time()) - start
+
+    return end - datetime.combine(start, datetime.min.time())
+
+#Marks the parts of an Interval that haven't been parsed yet
+_UNPARSED = object()
+
+class Interval(object):
+    #An ISO 8601 interval that keeps its string, and only parses its start,
+    #end and duration when each is first used, caching each one. The start
+    #and end are in order, for <duration>/<end> the start is the end minus
+    #the duration, and the duration of <start>/<end> is their difference.
+    #
+    #Iterating, indexing and comparing an Interval uses the tuple
+    #parse_interval returns, so it unpacks the same way, the end first for
+    #<duration>/<end>. A string that isn't valid raises, as parse_interval
+    #would, when the start, end or duration that can't be parsed, or
+    #computed, is first used.
+    __slots__ = ('_isointervalstr', '_intervaldelimiter', '_datetimedelimiter', '_relative', '_parts', '_start', '_end',
+                 '_duration')
+
+    def __init__(self, isointervalstr, intervaldelimiter='/', datetimedelimiter='T', relative=False):
+        self._isointervalstr, self._intervaldelimiter, self._datetimedelimiter = _decode(isointervalstr, intervaldelimiter, datetimedelimiter)
+        self._relative = relative
+        self._parts = None
+        self._start = _UNPARSED
+        self._end = _UNPARSED
+        self._duration = _UNPARSED
+
+    @property
+    def start(self):
+        if self._start is _UNPARSED:
+            firstpart = self._split()[0]
+
+            if firstpart[0] == 'P':
+                #<duration>/<end>
+                self._start = _resolve_endpoint(self.end, firstpart, self._datetimedelimiter) - self.duration
+            else:
+                self._start = _parse_endpoint(firstpart, self._datetimedelimiter)
+
+        return self._start
+
+    @property
+    def end(self):
+        if self._end is _UNPARSED:
+            firstpart, secondpart = self._split()
+
+            if firstpart[0] != 'P' and secondpart[0] == 'P':
+                #<start>/<duration>
+                self._end = _resolve_endpoint(self.start, secondpart, self._datetimedelimiter) + self.duration
+            else:
+                self._end = _parse_endpoint(secondpart, self._datetimedelimiter)
+
+        return self._end
+
+    @property
+    def duration(self):
+        if self._duration is _UNPARSED:
+            firstpart, secondpart = self._split()
+
+            if firstpart[0] == 'P':
+                self._duration = parse_duration(firstpart, relative=self._relative)
+            elif secondpart[0] == 'P':
+                self._duration = parse_duration(secondpart, relative=self._relative)
+            else:
+                self._duration = _endpoint_difference(self.start, self.end)
+
+        return self._duration
+
+    def __len__(self):
+        return 2
+
+    def __getitem__(self, index):
+        return self._astuple()[index]
 
-        #We need to figure out if <end> is a date, or a datetime
-        if secondpart.find(datetimedelimiter) != -1:
-            #<end> is a datetime
-            duration = parse_duration(firstpart, relative=relative)
-            enddatetime = parse_datetime(secondpart, delimiter=datetimedelimiter)
+    def __iter__(self):
+        return iter(self._astuple())
 
-            return (enddatetime, enddatetime - duration, -duration)
+    def __eq__(self, other):
+        if isinstance(other, Interval):
+            other = other._astuple()
+        elif isinstance(other, tuple) is False:
+            return NotImplemented
+
+        return self._astuple() == other
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+
+        if result is NotImplemented:
+            return result
+
+        return not result
+
+    def __hash__(self):
+        return hash(self._astuple())
+
+    def __repr__(self):
+        arguments = [repr(self._isointervalstr)]
+
+        if self._intervaldelimiter != '/':
+            arguments.append('intervaldelimiter={0!r}'.format(self._intervaldelimiter))
+
+        if self._datetimedelimiter != 'T':
+            arguments.append('datetimedelimiter={0!r}'.format(self._datetimedelimiter))
+
+        if self._relative is True:
+            arguments.append('relative=True')
+
+        return 'Interval({0})'.format(', '.join(arguments))
+
+    def _split(self):
+        if self._parts is None:
+            firstpart, secondpart = self._isointervalstr.split(self._intervaldelimiter)
+
+            self._parts = (firstpart, secondpart)
+
+        return self._parts
+
+    def _astuple(self):
+        #The tuple parse_interval returns
+        if self._split()[0][0] == 'P':
+            return (self.end, self.start)
+
+        return (self.start, self.end)
+
+class RepeatingInterval(object):
+    #The dates, or datetimes, of a repeating interval, iterations of them, or
+    #an unbounded number if iterations is None. Each one is computed from the
+    #start and the step, rather than by stepping through the ones before it,
+    #so they can be indexed, sliced, searched and iterated in reverse. A
+    #relativedelta step is applied as a multiple of its months and of its
+    #remaining days and time, so a day clamped to the end of a short month
+    #isn't carried into the months after it.
+    #
+    #next() steps through the occurrences, as it did through the generators
+    #previously returned by parse_repeating_interval
+    __slots__ = ('_origin', '_step', '_months', '_increment', '_promote', '_direction', '_offset', '_stride', '_length',
+                 '_cursor')
+
+    def __init__(self, start, step, iterations=None):
+        self._origin = start
+        self._step = step
+
+        if isinstance(step, timedelta):
+            self._months = 0
+            self._increment = step
+            self._promote = False
         else:
-            #<end> must just be a date
-            duration = parse_duration(firstpart, relative=relative)
-            enddate = parse_date(secondpart)
+            #A relativedelta, the months and years are applied first, then
+            #the rest as a timedelta, and a date is made a datetime if the
+            #step has a time
+            self._months = step.years * 12 + step.months
+            self._increment = timedelta(days=step.days, hours=step.hours, minutes=step.minutes, seconds=step.seconds,
+                                        microseconds=step.microseconds)
+            self._promote = bool(step._has_time) is True and isinstance(start, datetime) is False
+
+        if isinstance(start, datetime) is False and self._promote is False:
+            #Adding a timedelta to a date only adds its days
+            self._increment = timedelta(days=self._increment.days)
+
+        self._direction = _direction(self._months, self._increment)
+        self._offset = 0
+        self._stride = 1
+
+        if iterations is None:
+            self._length = None
+        else:
+            self._length = max(iterations, 0)
+
+        self._cursor = 0
+
+    def __len__(self):
+        if self._length is None:
+            raise TypeError('An unbounded repeating interval has no length.')
+
+        return self._length
+
+    def __bool__(self):
+        return self._length != 0
+
+    __nonzero__ = __bool__
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._slice(index)
+
+        index = operator.index(index)
+
+        if index < 0:
+            if self._length is None:
+                raise IndexError('Negative indices require a bounded repeating interval.')
+
+            index += self._length
+
+        if index < 0 or (self._length is not None and index >= self._length):
+            raise IndexError('Repeating interval index out of range.')
+
+        return self._occurrence(self._offset + index * self._stride)
+
+    def __iter__(self):
+        if self._length is None:
+            indices = itertools.count()
+        else:
+            indices = compat.range(self._length)
+
+        if self._months == 0 and self._promote is False:
+            #Each occurrence is the one before it plus the step, the next one
+            #is only computed once it is needed, so the last one of a bounded
+            #repeating interval can be the last representable date
+            increment = self._increment * self._stride
+            occurrence = None
+
+            for index in indices:
+                if index == 0:
+                    occurrence = self._occurrence(self._offset)
+                else:
+                    occurrence += increment
+
+                yield occurrence
+        else:
+            for index in indices:
+                yield self._occurrence(self._offset + index * self._stride)
+
+    def __reversed__(self):
+        if self._length is None:
+            raise TypeError('An unbounded repeating interval can\'t be reversed.')
+
+        return iter(self[::-1])
+
+    def __contains__(self, value):
+        try:
+            return self._find(value) is not None
+        except TypeError:
+            #Not a date or datetime, or naive when the occurrences are aware,
+            #or the other way around
+            return False
 
-            #See if we need to upconvert to datetime to preserve resolution
-            if firstpart.find(datetimedelimiter) != -1:
-                return (enddate, datetime.combine(enddate, datetime.min.time()) - duration, -duration)
+    def __next__(self):
+        if self._length is not None and self._cursor >= self._length:
+            raise StopIteration
+
+        occurrence = self._occurrence(self._offset + self._cursor * self._stride)
+        self._cursor += 1
+
+        return occurrence
+
+    next = __next__
+
+    def __repr__(self):
+        occurrences = []
+
+        try:
+            for occurrence in self[:4]:
+                occurrences.append(repr(occurrence))
+        except (ValueError, OverflowError):
+            #The occurrences have run past the representable dates
+            pass
+
+        if len(occurrences) > 3 and (self._length is None or self._length > 4):
+            occurrences[3] = '...'
+
+        return 'RepeatingInterval([{0}])'.format(', '.join(occurrences))
+
+    def index(self, value):
+        #The index of the occurrence equal to value, found by bisection, or
+        #arithmetically for a timedelta step, rather than by comparing each
+        #occurrence in turn
+        index = self._find(value)
+
+        if index is None:
+            raise ValueError('{0!r} is not in the repeating interval.'.format(value))
+
+        return index
+
+    def next_after(self, value):
+        #The earliest occurrence after value, a date or datetime, or None.
+        #Computed from the distance to the start for a timedelta step, or
+        #found by bisection for a relativedelta step
+        if self._ascending() is True:
+            return self._at(self._bisect(value, strict=True))
+
+        index = self._bisect(value)
+
+        if index is None:
+            return None
+
+        return self._at(index - 1)
+
+    def previous_before(self, value):
+        #The latest occurrence before value, a date or datetime, or None
+        if self._ascending() is False:
+            return self._at(self._bisect(value, strict=True))
+
+        index = self._bisect(value)
+
+        if index is None:
+            #Every occurrence, of an unbounded repeating interval with a zero
+            #step, is before value, and they are all the same
+            return self._at(0)
+
+        return self._at(index - 1)
+
+    def occurrences_between(self, start, end):
+        #The occurrences from start, up to but not including end, as a
+        #RepeatingInterval in the same order as this one
+        if _comparable(start) >= _comparable(end):
+            return self[0:0]
+
+        if self._ascending() is True:
+            first = self._bisect(start)
+            last = self._bisect(end)
+        else:
+            first = self._bisect(end, strict=True)
+            last = self._bisect(start, strict=True)
+
+        if first is None:
+            return self[0:0]
+
+        return self[first:last]
+
+    def _occurrence(self, index):
+        #The occurrence at index, counted from the start of the repeating
+        #interval rather than of a slice
+        occurrence = self._origin
+
+        if index == 0:
+            return occurrence
+
+        if self._months != 0:
+            occurrence = _shift_months(occurrence, self._months * index)
+
+        if self._promote is True:
+            occurrence = datetime.combine(occurrence, datetime.min.time())
+
+        return occurrence + self._increment * index
+
+    def _slice(self, indices):
+        if self._length is not None:
+            start, stop, stride = indices.indices(self._length)
+            length = len(compat.range(start, stop, stride))
+        else:
+            start, stop, stride = indices.start, indices.stop, indices.step
+
+            if stride is None:
+                stride = 1
+
+            if stride == 0:
+                raise ValueError('slice step cannot be zero')
+
+            if (start is not None and start < 0) or (stop is not None and stop < 0):
+                raise IndexError('Negative indices require a bounded repeating interval.')
+
+            if stride > 0:
+                if start is None:
+                    start = 0
+
+                if stop is None:
+                    length = None
+                else:
+                    length = len(compat.range(start, stop, stride))
             else:
-                return (enddate, enddate - duration, -duration)
-    elif secondpart[0] == 'P':
-        #<start>/<duration>
-        #We need to figure out if <start> is a date, or a datetime
-        if firstpart.find(datetimedelimiter) != -1:
-            #<start> is a datetime
-            duration = parse_duration(secondpart, relative=relative)
-            startdatetime = parse_datetime(firstpart, delimiter=datetimedelimiter)
+                if start is None:
+                    raise IndexError('A reversed slice of an unbounded repeating interval requires a start.')
+
+                if stop is None:
+                    stop = -1
+
+                length = len(compat.range(start, stop, stride))
+
+        result = RepeatingInterval.__new__(RepeatingInterval)
+
+        result._origin = self._origin
+        result._step = self._step
+        result._months = self._months
+        result._increment = self._increment
+        result._promote = self._promote
+        result._direction = self._direction
+        result._offset = self._offset + start * self._stride
+        result._stride = self._stride * stride
+        result._length = length
+        result._cursor = 0
+
+        return result
+
+    def _find(self, value):
+        #Returns the index of the occurrence equal to value, or None
+        if self._direction is None:
+            #The occurrences aren't in order, so they can only be compared
+            #in turn
+            if self._length is None:
+                raise ValueError('An unbounded repeating interval with a step that doesn\'t keep its occurrences in order can\'t be searched.')
 
-            return (startdatetime, startdatetime + duration, duration)
+            for index, occurrence in enumerate(self):
+                if occurrence == value:
+                    return index
+
+            return None
+
+        if self._length == 0:
+            return None
+
+        if self._direction == 0:
+            index = 0
         else:
-            #<start> must just be a date
-            duration = parse_duration(secondpart, relative=relative)
-            startdate = parse_date(firstpart)
+            index = self._bisect(value)
+
+        if self._length is not None and index >= self._length:
+            return None
+
+        try:
+            if self._occurrence(self._offset + index * self._stride) == value:
+                return index
+        except (ValueError, OverflowError):
+            pass
+
+        return None
+
+    def _bisect(self, value, strict=False):
+        #Returns the first index of an occurrence that isn't before value,
+        #or that is past it if strict is True, in the direction the
+        #occurrences go in, so value would be inserted there to keep them in
+        #order. The occurrences must be in order, if they are all the same
+        #they are taken to be ascending. An index is always returned, except
+        #when the step is zero, the repeating interval is unbounded, and
+        #every occurrence is before value, as there is no end to insert it
+        #at, then None is returned. Dates are compared as midnight
+        value = _comparable(value)
+
+        if self._direction is None:
+            raise ValueError('A repeating interval with a step that doesn\'t keep its occurrences in order can\'t be searched.')
+
+        if self._direction == 0:
+            occurrence = _comparable(self._occurrence(self._offset))
+
+            if occurrence > value or (strict is False and occurrence == value):
+                return 0
+
+            return self._length
 
-            #See if we need to upconvert to datetime to preserve resolution
-            if secondpart.find(datetimedelimiter) != -1:
-                return (startdate, datetime.combine(startdate, datetime.min.time()) + duration, duration)
+        direction = self._direction * (1 if self._stride > 0 else -1)
+
+        if self._months == 0 and self._promote is False:
+            #Computed from the distance to the first occurrence, in steps,
+            #rounded up, or down and past it if strict is True
+            span = _microseconds(self._increment) * self._stride
+            distance = _microseconds(value - _comparable(self._occurrence(self._offset)))
+
+            if strict is True:
+                index = max(distance // span + 1, 0)
             else:
-                return (startdate, startdate + duration, duration)
-    else:
-        #<start>/<end>
-        if firstpart.find(datetimedelimiter) != -1 and secondpart.find(datetimedelimiter) != -1:
-            #Both parts are datetimes
-            start_datetime = parse_datetime(firstpart, delimiter=datetimedelimiter)
-            end_datetime = parse_datetime(secondpart, delimiter=datetimedelimiter)
-
-            return (start_datetime, end_datetime, end_datetime - start_datetime)
-        elif firstpart.find(datetimedelimiter) != -1 and secondpart.find(datetimedelimiter) == -1:
-            #First part is a datetime, second part is a date
-            start_datetime = parse_datetime(firstpart, delimiter=datetimedelimiter)
-            end_date = parse_date(secondpart)
-
-            return (start_datetime, end_date, datetime.combine(end_date, datetime.min.time()) - start_datetime)
-        elif firstpart.find(datetimedelimiter) == -1 and secondpart.find(datetimedelimiter) != -1:
-            #First part is a date, second part is a datetime
-            start_date = parse_date(firstpart)
-            end_datetime = parse_datetime(secondpart, delimiter=datetimedelimiter)
-
-            return (start_date, end_datetime, end_datetime - datetime.combine(start_date, datetime.min.time()))
+                index = max(-(-distance // span), 0)
+
+            if self._length is not None:
+                index = min(index, self._length)
+
+            return index
+
+        def reached(index):
+            try:
+                occurrence = _comparable(self._occurrence(self._offset + index * self._stride))
+            except (ValueError, OverflowError):
+                #Past the last representable date, in the direction the
+                #occurrences go in
+                return True
+
+            if occurrence == value:
+                return strict is False
+
+            if direction > 0:
+                return occurrence > value
+
+            return occurrence < value
+
+        #Start from an estimate, taking a month to be its average length,
+        #and gallop away from it to a bracket for the bisection
+        span = (self._months * _AVERAGE_MONTH + _microseconds(self._increment)) * self._stride
+        distance = _microseconds(value - _comparable(self._occurrence(self._offset)))
+        estimate = max(int(float(distance) / span), 0)
+
+        if self._length is not None:
+            estimate = min(estimate, self._length)
+
+        step = 1
+
+        if self._length == estimate or reached(estimate) is True:
+            high = estimate
+            low = max(estimate - step, 0)
+
+            while low > 0 and reached(low) is True:
+                high = low
+                step *= 2
+                low = max(estimate - step, 0)
         else:
-            #Both parts are dates
-            start_date = parse_date(firstpart)
-            end_date = parse_date(secondpart)
+            low = estimate + 1
+            high = estimate + step
+
+            while (self._length is None or high < self._length) and reached(high) is False:
+                low = high + 1
+                step *= 2
+                high = estimate + step
+
+            if self._length is not None:
+                high = min(high, self._length)
+
+        while low < high:
+            middle = (low + high) // 2
+
+            if reached(middle) is True:
+                high = middle
+            else:
+                low = middle + 1
+
+        return low
+
+    def _ascending(self):
+        #True if the occurrences go forward in time, or are all the same
+        return self._direction * (1 if self._stride > 0 else -1) >= 0
+
+    def _at(self, index):
+        #The occurrence at index, or None past either end
+        if index is None or index < 0 or (self._length is not None and index >= self._length):
+            return None
+
+        try:
+            return self._occurrence(self._offset + index * self._stride)
+        except (ValueError, OverflowError):
+            return None
+
+_DAYS_IN_MONTH = (None, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+#The average length of a month in the Gregorian calendar, in microseconds
+_AVERAGE_MONTH = 146097 * 86400 * 1000000 // 4800
+
+def _direction(months, increment):
+    #1 if the occurrences of a repeating interval stepping by months, then
+    #increment, are ascending, -1 if they are descending, 0 if they are
+    #all the same, and None if they aren't in order. A month is at least
+    #28 days, even when the day is clamped, so the months decide the
+    #direction while the increment is smaller than that
+    monthsign = (months > 0) - (months < 0)
+    incrementsign = (increment > timedelta(0)) - (increment < timedelta(0))
+
+    if monthsign == 0:
+        return incrementsign
+
+    if incrementsign == 0 or incrementsign == monthsign or abs(increment) < timedelta(days=28 * abs(months)):
+        return monthsign
+
+    return None
+
+def _shift_months(value, months):
+    #Moves value by a number of months, the day is clamped to the end of the
+    #month as relativedelta does
+    year, month = divmod(value.year * 12 + value.month - 1 + months, 12)
+
+    if year < MINYEAR or year > MAXYEAR:
+        raise ValueError('year {0} is out of range'.format(year))
 
-            return (start_date, end_date, end_date - start_date)
+    return value.replace(year=year, month=month + 1, day=min(value.day, _days_in_month(year, month + 1)))
 
-def _date_generator(startdate, timedelta, iterations):
-    currentdate = startdate
-    currentiteration = 0
+def _days_in_month(year, month):
+    #calendar.monthrange would import calendar, and locale with it, for
+    #every import of aniso8601
+    if month == 2 and _isleap(year) is True:
+        return 29
 
-    while currentiteration < iterations:
-        yield currentdate
+    return _DAYS_IN_MONTH[month]
 
-        #Update the values
-        currentdate += timedelta
-        currentiteration += 1
+def _isleap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
 
-def _date_generator_unbounded(startdate, timedelta):
-    currentdate = startdate
+def _comparable(value):
+    #Dates are compared as midnight
+    if isinstance(value, datetime):
+        return value
 
-    while True:
-        yield currentdate
+    return datetime.combine(value, datetime.min.time())
 
-        #Update the value
-        currentdate += timedelta
+def _microseconds(delta):
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
@@ -0,0 +1,714 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+#Parses NumPy arrays of ISO 8601 strings in to datetime64 and timedelta64
+#arrays, and expands repeating intervals in to datetime64 arrays, this
+#module requires NumPy, which is not otherwise a dependency.
+#
+#Every string in an array is checked as the scalar parser would, strings
+#that fail to parse are marked False in the validity mask that is returned
+#with the results, and are NaT in the results themselves. Times and date
+#times are given as written, the UTC offset of each is returned as a
+#separate timedelta64 array, NaT where no offset was given, so the UTC
+#equivalents are the date times minus their offsets.
+#
+#Strings are grouped by shape, as the DatetimeParser does, the layout of
+#each shape is determined once, and the fields of every string of that
+#shape are then extracted and range checked an array at a time.
+
+from __future__ import absolute_import
+
+import collections
+import datetime
+
+import numpy
+
+from aniso8601 import compat
+from aniso8601.batch import _date_layout, _time_layout
+from aniso8601.date import parse_date
+from aniso8601.duration import parse_duration
+from aniso8601.resolution import DateResolution, TimeResolution
+from aniso8601.time import parse_time, parse_datetime
+
+DateArray = collections.namedtuple('DateArray', ['dates', 'valid'])
+TimeArray = collections.namedtuple('TimeArray', ['times', 'offsets', 'valid'])
+DatetimeArray = collections.namedtuple('DatetimeArray', ['datetimes', 'offsets', 'valid'])
+DurationArray = collections.namedtuple('DurationArray', ['durations', 'valid'])
+
+#The calendar relative durations parsed with relative=True, days and
+#microseconds are normalized as a timedelta is, so there are always fewer
+#microseconds than in a day
+RELATIVE_DURATION_DTYPE = numpy.dtype([('months', numpy.int64), ('days', numpy.int64), ('microseconds', numpy.int64)])
+
+#The integer value of NaT
+_NAT = numpy.iinfo(numpy.int64).min
+
+_DAY_MICROSECONDS = 86400000000
+
+_EPOCH = datetime.date(1970, 1, 1)
+_MIN_DAY = (datetime.date.min - _EPOCH).days
+_MAX_DAY = (datetime.date.max - _EPOCH).days
+
+_MONTH_DAYS = numpy.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=numpy.int64)
+
+#Fractions longer than this can overflow when converted to microseconds,
+#strings with them are parsed one at a time
+_MAX_FRACTION_DIGITS = 9
+
+#Duration elements longer than this can overflow when combined, strings
+#with them are parsed one at a time
+_MAX_DURATION_DIGITS = 12
+
+#The occurrences of a repeating interval with a calendar step are computed
+#this many at a time, so the intermediate arrays stay small
+_REPEATING_CHUNK = 65536
+
+#A repeating interval whose occurrences are this many microseconds from the
+#start, without its months, is out of range whatever its months are
+_MAX_REPEATING_MICROSECONDS = 2 ** 62
+
+_MAX_MICROSECONDS = numpy.iinfo(numpy.int64).max
+
+_SHAPE_HASH_MULTIPLIER = numpy.uint64(1000003)
+
+#The designators of the date and time halves of a duration, and the
+#element each gives
+_DURATION_DATE_DESIGNATORS = {'Y': 'years', 'M': 'months', 'W': 'weeks', 'D': 'days'}
+_DURATION_TIME_DESIGNATORS = {'H': 'hours', 'M': 'minutes', 'S': 'seconds'}
+
+def parse_date_array(isodatestrs, width=None):
+    #Given an array of strings in any ISO 8601 date format, return a
+    #DateArray of a datetime64[D] array of the dates, and a boolean array,
+    #True where the string was valid. isodatestrs can be anything
+    #numpy.asarray accepts, or a buffer of strings width bytes long.
+    days, _, _, valid = _parse_array(isodatestrs, width, None, True, False)
+
+    return DateArray(_as_nat(days, valid).view('M8[D]'), valid)
+
+def parse_time_array(isotimestrs, width=None):
+    #Given an array of strings in any ISO 8601 time format, return a
+    #TimeArray of a timedelta64[us] array of the times since midnight, a
+    #timedelta64[us] array of the UTC offsets, and a boolean array, True
+    #where the string was valid
+    _, microseconds, offsets, valid = _parse_array(isotimestrs, width, None, False, True)
+
+    return TimeArray(_as_nat(microseconds, valid).view('m8[us]'), _as_nat(offsets, valid).view('m8[us]'), valid)
+
+def parse_datetime_array(isodatetimestrs, delimiter='T', width=None):
+    #Given an array of strings in ISO 8601 date time format, return a
+    #DatetimeArray of a datetime64[us] array of the date times, a
+    #timedelta64[us] array of the UTC offsets, and a boolean array, True
+    #where the string was valid
+    days, microseconds, offsets, valid = _parse_array(isodatetimestrs, width, delimiter, True, True)
+
+    datetimes = days * _DAY_MICROSECONDS + microseconds
+
+    return DatetimeArray(_as_nat(datetimes, valid).view('M8[us]'), _as_nat(offsets, valid).view('m8[us]'), valid)
+
+def parse_duration_array(isodurationstrs, relative=False, width=None):
+    #Given an array of strings representing ISO 8601 durations, return a
+    #DurationArray of a timedelta64[us] array of the durations (or an array
+    #of RELATIVE_DURATION_DTYPE if relative=True), and a boolean array, True
+    #where the string was valid. Durations too long for a timedelta64[us],
+    #about 292,000 years, are not valid.
+    #
+    #Durations whose elements are all whole numbers are parsed an array at
+    #a time, others are parsed one at a time, so they are converted exactly
+    #as parse_duration does.
+    strings = _as_string_array(isodurationstrs, width)
+    shape = strings.shape
+    strings = strings.ravel()
+
+    count = len(strings)
+
+    months = numpy.zeros(count, dtype=numpy.int64)
+    days = numpy.zeros(count, dtype=numpy.int64)
+    microseconds = numpy.zeros(count, dtype=numpy.int64)
+    valid = numpy.zeros(count, dtype=bool)
+
+    codes = _string_codes(strings)
+
+    for sample, rows in _group_shapes(strings, codes):
+        layout = _learn_duration_layout(sample, relative)
+
+        if layout is False:
+            #Every string of this shape is invalid
+            continue
+
+        if layout is None:
+            for row in rows:
+                _parse_duration_row(strings[row], row, relative, months, days, microseconds, valid)
+
+            continue
+
+        digits = numpy.ascontiguousarray(codes[rows].T).astype(numpy.int64) - 48
+
+        months[rows], days[rows], microseconds[rows], valid[rows] = _build_durations(digits, layout, relative)
+
+    valid = valid.reshape(shape)
+
+    if relative is True:
+        durations = numpy.zeros(count, dtype=RELATIVE_DURATION_DTYPE)
+        durations['months'] = months
+        durations['days'] = days
+        durations['microseconds'] = microseconds
+
+        return DurationArray(durations.reshape(shape), valid)
+
+    return DurationArray(_as_nat(microseconds.reshape(shape), valid).view('m8[us]'), valid)
+
+def repeating_interval_array(repeatinginterval):
+    #Given a bounded RepeatingInterval, as returned by
+    #parse_repeating_interval, return a datetime64[D] array of its
+    #occurrences if they are dates, or a datetime64[us] array if they are
+    #date times, which are given as written, as parse_datetime_array gives
+    #them. The occurrences of a timedelta step are computed as numpy.arange
+    #would, those of a relativedelta step a chunk at a time, each as
+    #RepeatingInterval computes it. An occurrence out of range raises a
+    #ValueError or OverflowError, as it does when it is computed.
+    if repeatinginterval._length is None:
+        raise ValueError('An unbounded repeating interval requires a limit or an end to be expanded in to an array.')
+
+    origin = repeatinginterval._origin
+    count = len(repeatinginterval)
+
+    if isinstance(origin, datetime.datetime) is True or repeatinginterval._promote is True:
+        unit = 'M8[us]'
+        scale = _DAY_MICROSECONDS
+        increment = _timedelta_microseconds(repeatinginterval._increment)
+    else:
+        unit = 'M8[D]'
+        scale = 1
+        increment = repeatinginterval._increment.days
+
+    if count == 0:
+        return numpy.zeros(0, dtype=unit)
+
+    if repeatinginterval._months == 0 and repeatinginterval._promote is False:
+        #The last occurrence is the furthest from the first, computing it
+        #checks they are all in range
+        first = repeatinginterval[0]
+        repeatinginterval[-1]
+
+        start = (_as_date(first) - _EPOCH).days * scale + _time_microseconds(first)
+
+        return (numpy.arange(count, dtype=numpy.int64) * (increment * repeatinginterval._stride) + start).view(unit)
+
+    originmonth = origin.year * 12 + origin.month - 1
+    origintime = _time_microseconds(origin)
+
+    values = numpy.empty(count, dtype=numpy.int64)
+
+    for chunkstart in compat.range(0, count, _REPEATING_CHUNK):
+        chunkstop = min(chunkstart + _REPEATING_CHUNK, count)
+        indices = repeatinginterval._offset + numpy.arange(chunkstart, chunkstop, dtype=numpy.int64) * repeatinginterval._stride
+
+        #The months are moved first, the day clamped to the end of the
+        #month, then the rest of the step is added
+        year, month = numpy.divmod(originmonth + indices * repeatinginterval._months, 12)
+        month += 1
+
+        day = numpy.minimum(origin.day, _days_in_month(year, month))
+        chunk = _days_from_civil(year, month, day) * scale + origintime + indices * increment
+
+        #As when they are computed one at a time, the first occurrence out
+        #of range raises a ValueError if its year is, and an OverflowError
+        #otherwise, the rest of the step is checked so it can't overflow
+        yearoutofrange = (year < datetime.MINYEAR) | (year > datetime.MAXYEAR)
+        outofrange = yearoutofrange | (chunk < _MIN_DAY * scale) | (chunk >= (_MAX_DAY + 1) * scale)
+
+        if increment != 0:
+            outofrange |= numpy.abs(indices) > _MAX_REPEATING_MICROSECONDS // (abs(increment) * (_DAY_MICROSECONDS // scale))
+
+        if numpy.any(outofrange):
+            first = numpy.argmax(outofrange)
+
+            if yearoutofrange[first]:
+                raise ValueError('year {0} is out of range'.format(year[first]))
+
+            raise OverflowError('date value out of range')
+
+        values[chunkstart:chunkstop] = chunk
+
+    return values.view(unit)
+
+def _parse_array(isostrs, width, delimiter, hasdate, hastime):
+    #Returns int64 arrays of the days since the epoch, microseconds since
+    #midnight and UTC offsets in microseconds, and the boolean validity
+    #array, all in the shape of isostrs
+    strings = _as_string_array(isostrs, width)
+    shape = strings.shape
+    strings = strings.ravel()
+
+    count = len(strings)
+
+    days = numpy.zeros(count, dtype=numpy.int64)
+    microseconds = numpy.zeros(count, dtype=numpy.int64)
+    offsets = numpy.full(count, _NAT, dtype=numpy.int64)
+    valid = numpy.zeros(count, dtype=bool)
+
+    codes = _string_codes(strings)
+
+    for sample, rows in _group_shapes(strings, codes):
+        layout = _learn_layout(sample, delimiter, hasdate, hastime)
+
+        if layout is False:
+            #Every string of this shape is invalid
+            continue
+
+        if layout is None:
+            for row in rows:
+                _parse_row(strings[row], row, delimiter, hasdate, hastime, days, microseconds, offsets, valid)
+
+            continue
+
+        datelayout, timelayout, sample = layout
+
+        #Each column of the strings is made contiguous
+        digits = numpy.ascontiguousarray(codes[rows].T).astype(numpy.int64) - 48
+        rowvalid = numpy.ones(len(rows), dtype=bool)
+
+        if datelayout is not None:
+            rowdays, rowvalid = _build_days(digits, *datelayout)
+            days[rows] = rowdays
+
+        if timelayout is not None:
+            resolution, slices, fractionslice, tzslice = timelayout
+
+            rowmicroseconds, timevalid = _build_microseconds(digits, resolution, slices, fractionslice)
+            microseconds[rows] = rowmicroseconds
+            rowvalid &= timevalid
+
+            if tzslice is not None:
+                rowoffsets, offsetvalid = _build_offsets(digits, sample, tzslice)
+                offsets[rows] = rowoffsets
+                rowvalid &= offsetvalid
+
+        valid[rows] = rowvalid
+
+    return (days.reshape(shape), microseconds.reshape(shape), offsets.reshape(shape), valid.reshape(shape))
+
+def _as_string_array(isostrs, width):
+    #Returns isostrs as a contiguous NumPy array of bytes or unicode strings
+    #in native byte order
+    if isinstance(isostrs, (bytes, bytearray, memoryview)):
+        if width is None:
+            raise ValueError('A width is required to parse a buffer of strings.')
+
+        isostrs = numpy.frombuffer(isostrs, dtype='S' + str(width))
+
+    strings = numpy.asarray(isostrs)
+
+    if strings.dtype.kind == 'O' or strings.size == 0:
+        strings = strings.astype('U')
+
+    if strings.dtype.kind not in ('S', 'U'):
+        raise TypeError('Only arrays of strings can be parsed.')
+
+    return numpy.ascontiguousarray(strings, dtype=strings.dtype.newbyteorder('='))
+
+def _string_codes(strings):
+    #Returns a two dimensional array of the character codes of the strings,
+    #one row for each string
+    if strings.dtype.kind == 'S':
+        return strings.view(numpy.uint8).reshape(len(strings), strings.dtype.itemsize)
+
+    return strings.view(numpy.uint32).reshape(len(strings), strings.dtype.itemsize // 4)
+
+def _group_shapes(strings, codes):
+    #Returns a list of tuples of the shape, a string with every digit
+    #replaced by 1, and the rows of the strings with that shape
+    if codes.size == 0:
+        return []
+
+    isdigit = (codes >= 48) & (codes <= 57)
+    shapes = numpy.where(isdigit, 49, codes).astype(codes.dtype)
+
+    if numpy.all(shapes == shapes[0]):
+        #Usually every string has the same shape
+        return [(shapes[0].view(strings.dtype)[0], numpy.arange(len(shapes)))]
+
+    #Shapes are grouped by a hash of each, any collision is caught by
+    #comparing every shape to the first with its hash, in which case the
+    #shapes themselves are sorted, which is much slower
+    keys = numpy.zeros(len(shapes), dtype=numpy.uint64)
+
+    for column in numpy.ascontiguousarray(shapes.T).astype(numpy.uint64):
+        keys = keys * _SHAPE_HASH_MULTIPLIER + column
+
+    _, first, inverse = numpy.unique(keys, return_index=True, return_inverse=True)
+    uniqueshapes = shapes[first]
+    inverse = inverse.ravel()
+
+    if numpy.all(shapes == uniqueshapes[inverse]) == False:
+        uniqueshapes, inverse = numpy.unique(shapes, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+
+    rows = numpy.argsort(inverse, kind='mergesort')
+    bounds = numpy.cumsum(numpy.bincount(inverse))[:-1]
+
+    return [(shape.view(strings.dtype)[0], shaperows) for shape, shaperows in zip(uniqueshapes, numpy.split(rows, bounds))]
+
+def _learn_layout(sample, delimiter, hasdate, hastime):
+    #Returns a tuple of the date layout, time layout and sample for strings
+    #of the same shape as the sample, whose digits are all 1, False if
+    #they are all invalid, or None if they have to be parsed one at a time
+    if isinstance(sample, bytes):
+        try:
+            sample = sample.decode('ascii')
+        except UnicodeError:
+            return None
+    elif any(ord(character) > 127 for character in sample):
+        #The scalar parser accepts other digits
+        return None
+
+    if delimiter is not None and set(delimiter).isdisjoint('0123456789') is False:
+        #A delimiter containing digits would be hidden by the shape
+        return None
+
+    #Whether a string is valid only depends on its values after its shape
+    #has been checked, and 1 is valid in every field, so if the sample
+    #fails, every string of the shape does
+    try:
+        _parse_scalar(sample, delimiter, hasdate, hastime)
+    except (ValueError, NotImplementedError, OverflowError):
+        return False
+
+    datelayout = None
+    timelayout = None
+
+    if hasdate is True and hastime is True:
+        datestr, timestr = sample.split(delimiter)
+
+        datelayout = _date_layout(datestr)
+        timelayout = _time_layout(timestr, len(datestr) + len(delimiter))
+    elif hasdate is True:
+        datelayout = _date_layout(sample)
+    else:
+        timelayout = _time_layout(sample, 0)
+
+    if timelayout is not None:
+        fractionslice = timelayout[2]
+
+        if fractionslice.stop - fractionslice.start > _MAX_FRACTION_DIGITS:
+            return None
+
+    return (datelayout, timelayout, sample)
+
+def _parse_scalar(isostr, delimiter, hasdate, hastime):
+    #Returns a tuple of the date and time parsed from isostr, either may be
+    #None
+    if hasdate is True and hastime is True:
+        result = parse_datetime(isostr, delimiter=delimiter)
+
+        return (result.date(), result.timetz())
+    elif hasdate is True:
+        return (parse_date(isostr), None)
+
+    return (None, parse_time(isostr))
+
+def _parse_row(isostr, row, delimiter, hasdate, hastime, days, microseconds, offsets, valid):
+    #Parses a single string with the scalar parser, storing the result
+    if isinstance(isostr, bytes):
+        try:
+            isostr = isostr.decode('ascii')
+        except UnicodeError:
+            return
+
+    try:
+        datepart, timepart = _parse_scalar(isostr, delimiter, hasdate, hastime)
+    except (ValueError, NotImplementedError, OverflowError):
+        return
+
+    if datepart is not None:
+        days[row] = (datepart - _EPOCH).days
+
+    if timepart is not None:
+        microseconds[row] = ((timepart.hour * 60 + timepart.minute) * 60 + timepart.second) * 1000000 + timepart.microsecond
+
+        if timepart.tzinfo is not None:
+            #UTCOffset doesn't range check its offset, unlike time.utcoffset
+            offsets[row] = _timedelta_microseconds(timepart.tzinfo.utcoffset(None))
+
+    valid[row] = True
+
+def _learn_duration_layout(sample, relative):
+    #Returns a list of tuples of the element, and the slice of its digits,
+    #for durations of the same shape as the sample, False if they are all
+    #invalid, or None if they have to be parsed one at a time
+    if isinstance(sample, bytes):
+        try:
+            sample = sample.decode('ascii')
+        except UnicodeError:
+            return None
+
+    try:
+        parse_duration(sample, relative=relative)
+    except (ValueError, NotImplementedError, OverflowError, IndexError):
+        #An empty string raises an IndexError
+        if relative is True and (sample.find('.') != -1 or sample.find(',') != -1):
+            #Whether a fractional year or month is whole depends on its
+            #value
+            return None
+
+        return False
+
+    #Only durations made up of whole numbers, each followed by a known
+    #designator, are parsed an array at a time, anything else, like
+    #fractions, signs, or a combined date and time, is parsed as
+    #parse_duration does
+    layout = []
+    designators = _DURATION_DATE_DESIGNATORS
+    elementstart = 1
+
+    for index in compat.range(1, len(sample)):
+        character = sample[index]
+
+        if character == '1':
+            continue
+
+        if character == 'T' and designators is _DURATION_DATE_DESIGNATORS and elementstart == index:
+            designators = _DURATION_TIME_DESIGNATORS
+            elementstart = index + 1
+        elif character in designators and 0 < index - elementstart <= _MAX_DURATION_DIGITS:
+            element = designators[character]
+
+            if element in (name for name, _ in layout):
+                return None
+
+            layout.append((element, slice(elementstart, index)))
+            elementstart = index + 1
+        else:
+            return None
+
+    if elementstart != len(sample) or len(layout) == 0:
+        return None
+
+    return layout
+
+def _parse_duration_row(isodurationstr, row, relative, months, days, microseconds, valid):
+    #Parses a single duration with parse_duration, storing the result
+    if isinstance(isodurationstr, bytes):
+        try:
+            isodurationstr = isodurationstr.decode('ascii')
+        except UnicodeError:
+            return
+
+    try:
+        duration = parse_duration(isodurationstr, relative=relative)
+
+        if relative is True:
+            #The fraction of the days, and the time elements, are normalized
+            #as a timedelta, the whole days may be too many for a timedelta
+            wholedays = int(duration.days)
+            delta = datetime.timedelta(days=duration.days - wholedays, hours=duration.hours, minutes=duration.minutes, seconds=duration.seconds, microseconds=duration.microseconds)
+            values = (duration.years * 12 + duration.months, wholedays + delta.days, delta.seconds * 1000000 + delta.microseconds)
+        else:
+            values = (0, 0, _timedelta_microseconds(duration))
+    except (ValueError, NotImplementedError, OverflowError, IndexError):
+        return
+
+    if any(abs(value) > _MAX_MICROSECONDS for value in values):
+        return
+
+    months[row], days[row], microseconds[row] = values
+    valid[row] = True
+
+def _build_durations(digits, layout, relative):
+    #Returns the months, days and microseconds of the durations, and whether
+    #each is valid, months and days are 0 unless relative is True
+    elements = dict((element, _field_values(digits, elementslice)) for element, elementslice in layout)
+
+    days = elements.get('weeks', 0) * 7 + elements.get('days', 0)
+    seconds = (elements.get('hours', 0) * 60 + elements.get('minutes', 0)) * 60 + elements.get('seconds', 0)
+
+    if relative is True:
+        extradays, seconds = numpy.divmod(seconds, 86400)
+
+        return (elements.get('years', 0) * 12 + elements.get('months', 0), days + extradays, seconds * 1000000, True)
+
+    #Years are treated as 365 days, and months as 30 days
+    days = days + elements.get('years', 0) * 365 + elements.get('months', 0) * 30
+
+    #The duration has to fit in a timedelta64[us]
+    valid = seconds <= _MAX_MICROSECONDS // 1000000
+    microseconds = numpy.where(valid, seconds, 0) * 1000000
+    valid &= days <= (_MAX_MICROSECONDS - microseconds) // _DAY_MICROSECONDS
+
+    return (0, 0, numpy.where(valid, days, 0) * _DAY_MICROSECONDS + microseconds, valid)
+
+def _build_days(digits, resolution, slices, yearscale):
+    #Returns the days since the epoch of the dates, and whether each is
+    #valid, checked as the date builders do
+    year = _field_values(digits, slices[0]) * yearscale
+    valid = year >= 1
+
+    if resolution == DateResolution.Year:
+        return (_days_from_civil(year, 1, 1), valid)
+    elif resolution == DateResolution.Month or resolution == DateResolution.Day:
+        month = _field_values(digits, slices[1])
+        valid &= (month >= 1) & (month <= 12)
+
+        #Invalid months are clipped so the days can still be computed
+        month = numpy.clip(month, 1, 12)
+
+        if resolution == DateResolution.Month:
+            return (_days_from_civil(year, month, 1), valid)
+
+        day = _field_values(digits, slices[2])
+        valid &= (day >= 1) & (day <= _days_in_month(year, month))
+
+        return (_days_from_civil(year, month, day), valid)
+    elif resolution == DateResolution.Ordinal:
+        ordinalday = _field_values(digits, slices[1])
+        valid &= (ordinalday >= 1) & (ordinalday <= 366)
+
+        days = _days_from_civil(year, 1, 1) + ordinalday - 1
+        valid &= days <= _MAX_DAY
+
+        return (days, valid)
+
+    #Week dates count from the Monday of the week containing the 4th of
+    #January, the epoch was a Thursday
+    week = _field_values(digits, slices[1])
+    valid &= week != 0
+
+    if resolution == DateResolution.Weekday:
+        weekday = _field_values(digits, slices[2])
+    else:
+        weekday = 1
+
+    fourthjan = _days_from_civil(year, 1, 4)
+    days = fourthjan - (fourthjan + 3) % 7 + (week - 1) * 7 + weekday - 1
+    valid &= (days >= _MIN_DAY) & (days <= _MAX_DAY)
+
+    return (days, valid)
+
+def _build_microseconds(digits, resolution, slices, fractionslice):
+    #Returns the microseconds since midnight of the times, and whether each
+    #is valid, checked as the time builders do
+    hour = _field_values(digits, slices[0])
+    fraction = _field_values(digits, fractionslice)
+    fractiondigits = fractionslice.stop - fractionslice.start
+
+    if resolution == TimeResolution.Seconds:
+        minute = _field_values(digits, slices[1])
+        second = _field_values(digits, slices[2])
+        microsecond = _fraction_to_microseconds(fraction, fractiondigits, 1000000)
+
+        #Rounding may carry in to the seconds
+        carry = microsecond == 1000000
+        second = second + carry
+        microsecond = numpy.where(carry, 0, microsecond)
+
+        midnight = hour == 24
+        valid = (second < 60) & (minute <= 60) & (midnight | ((hour < 24) & (minute < 60)))
+        microseconds = ((hour * 60 + minute) * 60 + second) * 1000000 + microsecond
+
+        return (numpy.where(midnight, 0, microseconds), valid)
+    elif resolution == TimeResolution.Minutes:
+        minute = _field_values(digits, slices[1])
+        valid = (minute < 60) | ((minute == 60) & (fraction == 0))
+        valid &= hour <= 24
+
+        microseconds = (hour * 60 + minute) * 60000000 + _fraction_to_microseconds(fraction, fractiondigits, 60000000)
+
+        return (numpy.where(hour == 24, 0, microseconds % _DAY_MICROSECONDS), valid)
+
+    #Hour 24 with a fraction wraps around, as it does when built
+    microseconds = hour * 3600000000 + _fraction_to_microseconds(fraction, fractiondigits, 3600000000)
+
+    return (microseconds % _DAY_MICROSECONDS, hour <= 24)
+
+def _build_offsets(digits, sample, tzslice):
+    #Returns the UTC offsets in microseconds, and whether each is valid,
+    #checked as parse_timezone does
+    tzstart = tzslice.start
+    tzstr = sample[tzslice]
+
+    if tzstr == 'Z':
+        return (numpy.zeros(digits.shape[1], dtype=numpy.int64), numpy.ones(digits.shape[1], dtype=bool))
+
+    hour = _field_values(digits, slice(tzstart + 1, tzstart + 3))
+
+    if len(tzstr) == 6:
+        #±hh:mm
+        minute = _field_values(digits, slice(tzstart + 4, tzstart + 6))
+    elif len(tzstr) == 5:
+        #±hhmm
+        minute = _field_values(digits, slice(tzstart + 3, tzstart + 5))
+    else:
+        #±hh
+        minute = 0
+
+    offsets = (hour * 60 + minute) * 60000000
+
+    if tzstr[0] == '+':
+        return (offsets, numpy.ones(digits.shape[1], dtype=bool))
+
+    #A negative offset cannot be 0
+    return (-offsets, offsets != 0)
+
+def _field_values(digits, fieldslice):
+    #Returns the integer values of the digits in the given columns
+    values = numpy.zeros(digits.shape[1], dtype=numpy.int64)
+
+    for column in digits[fieldslice]:
+        values = values * 10 + column
+
+    return values
+
+def _fraction_to_microseconds(fraction, fractiondigits, unitmicroseconds):
+    #Returns the microseconds represented by the fraction, fractiondigits
+    #long, of a unit unitmicroseconds long, rounded half to even as the
+    #scalar parser does
+    if fractiondigits == 0:
+        return fraction
+
+    scale = 10 ** fractiondigits
+
+    microseconds, remainder = numpy.divmod(fraction * unitmicroseconds, scale)
+    remainder *= 2
+
+    return microseconds + ((remainder > scale) | ((remainder == scale) & (microseconds % 2 == 1)))
+
+def _days_from_civil(year, month, day):
+    #Returns the days since the epoch of the given proleptic Gregorian dates,
+    #years are counted from March, so the leap day is the last of the year
+    year = year - (month <= 2)
+    era = year // 400
+    yearofera = year - era * 400
+    dayofyear = (153 * (month + numpy.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    dayofera = yearofera * 365 + yearofera // 4 - yearofera // 100 + dayofyear
+
+    return era * 146097 + dayofera - 719468
+
+def _days_in_month(year, month):
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+
+    return _MONTH_DAYS[month] + (leap & (month == 2))
+
+def _as_date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+
+    return value
+
+def _time_microseconds(value):
+    #Returns the microseconds since midnight of a datetime, 0 for a date
+    if isinstance(value, datetime.datetime):
+        return ((value.hour * 60 + value.minute) * 60 + value.second) * 1000000 + value.microsecond
+
+    return 0
+
+def _timedelta_microseconds(delta):
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+def _as_nat(values, valid):
+    #Returns the values with the invalid ones replaced by NaT
+    return numpy.where(valid, values, _NAT)
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+#parse_many parses a large iterable of ISO 8601 strings across a pool of
+#processes. The strings are split in to chunks, each chunk is parsed by a
+#worker, and the results are returned in order, as a single array of
+#64 bit integers:
+#
+#'datetime' - The microseconds since the Unix epoch, as parse_datetime
+#             returns with output='epoch_us', date times without a UTC
+#             offset are taken to be UTC
+#'date' - The microseconds since the Unix epoch of midnight, UTC
+#'duration' - The microseconds of the duration
+#
+#Arrays of integers are sent back from the workers, rather than datetime
+#objects, so little more than the integers themselves is copied between
+#processes. The array is in native byte order, so it can be viewed as a
+#NumPy datetime64[us], or timedelta64[us], array without copying.
+#
+#The errors argument is handled as by the parse_*_many functions, see
+#batch.py, but with PARSE_MANY_INVALID in place of None, which NumPy
+#reads as NaT.
+#
+#Only a few chunks more than there are workers are parsed, or waiting to
+#be, at once, so the strings can be read lazily, from a file, say.
+
+import array
+import concurrent.futures
+import functools
+import itertools
+import multiprocessing
+
+from aniso8601.batch import _FAILURES, _check_errors, _check_string
+from aniso8601.date import parse_date
+from aniso8601.duration import parse_duration
+from aniso8601.time import parse_datetime
+
+#The number of strings parsed by a worker at a time
+PARSE_MANY_CHUNKSIZE = 65536
+
+#The result of a string that fails to parse with errors='coerce' or
+#'collect', the value NumPy uses for NaT
+PARSE_MANY_INVALID = -2 ** 63
+
+#Python 2's array has no 'q', its 'l' is 64 bits on 64 bit Linux and macOS
+try:
+    array.array('q')
+    _TYPECODE = 'q'
+except ValueError:
+    _TYPECODE = 'l'
+
+_EPOCH_ORDINAL = 719163
+
+_DAY_MICROSECONDS = 86400000000
+
+def parse_many(isostrs, kind='datetime', workers=None, chunksize=PARSE_MANY_CHUNKSIZE, delimiter='T', errors='raise'):
+    #Given an iterable of strings of the given kind, 'datetime', 'date' or
+    #'duration', return an array of the microseconds each represents, in
+    #order. workers is the number of processes, by default, the number of
+    #CPUs, with 1, the strings are parsed in this process
+    if kind not in _kind_map:
+        raise ValueError('kind must be one of \'datetime\', \'date\' or \'duration\'.')
+
+    _check_errors(errors)
+
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+
+    if workers < 1 or chunksize < 1:
+        raise ValueError('workers and chunksize must be at least 1.')
+
+    iterator = iter(isostrs)
+    chunks = iter(lambda: list(itertools.islice(iterator, chunksize)), [])
+
+    results = array.array(_TYPECODE)
+    failures = []
+
+    if workers == 1:
+        for chunkindex, chunk in enumerate(chunks):
+            _extend(results, failures, _parse_chunk(kind, delimiter, errors, chunkindex * chunksize, chunk))
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        pending = []
+
+        try:
+            for chunkindex, chunk in enumerate(chunks):
+                pending.append(executor.submit(_parse_chunk, kind, delimiter, errors, chunkindex * chunksize, chunk))
+
+                if len(pending) > workers * 2:
+                    _extend(results, failures, pending.pop(0).result())
+
+            for future in pending:
+                _extend(results, failures, future.result())
+        finally:
+            #Chunks still waiting are cancelled if one raised
+            for future in pending:
+                future.cancel()
+
+            executor.shutdown()
+
+    if errors == 'collect':
+        return (results, failures)
+
+    return results
+
+def _extend(results, failures, chunkresult):
+    chunkresults, chunkfailures = chunkresult
+
+    results.extend(chunkresults)
+    failures.extend(chunkfailures)
+
+def _parse_chunk(kind, delimiter, errors, start, isostrs):
+    #Parses a chunk of strings, the first of which is at start in the
+    #input, returning a tuple of the array of results, and a list of
+    #(index, exception) tuples, only filled for errors='collect'
+    if kind == 'datetime':
+        parse = functools.partial(parse_datetime, delimiter=delimiter, output='epoch_us')
+    else:
+        parse = _kind_map[kind]
+
+    failures = []
+
+    try:
+        #Most chunks have no invalid strings, so every string is parsed in
+        #one go, and the chunk is only parsed one string at a time if one
+        #fails
+        return (array.array(_TYPECODE, map(parse, isostrs)), failures)
+    except _FAILURES + (AttributeError,):
+        #Something that isn't a string can fail with an AttributeError, so
+        #even with errors='raise' the strings are parsed again, one at a
+        #time, each checked as batch.py does, so the same exception is
+        #raised
+        pass
+
+    results = array.array(_TYPECODE)
+
+    for index, isostr in enumerate(isostrs):
+        try:
+            _check_string(isostr)
+
+            results.append(parse(isostr))
+        except _FAILURES as e:
+            if errors == 'raise':
+                raise
+
+            results.append(PARSE_MANY_INVALID)
+
+            if errors == 'collect':
+                failures.append((start + index, e))
+
+    return (results, failures)
+
+def _parse_date(isodatestr):
+    return (parse_date(isodatestr).toordinal() - _EPOCH_ORDINAL) * _DAY_MICROSECONDS
+
+def _parse_duration(isodurationstr):
+    result = parse_duration(isodurationstr)
+
+    return (result.days * 86400 + result.seconds) * 1000000 + result.microseconds
+
+_kind_map = {
+    'datetime': None,
+    'date': _parse_date,
+    'duration': _parse_duration
+}
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+#The optional compiled parsers, aniso8601._speedups, handle the common date,
+#time, date time and UTC offset formats. When they are built, parse_date,
+#parse_time, parse_datetime and parse_timezone try them first, falling back
+#to the pure Python parsers for anything they don't handle, including every
+#invalid string, so the results, and any exceptions raised, are the same.
+#
+#They are not used if the ANISO8601_PURE_PYTHON environment variable is set.
+
+import os
+
+try:
+    from aniso8601 import _speedups
+except ImportError:
+    _speedups = None
+
+#The compiled module the parsers use, None if the pure Python parsers are
+#used
+if os.environ.get('ANISO8601_PURE_PYTHON'):
+    compiled = None
+else:
+    compiled = _speedups
+
+def speedups_available():
+    #Returns True if the compiled parsers are built
+    return _speedups is not None
+
+def speedups_enabled():
+    #Returns True if the compiled parsers are in use
+    return compiled is not None
+
+def enable_speedups():
+    #Uses the compiled parsers, an ImportError is raised if they aren't
+    #built
+    global compiled
+
+    if _speedups is None:
+        raise ImportError('aniso8601._speedups is not built.')
+
+    compiled = _speedups
+
+def disable_speedups():
+    #Uses the pure Python parsers
+    global compiled
+
+    compiled = None
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+#The stream parsers find an ISO 8601 date time on each line of a bytes
+#buffer, or of a memory mapped file, and yield (offset, datetime) tuples,
+#offset is the offset of the start of the line in the buffer. Lines are
+#split on \n, a trailing \r is ignored.
+#
+#The date time starts at the given column, or, if a prefix is given, just
+#after the first occurrence of the prefix at or after the column. It ends
+#after width bytes if width is given, otherwise at the first space, or the
+#end of the line.
+#
+#Date times are parsed directly from the bytes, by the compiled parsers if
+#they are built, see speedups.py, otherwise as a DatetimeParser parses
+#strings, only the first date time of each shape is decoded. The errors
+#argument determines what happens when a line has no valid date time:
+#
+#'raise' - The exception is raised, and parsing stops, this is the default
+#'coerce' - (offset, None) is yielded for the line
+#'skip' - Nothing is yielded for the line, for instance, for the
+#         continuation lines of a multi-line log message
+
+import datetime
+import mmap
+import os
+
+from aniso8601 import compat, speedups
+from aniso8601.batch import DATETIMEPARSER_MAXSHAPES, _SHAPE_TABLE, \
+     _compile_date_plan, _compile_time_plan
+from aniso8601.time import parse_datetime, _parse_tzinfo
+from aniso8601.timezone import UTCOFFSET_CACHE_MAXSIZE
+
+def parse_datetime_stream(buffer, column=0, prefix=None, width=None, delimiter='T', errors='raise'):
+    #Given a bytes-like buffer of lines, bytes, bytearray, memoryview or
+    #mmap, yield an (offset, datetime.datetime) tuple for each line
+    if errors not in ('raise', 'coerce', 'skip'):
+        raise ValueError('errors must be one of \'raise\', \'coerce\' or \'skip\'.')
+
+    if isinstance(buffer, memoryview) is True:
+        buffer = _searchable(buffer)
+
+    if prefix is not None and isinstance(prefix, bytes) is False:
+        prefix = prefix.encode('ascii')
+
+    parse = _StreamParser(delimiter).parse
+    find = buffer.find
+    tobytes = isinstance(buffer, bytearray)
+
+    bufferlen = len(buffer)
+    linestart = 0
+
+    while linestart < bufferlen:
+        lineend = find(b'\n', linestart)
+
+        if lineend == -1:
+            lineend = bufferlen
+            nextlinestart = bufferlen
+        else:
+            nextlinestart = lineend + 1
+
+        try:
+            start, end = _find_datetime(find, linestart, lineend, column, prefix, width)
+
+            if end == lineend and find(b'\r', end - 1, end) != -1:
+                end -= 1
+
+            isobytes = buffer[start:end]
+
+            if tobytes is True:
+                #Shapes are looked up by the date time, which must be
+                #hashable
+                isobytes = bytes(isobytes)
+
+            result = parse(isobytes)
+        except (ValueError, NotImplementedError, OverflowError):
+            if errors == 'raise':
+                raise
+
+            if errors == 'coerce':
+                yield (linestart, None)
+        else:
+            yield (linestart, result)
+
+        linestart = nextlinestart
+
+def parse_datetime_file(filename, column=0, prefix=None, width=None, delimiter='T', errors='raise'):
+    #Given the name of a file of lines, memory maps it, and yields an
+    #(offset, datetime.datetime) tuple for each line, as
+    #parse_datetime_stream does
+    with open(filename, 'rb') as streamfile:
+        if os.fstat(streamfile.fileno()).st_size == 0:
+            #An empty file can't be mapped
+            return
+
+        buffer = mmap.mmap(streamfile.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            for result in parse_datetime_stream(buffer, column=column, prefix=prefix, width=width, delimiter=delimiter, errors=errors):
+                yield result
+        finally:
+            buffer.close()
+
+def _searchable(view):
+    #A memoryview can't be searched, so the object it views is searched
+    #instead, if it is a bytes, bytearray or mmap, and the memoryview covers
+    #all of it. Any other memoryview, a slice of one of them, say, is copied
+    #to bytes, the Python 2 memoryview doesn't have obj
+    viewed = getattr(view, 'obj', None)
+
+    if isinstance(viewed, (bytes, bytearray, mmap.mmap)) is True and view.contiguous is True and view.nbytes == len(viewed):
+        return viewed
+
+    return view.tobytes()
+
+def _find_datetime(find, linestart, lineend, column, prefix, width):
+    #Returns the start and end of the date time on the line
+    start = linestart + column
+
+    if prefix is not None:
+        start = find(prefix, start, lineend)
+
+        if start == -1:
+            raise ValueError('Prefix not found.')
+
+        start += len(prefix)
+
+    if width is None:
+        end = find(b' ', start, lineend)
+
+        if end == -1:
+            end = lineend
+    else:
+        end = min(start + width, lineend)
+
+    return (start, end)
+
+class _StreamParser(object):
+    #Parses date times from bytes, as a DatetimeParser parses strings, the
+    #plans slice and convert the bytes directly
+    def __init__(self, delimiter):
+        self._delimiter = delimiter
+        self._plans = {}
+        self._tzinfos = {}
+
+        #A delimiter containing digits would be hidden by the shape
+        self._compile = set(delimiter).isdisjoint('0123456789')
+
+    def parse(self, isobytes):
+        if speedups.compiled is not None:
+            result = speedups.compiled.parse_datetime(isobytes, self._delimiter, self._tzinfo)
+
+            if result is not None:
+                return result
+
+        shape = isobytes.translate(_SHAPE_TABLE)
+        plan = self._plans.get(shape)
+
+        if plan is None:
+            return self._learn(isobytes, shape)
+
+        dateplan, timeplan = plan
+
+        return datetime.datetime.combine(dateplan(isobytes), timeplan(isobytes))
+
+    def _learn(self, isobytes, shape):
+        #The first date time of each shape is decoded and parsed in full,
+        #non-ASCII date times are always parsed in full
+        try:
+            isodatetimestr = isobytes.decode('ascii')
+        except UnicodeError:
+            return parse_datetime(isobytes.decode('utf-8'), delimiter=self._delimiter)
+
+        result = parse_datetime(isodatetimestr, delimiter=self._delimiter)
+
+        if self._compile is True and len(self._plans) < DATETIMEPARSER_MAXSHAPES:
+            datestr, timestr = isodatetimestr.split(self._delimiter)
+
+            self._plans[shape] = (_compile_date_plan(datestr),
+                                  _compile_time_plan(timestr, len(datestr) + len(self._delimiter), self._tzinfo))
+
+        return result
+
+    def _tzinfo(self, tzstr):
+        #Each UTC offset is only parsed the first time it is seen, it is
+        #given as a str by the compiled parsers, and as bytes by the plans
+        tzinfo = self._tzinfos.get(tzstr)
+
+        if tzinfo is None:
+            tzinfo = _parse_tzinfo(compat.decode(tzstr))
+
+            if len(self._tzinfos) < UTCOFFSET_CACHE_MAXSIZE:
+                self._tzinfos[tzstr] = tzinfo
+
+        return tzinfo
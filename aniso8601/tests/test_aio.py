@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+import unittest
+import datetime
+
+from aniso8601.date import parse_date
+from aniso8601.duration import parse_duration
+from aniso8601.time import parse_time, parse_datetime
+
+try:
+    import asyncio
+    import concurrent.futures
+
+    from aniso8601.aio import parse_lines
+except (ImportError, SyntaxError):
+    parse_lines = None
+
+@unittest.skipIf(parse_lines is None, 'async generators are not supported.')
+class TestParseLines(unittest.TestCase):
+    def test_parse_lines(self):
+        isodatetimestrs = ['1977-06-10T12:{0:02d}:00.5+01:00'.format(minute) for minute in range(50)]
+        expected = [parse_datetime(isodatetimestr) for isodatetimestr in isodatetimestrs]
+
+        lines = [isodatetimestr + '\n' for isodatetimestr in isodatetimestrs]
+        lines[1] = lines[1].encode('ascii')
+        lines[2] = memoryview(lines[2].encode('ascii'))
+        lines[3] = '  ' + lines[3][:-1] + '\r\n'
+
+        self.assertEqual(_collect(parse_lines(_Source(lines), batchsize=7)), expected)
+        self.assertEqual(_collect(parse_lines(_Source(lines))), expected)
+
+        self.assertEqual(_collect(parse_lines(_Source(['1981-04-05 23:21:28']), delimiter=' ')),
+                         [datetime.datetime(1981, 4, 5, 23, 21, 28)])
+        self.assertEqual(_collect(parse_lines(_Source([]))), [])
+
+    def test_parse_lines_chunked(self):
+        isodatetimestrs = ['1977-06-10T12:{0:02d}:00Z'.format(minute) for minute in range(50)]
+        expected = [parse_datetime(isodatetimestr) for isodatetimestr in isodatetimestrs]
+
+        data = '\n'.join(isodatetimestrs).encode('ascii')
+
+        for chunksize in (1, 7, 20, 21, len(data)):
+            chunks = [data[start:start + chunksize] for start in range(0, len(data), chunksize)]
+
+            self.assertEqual(_collect(parse_lines(_Source(chunks), chunked=True, batchsize=8)), expected)
+
+        chunks = [memoryview(b'1977-06-10T12:00:00Z\n1977'), '-06-10T12:01:00Z\n'.encode('ascii')]
+
+        self.assertEqual(_collect(parse_lines(_Source(chunks), chunked=True)), expected[0:2])
+        self.assertEqual(_collect(parse_lines(_Source(['1977-06-10T12:00:00Z\n19', '77-06-10T12:01:00Z\n']), chunked=True)),
+                         expected[0:2])
+
+    def test_parse_lines_kind(self):
+        self.assertEqual(_collect(parse_lines(_Source(['1981-04-05', '2004-W53-6']), kind='date')),
+                         [parse_date('1981-04-05'), parse_date('2004-W53-6')])
+        self.assertEqual(_collect(parse_lines(_Source(['23:21:28.5', '0100']), kind='time')),
+                         [parse_time('23:21:28.5'), parse_time('0100')])
+        self.assertEqual(_collect(parse_lines(_Source(['P1Y2M3DT4H54M6.5S', 'PT36H']), kind='duration')),
+                         [parse_duration('P1Y2M3DT4H54M6.5S'), parse_duration('PT36H')])
+
+    def test_parse_lines_errors(self):
+        lines = ['1981-04-05', '1981-04-31', '1981-04-06', '']
+        dates = [datetime.date(1981, 4, 5), datetime.date(1981, 4, 6)]
+
+        results = []
+
+        with self.assertRaises(ValueError) as e:
+            _collect(parse_lines(_Source(lines), kind='date'), results)
+
+        self.assertEqual(str(e.exception), 'day is out of range for month')
+        self.assertEqual(results, dates[0:1])
+
+        self.assertEqual(_collect(parse_lines(_Source(lines), kind='date', errors='coerce', batchsize=2)),
+                         [dates[0], None, dates[1], None])
+        self.assertEqual(_collect(parse_lines(_Source(lines), kind='date', errors='skip')), dates)
+
+        #Strings laid out correctly, but out of range, fail on their own
+        self.assertEqual(_collect(parse_lines(_Source(['1981-04-05', '9999-W53']), kind='date', errors='skip')), dates[0:1])
+        self.assertEqual(_collect(parse_lines(_Source(['9999-W53', 'P1000000000D']), kind='duration', errors='coerce')), [None, None])
+
+        with self.assertRaises(OverflowError):
+            _collect(parse_lines(_Source(['9999-W53']), kind='date'))
+
+        #Lines that aren't strings fail as they do in batch.py
+        self.assertEqual(_collect(parse_lines(_Source(['1981-04-05', None, 1981]), kind='date', errors='coerce')),
+                         [dates[0], None, None])
+        self.assertEqual(_collect(parse_lines(_Source([None, '1981-04-05']), kind='date', errors='skip')), dates[0:1])
+
+        with self.assertRaises(TypeError):
+            _collect(parse_lines(_Source(['1981-04-05', None]), kind='date'))
+
+        with self.assertRaises(TypeError):
+            _collect(parse_lines(_Source(['1981-04-05\n', None]), kind='date', errors='coerce', chunked=True))
+
+        with self.assertRaises(ValueError):
+            _collect(parse_lines(_Source(lines), kind='interval'))
+
+        with self.assertRaises(ValueError):
+            _collect(parse_lines(_Source(lines), errors='collect'))
+
+        with self.assertRaises(ValueError):
+            _collect(parse_lines(_Source(lines), batchsize=0))
+
+    def test_parse_lines_executor(self):
+        isodatetimestrs = ['1977-06-10T{0:02d}:00:00+01:00'.format(hour) for hour in range(24)]
+        expected = [parse_datetime(isodatetimestr) for isodatetimestr in isodatetimestrs]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            for maxpending in (1, 3):
+                source = _Source(isodatetimestrs)
+
+                self.assertEqual(_collect(parse_lines(source, batchsize=5, executor=executor, offloadsize=5,
+                                                      maxpending=maxpending)), expected)
+
+            results = []
+
+            with self.assertRaises(ValueError):
+                _collect(parse_lines(_Source(isodatetimestrs[0:7] + ['1977-06-10T25:00:00']), batchsize=4,
+                                     executor=executor, offloadsize=1), results)
+
+            self.assertEqual(results, expected[0:7])
+
+    def test_parse_lines_backpressure(self):
+        #Lines are only read as the results are asked for, and, with an
+        #executor, at most maxpending batches are read ahead
+        source = _Source(['1981-04-05'] * 100)
+
+        _collect(parse_lines(source, kind='date', batchsize=4), limit=1)
+
+        self.assertEqual(source.read, 4)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            source = _Source(['1981-04-05'] * 100)
+
+            _collect(parse_lines(source, kind='date', batchsize=4, executor=executor, offloadsize=1, maxpending=3), limit=1)
+
+            self.assertLessEqual(source.read, 12)
+
+    def test_parse_lines_maxlatency(self):
+        #A batch that isn't full is parsed once it has waited maxlatency
+        #seconds, rather than waiting for more lines
+        source = _Source(['1981-04-05'] * 3 + ['1981-04-06'], delays={3: 5})
+        results = []
+
+        _collect(parse_lines(source, kind='date', batchsize=100, maxlatency=0.01), results, limit=3)
+
+        self.assertEqual(results, [datetime.date(1981, 4, 5)] * 3)
+
+class _Source(object):
+    #An async iterable of the given items, each delayed by the given number
+    #of seconds, counting the items read
+    def __init__(self, items, delays=None):
+        self._items = items
+        self._delays = delays or {}
+        self.read = 0
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        if self.read == len(self._items):
+            raise StopAsyncIteration
+
+        index = self.read
+        self.read += 1
+
+        return asyncio.sleep(self._delays.get(index, 0), result=self._items[index])
+
+def _collect(generator, results=None, limit=None):
+    #Runs an async generator in a new event loop, returning the list of its
+    #results, or filling results, stopping after limit results
+    if results is None:
+        results = []
+
+    loop = asyncio.new_event_loop()
+
+    try:
+        while limit is None or len(results) < limit:
+            try:
+                results.append(loop.run_until_complete(generator.__anext__()))
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(generator.aclose())
+        loop.close()
+
+    return results
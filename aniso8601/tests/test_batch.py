@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+import unittest
+import datetime
+import threading
+
+from aniso8601.batch import parse_date_many, parse_time_many, \
+     parse_datetime_many, parse_duration_many, DatetimeParser
+from aniso8601.date import parse_date
+from aniso8601.time import parse_time, parse_datetime
+from aniso8601.duration import parse_duration
+
+class TestBatchParserFunctions(unittest.TestCase):
+    def test_parse_date_many(self):
+        testdates = ['2013', '19', '1981-04-05', '19810405', '1981-04', '2004-W53', '2004W536', '1981-095', '1981095']
+
+        self.assertEqual(parse_date_many(testdates), [parse_date(testdate) for testdate in testdates])
+
+        #Any iterable can be parsed
+        self.assertEqual(parse_date_many(iter(testdates)), [parse_date(testdate) for testdate in testdates])
+
+    def test_parse_time_many(self):
+        testtimes = ['01:23:45', '23:21:28.512400', '23:21:28.000001', '01:23', '01:23.4567', '012345', '0123', '01', '12.5',
+                     '232128.512400+00:00', '01:23:45+00:00', '01:23:45-12:34', '01:23:45+11:15', '01:23:45Z', '23:21:28.512400Z']
+
+        self.assertEqual(parse_time_many(testtimes), [parse_time(testtime) for testtime in testtimes])
+
+        for result, testtime in zip(parse_time_many(testtimes), testtimes):
+            self.assertEqual(result.tzinfo, parse_time(testtime).tzinfo)
+
+    def test_parse_datetime_many(self):
+        testdatetimes = ['1981-04-05T23:21:28.512400Z', '1981-04-06T23:21:28.512400Z', '1981095T23:21:28.512400-12:34',
+                         '1981096T23:21:28.512400-12:34', '19810405T23:21:28+00', '19810405T23:21:28+00:00',
+                         '2004-W53-6T23:21:28.512400-12:34', '1981-04-05T01:23', '1981-04-05T01:23:45']
+
+        results = parse_datetime_many(testdatetimes)
+
+        self.assertEqual(results, [parse_datetime(testdatetime) for testdatetime in testdatetimes])
+
+        for result, testdatetime in zip(results, testdatetimes):
+            self.assertEqual(result.tzinfo, parse_datetime(testdatetime).tzinfo)
+
+        self.assertEqual(parse_datetime_many(['2004-W53-6 23:21:28.512400-12:34'], delimiter=' '),
+                         [parse_datetime('2004-W53-6 23:21:28.512400-12:34', delimiter=' ')])
+
+    def test_parse_datetime_many_sameshape(self):
+        #The layout is reused for strings of the same shape, the values
+        #must still be checked
+        with self.assertRaises(ValueError):
+            parse_datetime_many(['1981-04-05T00:00:00', '1981-04-05T00:00:60'])
+
+        with self.assertRaises(ValueError):
+            parse_datetime_many(['1981-04-05T00:00:00+00:00', '1981-04-05T00:00:00-00:00'])
+
+        with self.assertRaises(ValueError):
+            parse_datetime_many(['1981-04-05T00:00:00', '1981-13-05T00:00:00'])
+
+    def test_parse_duration_many(self):
+        testdurations = ['P1Y2M3DT4H54M6S', 'P1Y2M3DT4H54M6.5S', 'P1Y2M3D', 'PT4H54M6.5S', 'P1W', 'P0003-06-04T12:30:05']
+
+        self.assertEqual(parse_duration_many(testdurations), [parse_duration(testduration) for testduration in testdurations])
+        self.assertEqual(parse_duration_many(testdurations, relative=True),
+                         [parse_duration(testduration, relative=True) for testduration in testdurations])
+
+    def test_parse_many_errors(self):
+        testdatetimes = ['1981-04-05T23:21:28', '1981-04-05T23:21:60', 'garbage', '1981-04-05T23:21:29']
+
+        with self.assertRaises(ValueError):
+            parse_datetime_many(testdatetimes)
+
+        with self.assertRaises(ValueError):
+            parse_datetime_many(testdatetimes, errors='raise')
+
+        self.assertEqual(parse_datetime_many(testdatetimes, errors='coerce'),
+                         [datetime.datetime(1981, 4, 5, 23, 21, 28), None, None, datetime.datetime(1981, 4, 5, 23, 21, 29)])
+
+        results, failures = parse_datetime_many(testdatetimes, errors='collect')
+
+        self.assertEqual(results, [datetime.datetime(1981, 4, 5, 23, 21, 28), None, None, datetime.datetime(1981, 4, 5, 23, 21, 29)])
+        self.assertEqual([failure[0] for failure in failures], [1, 2])
+        self.assertIsInstance(failures[0][1], ValueError)
+        self.assertIsInstance(failures[1][1], ValueError)
+
+        self.assertEqual(parse_date_many(['1981-04-05', '+1981-04-05'], errors='coerce'), [datetime.date(1981, 4, 5), None])
+        self.assertEqual(parse_time_many(['01:23:45', '01:23:60'], errors='coerce'), [datetime.time(1, 23, 45), None])
+        self.assertEqual(parse_duration_many(['P1D', 'P1D1Y'], errors='coerce'), [datetime.timedelta(days=1), None])
+
+        self.assertEqual(parse_date_many([], errors='collect'), ([], []))
+
+    def test_parse_many_overflow(self):
+        #Strings laid out correctly, but out of range, fail on their own
+        self.assertEqual(parse_date_many(['1981-04-05', '9999-W53', '1981-04-06'], errors='coerce'),
+                         [datetime.date(1981, 4, 5), None, datetime.date(1981, 4, 6)])
+        self.assertEqual(parse_duration_many(['P1D', 'P1000000000D'], errors='coerce'), [datetime.timedelta(days=1), None])
+
+        #The second string is parsed by the plan compiled from the first
+        results, failures = parse_datetime_many(['9999-W52-5T00:00', '9999-W52-6T00:00', '9999-W52-5T00:01'], errors='collect')
+
+        self.assertEqual(results, [datetime.datetime(9999, 12, 31, 0, 0), None, datetime.datetime(9999, 12, 31, 0, 1)])
+        self.assertEqual([failure[0] for failure in failures], [1])
+        self.assertIsInstance(failures[0][1], OverflowError)
+
+        with self.assertRaises(OverflowError):
+            parse_date_many(['9999-W53'])
+
+    def test_parse_many_notstring(self):
+        for parse_many, valid in ((parse_date_many, '1981-04-05'), (parse_time_many, '01:23:45'),
+                                  (parse_datetime_many, '1981-04-05T01:23:45'), (parse_duration_many, 'P1D')):
+            results, failures = parse_many([valid, None, 5, valid.encode('ascii')], errors='collect')
+
+            self.assertEqual(results[1:3], [None, None])
+            self.assertEqual(results[3], results[0])
+            self.assertEqual([failure[0] for failure in failures], [1, 2])
+            self.assertIsInstance(failures[0][1], TypeError)
+
+            with self.assertRaises(TypeError):
+                parse_many([valid, None])
+
+    def test_parse_many_badmode(self):
+        with self.assertRaises(ValueError):
+            parse_date_many(['1981-04-05'], errors='ignore')
+
+        with self.assertRaises(ValueError):
+            parse_datetime_many(['1981-04-05T23:21:28'], errors='ignore')
+
+class TestDatetimeParser(unittest.TestCase):
+    def test_parse(self):
+        testdatetimes = ['1981-04-05T23:21:28.512400Z', '1981-04-06T23:21:28.512400Z', '1981095T23:21:28.512400-12:34',
+                         '1981096T23:21:28.512400-12:34', '19810405T23:21:28+00', '19810405T23:21:28+00:00',
+                         '2004-W53-6T23:21:28.512400-12:34', '2004-W53-7T23:21:28.512400-12:34', '2004W536T232128',
+                         '2004-W53T01', '1981-04T01:23.4567', '1981T01.5', '19T01.5', '1981-04-05T01:23', '1981-04-05T0123',
+                         '1981-04-05T24:00:00', '1981-04-05T23:59:58.9999999']
+
+        parser = DatetimeParser()
+
+        #Twice, so the second parse of each uses the compiled plan
+        for testdatetime in testdatetimes + testdatetimes:
+            result = parser.parse(testdatetime)
+
+            self.assertEqual(result, parse_datetime(testdatetime))
+            self.assertEqual(result.tzinfo, parse_datetime(testdatetime).tzinfo)
+
+        self.assertEqual(parser.shapecount, len(testdatetimes) - 3)
+
+    def test_parse_bytes(self):
+        parser = DatetimeParser()
+
+        testdatetimes = ['1981-04-05T23:21:28.512400Z', '1981-04-06T23:21:28.512400Z', '1981095T23:21:28-12:34']
+
+        for testdatetime in testdatetimes:
+            self.assertEqual(parser.parse(testdatetime.encode('ascii')), parse_datetime(testdatetime))
+            self.assertEqual(parser.parse(memoryview(testdatetime.encode('ascii'))), parse_datetime(testdatetime))
+
+        self.assertEqual(parse_time_many([b'01:23:45Z', bytearray(b'01:23:46Z')]), [parse_time('01:23:45Z'), parse_time('01:23:46Z')])
+
+    def test_parse_sameshape(self):
+        #Values are still checked when a plan is used
+        parser = DatetimeParser()
+        parser.warm(['1981-04-05T01:23:45+01:00'])
+
+        with self.assertRaises(ValueError):
+            parser.parse('1981-13-05T01:23:45+01:00')
+
+        with self.assertRaises(ValueError):
+            parser.parse('1981-04-05T01:23:60+01:00')
+
+        with self.assertRaises(ValueError):
+            parser.parse('1981-04-05T01:61:45+01:00')
+
+        with self.assertRaises(ValueError):
+            parser.parse('1981-04-05T25:23:45+01:00')
+
+        self.assertEqual(parser.parse('1981-04-05T24:00:00+01:00'), parse_datetime('1981-04-05T24:00:00+01:00'))
+
+        parser.warm(['2004-W53T01:23:45-01:00'])
+
+        with self.assertRaises(ValueError):
+            parser.parse('2004-W00T01:23:45-01:00')
+
+        with self.assertRaises(ValueError):
+            parser.parse('2004-W53T01:23:45-00:00')
+
+    def test_parse_invalid(self):
+        parser = DatetimeParser()
+
+        with self.assertRaises(ValueError):
+            parser.parse('1981-04-05T01:23:4x')
+
+        with self.assertRaises(ValueError):
+            parser.parse('1981-04-05')
+
+        with self.assertRaises(ValueError):
+            parser.warm(['1981-04-05T01:23:45', 'garbage'])
+
+        #Invalid strings don't compile plans
+        self.assertEqual(parser.shapecount, 1)
+
+    def test_delimiter(self):
+        parser = DatetimeParser(delimiter=' ')
+
+        self.assertEqual(parser.delimiter, ' ')
+        self.assertEqual(parser.parse('2004-W53-6 23:21:28.512400-12:34'), parse_datetime('2004-W53-6 23:21:28.512400-12:34', delimiter=' '))
+        self.assertEqual(parser.parse('2004-W53-6 23:21:28.512400-12:34'), parse_datetime('2004-W53-6 23:21:28.512400-12:34', delimiter=' '))
+
+        #A delimiter containing digits can't be told apart from the date and
+        #time by shape, so strings are always parsed in full
+        parser = DatetimeParser(delimiter='9')
+
+        self.assertEqual(parser.parse('2004-W53-6923:21:28'), parse_datetime('2004-W53-6923:21:28', delimiter='9'))
+        self.assertEqual(parser.shapecount, 0)
+
+    def test_maxshapes(self):
+        parser = DatetimeParser(maxshapes=1)
+
+        self.assertEqual(parser.maxshapes, 1)
+
+        parser.warm(['1981-04-05T01:23:45', '1981-04-05T01:23', '1981-04-05T01'])
+
+        self.assertEqual(parser.shapecount, 1)
+        self.assertEqual(parser.parse('1981-04-05T01:23'), datetime.datetime(1981, 4, 5, 1, 23))
+
+    def test_parse_many(self):
+        parser = DatetimeParser()
+
+        self.assertEqual(parser.parse_many(['1981-04-05T01:23:45', '1981-04-05T01:23:60'], errors='coerce'),
+                         [datetime.datetime(1981, 4, 5, 1, 23, 45), None])
+
+    def test_threads(self):
+        #A parser can be shared between threads
+        parser = DatetimeParser()
+        testdatetimes = ['1981-04-%02dT01:23:%02d.%06d+01:00' % (day, second, second) for day in range(1, 29) for second in range(60)]
+        expectedresults = [parse_datetime(testdatetime) for testdatetime in testdatetimes]
+
+        results = []
+
+        def parseall():
+            results.append(parser.parse_many(testdatetimes))
+
+        threads = [threading.Thread(target=parseall) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [expectedresults] * 4)
@@ -7,8 +7,10 @@
 # of the BSD license.  See the LICENSE file for details.
 
 import unittest
+import datetime
 
-from aniso8601.date import parse_date, _parse_year, _parse_calendar_day, _parse_calendar_month, _parse_week_day, _parse_week, _parse_ordinal_date, get_date_resolution
+from aniso8601 import compat
+from aniso8601.date import parse_date, classify_date, _parse_year, _parse_calendar_day, _parse_calendar_month, _parse_week_day, _parse_week, _parse_ordinal_date, get_date_resolution
 from aniso8601.resolution import DateResolution
 
 class TestDateResolutionFunctions(unittest.TestCase):
@@ -33,6 +35,42 @@ class TestDateResolutionFunctions(unittest.TestCase):
         self.assertEqual(get_date_resolution('1981-095'), DateResolution.Ordinal)
         self.assertEqual(get_date_resolution('1981095'), DateResolution.Ordinal)
 
+    def test_get_date_resolution_invalid(self):
+        with self.assertRaises(ValueError):
+            get_date_resolution('1981-04-05-')
+
+        with self.assertRaises(ValueError):
+            get_date_resolution('1981-4-5')
+
+        with self.assertRaises(ValueError):
+            get_date_resolution('2004-W5')
+
+        with self.assertRaises(ValueError):
+            get_date_resolution('198104')
+
+        with self.assertRaises(ValueError):
+            get_date_resolution('19a1')
+
+        with self.assertRaises(NotImplementedError):
+            get_date_resolution('+1981-04-05')
+
+    def test_classify_date(self):
+        self.assertEqual(classify_date('2013'), (DateResolution.Year, (2013,)))
+        self.assertEqual(classify_date('19'), (DateResolution.Year, (1900,)))
+        self.assertEqual(classify_date('1981-04'), (DateResolution.Month, (1981, 4)))
+        self.assertEqual(classify_date('2004-W53'), (DateResolution.Week, (2004, 53)))
+        self.assertEqual(classify_date('2004W53'), (DateResolution.Week, (2004, 53)))
+        self.assertEqual(classify_date('2004-W53-6'), (DateResolution.Weekday, (2004, 53, 6)))
+        self.assertEqual(classify_date('2004W536'), (DateResolution.Weekday, (2004, 53, 6)))
+        self.assertEqual(classify_date('1981-04-05'), (DateResolution.Day, (1981, 4, 5)))
+        self.assertEqual(classify_date('19810405'), (DateResolution.Day, (1981, 4, 5)))
+        self.assertEqual(classify_date('1981-095'), (DateResolution.Ordinal, (1981, 95)))
+        self.assertEqual(classify_date('1981095'), (DateResolution.Ordinal, (1981, 95)))
+
+        #Values are not range checked until the date is built
+        self.assertEqual(classify_date('2004-W00'), (DateResolution.Week, (2004, 0)))
+        self.assertEqual(classify_date('1981-13-05'), (DateResolution.Day, (1981, 13, 5)))
+
 class TestDateParserFunctions(unittest.TestCase):
     def test_parse_date(self):
         date = parse_date('2013')
@@ -100,6 +138,19 @@ class TestDateParserFunctions(unittest.TestCase):
         self.assertEqual(date.month, 4)
         self.assertEqual(date.day, 5)
 
+    def test_parse_date_bytes(self):
+        for testdate in ['2013', '19', '1981-04-05', '19810405', '1981-04', '2004-W53', '2004W536', '1981-095', '1981095']:
+            for testbytes in (testdate.encode('ascii'), bytearray(testdate.encode('ascii')), memoryview(testdate.encode('ascii'))):
+                self.assertEqual(parse_date(testbytes), parse_date(testdate))
+
+        self.assertEqual(classify_date(b'2004-W53-6'), classify_date('2004-W53-6'))
+
+        with self.assertRaises(ValueError):
+            parse_date(b'1981-04-31')
+
+        with self.assertRaises(ValueError):
+            parse_date(b'1981-04-0\xff')
+
     def test_parse_year(self):
         date = _parse_year('2013')
         self.assertEqual(date.year, 2013)
@@ -116,6 +167,14 @@ class TestDateParserFunctions(unittest.TestCase):
         self.assertEqual(date.month, 1)
         self.assertEqual(date.day, 1)
 
+    def test_parse_date_weeknumberzero(self):
+        #0 isn't a valid week number
+        with self.assertRaises(ValueError):
+            parse_date('2004-W00')
+
+        with self.assertRaises(ValueError):
+            parse_date('2004W001')
+
     def test_parse_year_nonzero(self):
         #0 isn't a valid year
         with self.assertRaises(ValueError):
@@ -132,6 +191,28 @@ class TestDateParserFunctions(unittest.TestCase):
         self.assertEqual(date.month, 4)
         self.assertEqual(date.day, 5)
 
+    def test_parse_calendar_day_invalid(self):
+        with self.assertRaises(ValueError):
+            _parse_calendar_day('1981-13-05')
+
+        with self.assertRaises(ValueError):
+            _parse_calendar_day('1981-02-29')
+
+        with self.assertRaises(ValueError):
+            _parse_calendar_day('0000-04-05')
+
+        with self.assertRaises(ValueError):
+            _parse_calendar_day('1981/04/05')
+
+        with self.assertRaises(ValueError):
+            _parse_calendar_day('1981-04- 5')
+
+        with self.assertRaises(ValueError):
+            _parse_calendar_day('1981040+')
+
+        with self.assertRaises(ValueError):
+            _parse_calendar_day('1_810405')
+
     def test_parse_calendar_month(self):
         date = _parse_calendar_month('1981-04')
         self.assertEqual(date.year, 1981)
@@ -143,6 +224,16 @@ class TestDateParserFunctions(unittest.TestCase):
         with self.assertRaises(ValueError):
             _parse_calendar_month('198104')
 
+    def test_parse_calendar_month_invalid(self):
+        with self.assertRaises(ValueError):
+            _parse_calendar_month('1981-13')
+
+        with self.assertRaises(ValueError):
+            _parse_calendar_month('1981-00')
+
+        with self.assertRaises(ValueError):
+            _parse_calendar_month('1981-+4')
+
     def test_parse_week_day(self):
         date = _parse_week_day('2004-W53-6')
         self.assertEqual(date.year, 2005)
@@ -225,6 +316,32 @@ class TestDateParserFunctions(unittest.TestCase):
         self.assertEqual(date.month, 1)
         self.assertEqual(date.weekday(), 0)
 
+    def test_parse_week_isocalendar(self):
+        #Week dates must agree with Python's ISO calendar, every year is
+        #parsed twice, so the memoized start of the year is used
+        for year in compat.range(1, 10000, 7):
+            for isostr in ('{0:04d}-W01-1', '{0:04d}-W26-4', '{0:04d}W017'):
+                date = _parse_week_day(isostr.format(year))
+                self.assertEqual(date.isocalendar()[0], year)
+
+            date = _parse_week('{0:04d}-W02'.format(year))
+            self.assertEqual(date.isocalendar()[:2], (year, 2))
+            self.assertEqual(date.weekday(), 0)
+
+        self.assertEqual(_parse_week_day('0001-W01-1'), datetime.date(1, 1, 1))
+        self.assertEqual(_parse_week_day('9999-W52-5'), datetime.date(9999, 12, 31))
+
+    def test_parse_week_range(self):
+        #Week dates outside of the range of Python dates
+        with self.assertRaises(OverflowError):
+            _parse_week_day('9999-W52-6')
+
+        with self.assertRaises(OverflowError):
+            _parse_week('9999-W53')
+
+        with self.assertRaises(ValueError):
+            _parse_week('0000-W01')
+
     def test_parse_ordinal_date(self):
         date = _parse_ordinal_date('1981-095')
         self.assertEqual(date.year, 1981)
@@ -235,3 +352,27 @@ class TestDateParserFunctions(unittest.TestCase):
         self.assertEqual(date.year, 1981)
         self.assertEqual(date.month, 4)
         self.assertEqual(date.day, 5)
+
+        date = _parse_ordinal_date('1980-366')
+        self.assertEqual(date.year, 1980)
+        self.assertEqual(date.month, 12)
+        self.assertEqual(date.day, 31)
+
+        #Day 366 of a non-leap year rolls over, matching Python's definition
+        date = _parse_ordinal_date('1981-366')
+        self.assertEqual(date.year, 1982)
+        self.assertEqual(date.month, 1)
+        self.assertEqual(date.day, 1)
+
+    def test_parse_ordinal_date_invalid(self):
+        with self.assertRaises(ValueError):
+            _parse_ordinal_date('1981-000')
+
+        with self.assertRaises(ValueError):
+            _parse_ordinal_date('1981-367')
+
+        with self.assertRaises(ValueError):
+            _parse_ordinal_date('1981- 95')
+
+        with self.assertRaises(ValueError):
+            _parse_ordinal_date('0000095')
@@ -8,7 +8,7 @@
 
 import unittest
 
-from aniso8601.duration import parse_duration, _parse_duration_prescribed, _parse_duration_combined, _parse_duration_element, _has_any_component, _component_order_correct
+from aniso8601.duration import parse_duration, _parse_duration_prescribed, _parse_duration_combined, _has_any_component
 
 class TestDurationParserFunctions(unittest.TestCase):
     def test_parse_duration(self):
@@ -102,6 +102,14 @@ class TestDurationParserFunctions(unittest.TestCase):
         #Verify overflows
         self.assertEqual(parse_duration('PT36H'), parse_duration('P1DT12H'))
 
+    def test_parse_duration_bytes(self):
+        for testduration in ['P1Y2M3DT4H54M6S', 'P1Y2M3DT4H54M6,5S', 'PT36H', 'P1W', 'P0003-06-04T12:30:05']:
+            for testbytes in (testduration.encode('ascii'), bytearray(testduration.encode('ascii')), memoryview(testduration.encode('ascii'))):
+                self.assertEqual(parse_duration(testbytes), parse_duration(testduration))
+
+        with self.assertRaises(ValueError):
+            parse_duration(b'1Y2M3DT4H54M6S')
+
     def test_parse_duration_nop(self):
         with self.assertRaises(ValueError):
             #Duration must start with a P
@@ -153,6 +161,22 @@ class TestDurationParserFunctions(unittest.TestCase):
         with self.assertRaises(ValueError):
             parse_duration('P0003-06-04T12:30:05.5asdfasdf')
 
+    def test_parse_duration_messages(self):
+        for testduration, message in (('P1Y2X', 'ISO 8601 duration must end with a valid character.'),
+                                      ('P1.5Y2.5M', 'ISO 8601 allows only lowest order element to have a decimal fraction.'),
+                                      ('P1.5Y2M', 'ISO 8601 duration must end with a single valid character.'),
+                                      ('P1Y2W', 'ISO 8601 week designators may not be combined with other time designators.'),
+                                      ('P1H', 'ISO 8601 time components not allowed in duration without prescribed time.'),
+                                      ('P1D1Y', 'ISO 8601 duration components must be in the correct order.'),
+                                      ('P1HT1M', 'ISO 8601 time components not allowed in date portion of duration.'),
+                                      ('P1D1YT1H', 'ISO 8601 duration components must be in the correct order.'),
+                                      ('PT1H1D', 'ISO 8601 date components not allowed in time portion of duration.'),
+                                      ('PT1S1H', 'ISO 8601 time components in duration must be in the correct order.')):
+            with self.assertRaises(ValueError) as e:
+                parse_duration(testduration)
+
+            self.assertEqual(str(e.exception), message)
+
     def test_parse_duration_prescribed(self):
         resultduration = _parse_duration_prescribed('P1Y2M3DT4H54M6S', False)
         self.assertEqual(resultduration.days, 428)
@@ -239,11 +263,20 @@ class TestDurationParserFunctions(unittest.TestCase):
             #Multiple fractions are not allowed
             _parse_duration_prescribed('P1Y2M3DT4H5.1234M6.1234S', False)
 
+        with self.assertRaises(ValueError):
+            _parse_duration_prescribed('P1Y2M3DT4H5,1234M6.1234S', False)
+
     def test_parse_duration_prescribed_middlefraction(self):
         with self.assertRaises(ValueError):
             #Fraction only allowed on final component
             _parse_duration_prescribed('P1Y2M3DT4H5.1234M6S', False)
 
+        with self.assertRaises(ValueError):
+            _parse_duration_prescribed('P1Y2M3DT4H5,1234M6S', False)
+
+        with self.assertRaises(ValueError):
+            _parse_duration_prescribed('P1,5Y2M', False)
+
     def test_parse_duration_prescribed_outoforder(self):
         #Ensure durations are required to be in the correct order
         #https://bitbucket.org/nielsenb/aniso8601/issues/7/durations-with-time-components-before-t
@@ -298,27 +331,10 @@ class TestDurationParserFunctions(unittest.TestCase):
         with self.assertRaises(ValueError):
             parse_duration('P0003-06-04T12:30:05.5asdfasdf')
 
-    def test_parse_duration_element(self):
-        self.assertEqual(_parse_duration_element('P1Y2M3D', 'Y'), 1)
-        self.assertEqual(_parse_duration_element('P1Y2M3D', 'M'), 2)
-        self.assertEqual(_parse_duration_element('P1Y2M3D', 'D'), 3)
-        self.assertEqual(_parse_duration_element('T4H5M6.1234S', 'H'), 4)
-        self.assertEqual(_parse_duration_element('T4H5M6.1234S', 'M'), 5)
-        self.assertEqual(_parse_duration_element('T4H5M6.1234S', 'S'), 6.1234)
-        self.assertEqual(_parse_duration_element('PT4H54M6,5S', 'H'), 4)
-        self.assertEqual(_parse_duration_element('PT4H54M6,5S', 'M'), 54)
-        self.assertEqual(_parse_duration_element('PT4H54M6,5S', 'S'), 6.5)
-
     def test_has_any_component(self):
         self.assertTrue(_has_any_component('P1Y', ['Y', 'M']))
         self.assertFalse(_has_any_component('P1Y', ['M', 'D']))
 
-    def test_component_order_correct(self):
-        self.assertTrue(_component_order_correct('P1Y1M1D', ['P', 'Y', 'M', 'D']))
-        self.assertTrue(_component_order_correct('P1Y1M', ['P', 'Y', 'M', 'D']))
-        self.assertFalse(_component_order_correct('P1D1Y1M', ['P', 'Y', 'M', 'D']))
-        self.assertFalse(_component_order_correct('PT1S1H', ['T', 'H', 'M', 'S']))
-
 class TestRelativeDurationParserFunctions(unittest.TestCase):
     def test_parse_duration_relative(self):
         resultduration = parse_duration('P1Y2M3DT4H54M6.5S', relative=True)
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+import unittest
+import datetime
+
+from aniso8601.index import IntervalIndex, SortedColumn
+from aniso8601.interval import parse_interval
+from aniso8601.time import parse_datetime
+
+class TestIntervalIndex(unittest.TestCase):
+    def test_containing(self):
+        index = IntervalIndex(['1981-04-05/1981-04-08', '1981-04-06T12:00:00/PT36H', 'P1D/1981-04-10',
+                               '1981-04-07T00:00:00/1981-04-07T00:00:00'])
+
+        self.assertEqual(len(index), 4)
+
+        self.assertEqual(index.containing(datetime.date(1981, 4, 4)), [])
+        self.assertEqual(index.containing(datetime.date(1981, 4, 5)), [0])
+        self.assertEqual(sorted(index.containing(datetime.date(1981, 4, 7))), [0, 1])
+        self.assertEqual(sorted(index.containing(datetime.datetime(1981, 4, 7, 23, 59, 59, 999999))), [0, 1])
+        self.assertEqual(index.containing(datetime.datetime(1981, 4, 8)), [])
+        self.assertEqual(index.containing(datetime.date(1981, 4, 9)), [2])
+        self.assertEqual(index.containing(datetime.date(1981, 4, 10)), [])
+
+    def test_overlapping(self):
+        index = IntervalIndex(['1981-04-05/1981-04-08', '1981-04-06T12:00:00/PT36H', 'P1D/1981-04-10',
+                               '1981-04-07T00:00:00/1981-04-07T00:00:00'])
+
+        self.assertEqual(index.overlapping(datetime.date(1981, 4, 8), datetime.date(1981, 4, 10)), [2])
+        self.assertEqual(sorted(index.overlapping(datetime.date(1981, 4, 1), datetime.date(1981, 4, 6))), [0])
+        self.assertEqual(sorted(index.overlapping(datetime.date(1981, 4, 7), datetime.date(1981, 4, 10))), [0, 1, 2])
+        self.assertEqual(sorted(index.overlapping(datetime.date(1981, 4, 10), datetime.date(1981, 4, 7))), [0, 1, 2])
+        self.assertEqual(index.overlapping(datetime.date(1981, 4, 6), datetime.date(1981, 4, 6)), [])
+        self.assertEqual(index.overlapping(datetime.date(1981, 4, 10), datetime.date(1981, 4, 12)), [])
+
+    def test_bruteforce(self):
+        #The queries match a scan of every interval
+        isointervalstrs = []
+
+        for day in range(1, 29):
+            isointervalstrs.append('1981-04-{0:02d}/P{1}D'.format(day, day % 5))
+            isointervalstrs.append('PT{0}H/1981-04-{1:02d}T{2:02d}:30:00'.format(day * 3, day, day % 24))
+            isointervalstrs.append('1981-04-{0:02d}T12:00:00/1981-04-{1:02d}'.format(day, 29 - day))
+
+        index = IntervalIndex(isointervalstrs)
+        intervals = [sorted(parse_interval(isointervalstr), key=_comparable) for isointervalstr in isointervalstrs]
+
+        points = [datetime.datetime(1981, 3, 25) + datetime.timedelta(hours=hours) for hours in range(0, 40 * 24, 7)]
+
+        for point in points:
+            expected = [position for position, (start, end) in enumerate(intervals) if _comparable(start) <= point < _comparable(end)]
+
+            self.assertEqual(sorted(index.containing(point)), expected)
+
+            for hours in (1, 30, 200):
+                spanend = point + datetime.timedelta(hours=hours)
+
+                expected = [position for position, (start, end) in enumerate(intervals)
+                            if _comparable(start) < _comparable(end) and _comparable(start) < spanend and _comparable(end) > point]
+
+                self.assertEqual(sorted(index.overlapping(point, spanend)), expected)
+
+    def test_utcoffset(self):
+        index = IntervalIndex(['1981-04-05T01:00:00+01:00/PT1H', '1981-04-05T00:30:00Z/1981-04-05T01:30:00Z'])
+
+        self.assertEqual(sorted(index.containing(parse_datetime('1981-04-05T00:45:00Z'))), [0, 1])
+        self.assertEqual(index.containing(parse_datetime('1981-04-05T02:15:00+01:00')), [1])
+        self.assertEqual(index.overlapping(parse_datetime('1981-04-04T19:00:00-05:00'), parse_datetime('1981-04-04T19:30:00-05:00')), [0])
+
+        with self.assertRaises(TypeError):
+            index.containing(datetime.datetime(1981, 4, 5, 1))
+
+        with self.assertRaises(TypeError):
+            index.containing(datetime.date(1981, 4, 5))
+
+        with self.assertRaises(TypeError):
+            IntervalIndex(['1981-04-05/P1D', '1981-04-05T01:00:00Z/PT1H'])
+
+        with self.assertRaises(TypeError):
+            IntervalIndex(['1981-04-05/P1D']).containing('1981-04-05')
+
+    def test_arguments(self):
+        index = IntervalIndex([b'1981-01-31 00:00:00--P1M'], intervaldelimiter=b'--', datetimedelimiter=b' ', relative=True)
+
+        self.assertEqual(index.containing(datetime.date(1981, 2, 27)), [0])
+        self.assertEqual(index.containing(datetime.date(1981, 2, 28)), [])
+
+        self.assertEqual(len(IntervalIndex([])), 0)
+        self.assertEqual(IntervalIndex([]).containing(datetime.date(1981, 4, 5)), [])
+
+        with self.assertRaises(ValueError):
+            IntervalIndex(['1981-04-05/P1D', '1981-04-05'])
+
+def _comparable(value):
+    if isinstance(value, datetime.datetime) is True:
+        return value
+
+    return datetime.datetime.combine(value, datetime.time())
+
+class TestSortedColumn(unittest.TestCase):
+    def test_bisect(self):
+        column = SortedColumn(['1977-06-10T12:00:00Z', '1977-06-10T12:00:05Z', '1977-06-10T12:00:05Z', '1977-06-10T12:01:00Z'])
+
+        self.assertEqual(len(column), 4)
+
+        self.assertEqual(column.bisect_left(parse_datetime('1977-06-10T11:00:00Z')), 0)
+        self.assertEqual(column.bisect_left(parse_datetime('1977-06-10T12:00:05Z')), 1)
+        self.assertEqual(column.bisect_right(parse_datetime('1977-06-10T12:00:05Z')), 3)
+        self.assertEqual(column.bisect_left(parse_datetime('1977-06-10T12:00:05.000001Z')), 3)
+        self.assertEqual(column.bisect_right(parse_datetime('1977-06-10T12:00:04.999999Z')), 1)
+        self.assertEqual(column.bisect_left(parse_datetime('1977-06-10T13:01:00+01:00')), 3)
+        self.assertEqual(column.bisect_right(parse_datetime('1977-06-10T13:01:00+01:00')), 4)
+
+        self.assertEqual(column.between(parse_datetime('1977-06-10T12:00:01Z'), parse_datetime('1977-06-10T12:01:00Z')), slice(1, 3))
+        self.assertEqual(column.between(parse_datetime('1977-06-10T12:01:00Z'), parse_datetime('1977-06-10T12:00:01Z')), slice(3, 3))
+
+        self.assertEqual(column[1], parse_datetime('1977-06-10T12:00:05Z'))
+        self.assertEqual(column[-1:], [parse_datetime('1977-06-10T12:01:00Z')])
+
+    def test_layouts(self):
+        #The column is bisected as the parsed values would be
+        layouts = [['1981-04-05', '1981-04-06', '1981-05-01'],
+                   ['19810405', '19810406', '19810501'],
+                   ['1981-095', '1981-096', '1981-121'],
+                   ['2004-W53-6', '2004-W53-7', '2005-W01-1'],
+                   ['1981-04', '1981-05', '1982-01'],
+                   ['1981', '1982', '1990'],
+                   ['197', '198', '199'],
+                   ['19', '20'],
+                   ['1', '2', '9'],
+                   ['1981-04-05T01', '1981-04-05T02', '1981-04-06T00'],
+                   ['19810405T0100-0530', '19810405T0101-0530', '19810405T0200-0530'],
+                   ['1981-095 01:01:01.5', '1981-095 01:01:01.6', '1981-095 01:01:02.0'],
+                   ['2004-W53-6T23:59:59.999999', '2004-W53-7T00:00:00.000000', '2004-W53-7T00:00:00.000001']]
+
+        for isostrs in layouts:
+            delimiter = ' ' if isostrs[0].find(' ') != -1 else 'T'
+            column = SortedColumn(isostrs, delimiter=delimiter)
+            values = [_comparable(value) for value in column[:]]
+            tzinfo = values[0].tzinfo
+
+            for value in values:
+                for delta in (datetime.timedelta(0), datetime.timedelta(microseconds=1), datetime.timedelta(minutes=30),
+                              datetime.timedelta(days=2)):
+                    for query in (value - delta, value + delta):
+                        expected = (sum(1 for other in values if other < query), sum(1 for other in values if other <= query))
+
+                        self.assertEqual((column.bisect_left(query), column.bisect_right(query)), expected, (isostrs, query))
+
+            if tzinfo is None:
+                self.assertEqual(column.bisect_left(values[1].date()), sum(1 for other in values if other.date() < values[1].date()))
+
+    def test_truncated_years(self):
+        column = SortedColumn(['197', '198', '199'])
+
+        self.assertEqual(column.bisect_left(datetime.date(1980, 1, 1)), 1)
+        self.assertEqual(column.bisect_right(datetime.date(1980, 1, 1)), 2)
+        self.assertEqual(column.between(datetime.date(1980, 1, 1), datetime.date(1990, 1, 1)), slice(1, 2))
+
+        column = SortedColumn(['1', '2', '9'])
+
+        self.assertEqual(column.bisect_left(datetime.date(2000, 1, 1)), 1)
+        self.assertEqual(column.between(datetime.date(1500, 1, 1), datetime.date(9000, 1, 1)), slice(1, 2))
+
+        #Values before the first century, decade or millennium are before
+        #every string
+        self.assertEqual(SortedColumn(['01', '19']).bisect_right(datetime.date(99, 12, 31)), 0)
+        self.assertEqual(SortedColumn(['001', '197']).bisect_right(datetime.date(9, 12, 31)), 0)
+        self.assertEqual(SortedColumn(['1', '2']).between(datetime.date(1, 1, 1), datetime.date(999, 12, 31)), slice(0, 0))
+
+    def test_not_sortable(self):
+        with self.assertRaises(ValueError):
+            SortedColumn(['1981-04-05', '1981-04-06T00:00:00'])
+
+        with self.assertRaises(ValueError):
+            SortedColumn(['1981-04-05T01:00:00+01:00', '1981-04-05T01:00:00+02:00'])
+
+        with self.assertRaises(ValueError):
+            SortedColumn(['1981-04-06', '1981-04-05'])
+
+        with self.assertRaises(ValueError):
+            SortedColumn(['1981-04-05T23:00:00', '1981-04-05T24:00:00'])
+
+        with self.assertRaises(ValueError):
+            SortedColumn(['1981-04-05T01.5', '1981-04-05T02.5'])
+
+        with self.assertRaises(ValueError):
+            SortedColumn(['1981-04-05T01:00:00.1234567'])
+
+        with self.assertRaises(ValueError):
+            SortedColumn(['1981-W14T01:00:00'])
+
+        with self.assertRaises(ValueError):
+            SortedColumn(['1981-04-05', '1981-04-31'])
+
+    def test_utcoffset(self):
+        column = SortedColumn(['1981-04-05T01:00:00Z'])
+
+        with self.assertRaises(TypeError):
+            column.bisect_left(datetime.datetime(1981, 4, 5))
+
+        with self.assertRaises(TypeError):
+            SortedColumn(['1981-04-05T01:00:00']).bisect_left(parse_datetime('1981-04-05T01:00:00Z'))
+
+        with self.assertRaises(TypeError):
+            column.bisect_left('1981-04-05T01:00:00Z')
+
+    def test_bytes(self):
+        column = SortedColumn([b'1981-04-05 01:00', bytearray(b'1981-04-05 02:00')], delimiter=b' ')
+
+        self.assertEqual(column.isostrs, ['1981-04-05 01:00', '1981-04-05 02:00'])
+        self.assertEqual(column.bisect_left(datetime.datetime(1981, 4, 5, 1, 30)), 1)
+
+        self.assertEqual(len(SortedColumn([])), 0)
+        self.assertEqual(SortedColumn([]).between(datetime.date(1981, 4, 5), datetime.date(1981, 4, 6)), slice(0, 0))
@@ -8,6 +8,9 @@
 
 import unittest
 import datetime
+import os
+import subprocess
+import sys
 import aniso8601
 
 class TestInitFunctions(unittest.TestCase):
@@ -48,3 +51,52 @@ class TestInitFunctions(unittest.TestCase):
         self.assertEqual(results[0], datetime.date(year=1981, month=4, day=5))
         self.assertEqual(results[1], datetime.date(year=1981, month=4, day=6))
         self.assertEqual(results[2], datetime.date(year=1981, month=4, day=7))
+
+    @unittest.skipIf(sys.version_info < (3, 7), '-X importtime requires Python 3.7 or later.')
+    def test_import_lazy_dateutil(self):
+        #dateutil is only imported once a relative duration is parsed,
+        #-X importtime lists every module imported, and how long each took
+        sourcedir = os.path.dirname(os.path.dirname(os.path.abspath(aniso8601.__file__)))
+
+        importtime = subprocess.check_output([sys.executable, '-X', 'importtime', '-c', 'import aniso8601'], stderr=subprocess.STDOUT, cwd=sourcedir).decode('utf-8')
+
+        importedmodules = [line.split('|')[-1].strip() for line in importtime.splitlines() if line.startswith('import time:')]
+
+        self.assertIn('aniso8601', importedmodules)
+        self.assertNotIn('dateutil', importedmodules)
+        self.assertNotIn('dateutil.relativedelta', importedmodules)
+
+        script = ('import sys, aniso8601\n'
+                  'aniso8601.parse_duration("P1M")\n'
+                  'print("dateutil" in sys.modules)\n'
+                  'aniso8601.parse_duration("P1M", relative=True)\n'
+                  'print("dateutil" in sys.modules)')
+
+        self.assertEqual(subprocess.check_output([sys.executable, '-c', script], cwd=sourcedir).decode('utf-8').split(), ['False', 'True'])
+
+    def test_import_budget(self):
+        #Importing aniso8601 only imports what parsing needs, the modules
+        #imported by the interpreter itself aren't counted
+        sourcedir = os.path.dirname(os.path.dirname(os.path.abspath(aniso8601.__file__)))
+
+        script = ('import sys\n'
+                  'before = set(sys.modules)\n'
+                  'import aniso8601\n'
+                  'print(" ".join(sorted(set(sys.modules) - before)))')
+
+        importedmodules = subprocess.check_output([sys.executable, '-c', script], cwd=sourcedir).decode('utf-8').split()
+
+        self.assertIn('aniso8601', importedmodules)
+
+        for modulename in ('calendar', 'locale', 're', 'dateutil', 'aniso8601.validate', 'aniso8601.tryparse'):
+            self.assertNotIn(modulename, importedmodules)
+
+        #The 12 aniso8601 modules, and a few from the standard library,
+        #about 22 on Python 3.11
+        self.assertLessEqual(len(importedmodules), 30)
+
+        script = ('import sys, aniso8601\n'
+                  'aniso8601.validate_date("1981-04-05")\n'
+                  'print("aniso8601.validate" in sys.modules)')
+
+        self.assertEqual(subprocess.check_output([sys.executable, '-c', script], cwd=sourcedir).decode('utf-8').split(), ['True'])
@@ -11,7 +11,8 @@ import datetime
 import dateutil.relativedelta
 
 from aniso8601 import compat
-from aniso8601.interval import parse_interval, parse_repeating_interval, _parse_interval_parts
+from aniso8601.interval import parse_interval, parse_repeating_interval, Interval, RepeatingInterval, _parse_interval_parts
+from aniso8601.time import parse_datetime
 
 class TestIntervalParserFunctions(unittest.TestCase):
     def test_parse_interval(self):
@@ -75,6 +76,14 @@ class TestIntervalParserFunctions(unittest.TestCase):
         self.assertEqual(resultinterval[0], datetime.datetime(year=1980, month=3, day=5, hour=1, minute=1))
         self.assertEqual(resultinterval[1], datetime.datetime(year=1981, month=4, day=5, hour=1, minute=1))
 
+    def test_parse_interval_bytes(self):
+        for testinterval in ['2007-03-01T13:00:00/2008-05-11T15:30:00', 'P1M/1981-04-05', '1981-04-05/P1D']:
+            for testbytes in (testinterval.encode('ascii'), bytearray(testinterval.encode('ascii')), memoryview(testinterval.encode('ascii'))):
+                self.assertEqual(parse_interval(testbytes), parse_interval(testinterval))
+
+        self.assertEqual(parse_interval(b'2007-03-01 13:00:00--2008-05-11 15:30:00', intervaldelimiter=b'--', datetimedelimiter=b' '),
+                         parse_interval('2007-03-01 13:00:00--2008-05-11 15:30:00', intervaldelimiter='--', datetimedelimiter=' '))
+
     def test_parse_interval_suffixgarbage(self):
         #Don't allow garbage after the duration
         #https://bitbucket.org/nielsenb/aniso8601/issues/9/durations-with-trailing-garbage-are-parsed
@@ -201,6 +210,76 @@ class TestRelativeIntervalParserFunctions(unittest.TestCase):
         with self.assertRaises(ValueError):
             parse_interval('P0003-06-04T12:30:05.5asdfasdf/2001', relative=True)
 
+class TestInterval(unittest.TestCase):
+    def test_interval(self):
+        for testtuple in ['1981-04-05T01:01:00/1981-04-05T01:02:00', '1981-04-05/1981-04-06T12:00:00', '1981-04-05T01:01:00/1981-04-06',
+                          '1981-04-05/PT1H', '1981-04-05T01:01:00Z/P1M1DT1M', 'P1M/1981-04-05', 'PT1H/1981-04-05', 'P1Y/2001-02-28']:
+            resultinterval = Interval(testtuple)
+            expected = parse_interval(testtuple)
+
+            #Unpacks as parse_interval's tuple does
+            start, end = resultinterval
+
+            self.assertEqual((start, end), expected, testtuple)
+            self.assertEqual(resultinterval, expected, testtuple)
+            self.assertEqual(expected, resultinterval, testtuple)
+            self.assertEqual(resultinterval[1], expected[1], testtuple)
+            self.assertEqual(len(resultinterval), 2)
+            self.assertEqual(hash(resultinterval), hash(expected))
+            self.assertEqual(list(resultinterval), list(expected))
+
+            self.assertEqual(Interval(testtuple, relative=True), parse_interval(testtuple, relative=True), testtuple)
+
+    def test_interval_parts(self):
+        resultinterval = Interval('P1M/1981-04-05T01:01:00')
+        self.assertEqual(resultinterval.start, datetime.datetime(year=1981, month=3, day=6, hour=1, minute=1))
+        self.assertEqual(resultinterval.end, datetime.datetime(year=1981, month=4, day=5, hour=1, minute=1))
+        self.assertEqual(resultinterval.duration, datetime.timedelta(days=30))
+
+        resultinterval = Interval('1981-04-05/PT1H', relative=True)
+        self.assertEqual(resultinterval.start, datetime.date(year=1981, month=4, day=5))
+        self.assertEqual(resultinterval.end, datetime.datetime(year=1981, month=4, day=5, hour=1))
+        self.assertEqual(resultinterval.duration, dateutil.relativedelta.relativedelta(hours=1))
+
+        resultinterval = Interval('1981-04-05T12:00:00/1981-04-07')
+        self.assertEqual(resultinterval.duration, datetime.timedelta(days=1, hours=12))
+
+        resultinterval = Interval(b'1981-04-05--1981-04-06', intervaldelimiter=b'--')
+        self.assertEqual(resultinterval.duration, datetime.timedelta(days=1))
+        self.assertEqual(resultinterval, parse_interval('1981-04-05/1981-04-06'))
+
+    def test_interval_lazy(self):
+        #Only the parts used are parsed, each once
+        resultinterval = parse_interval('1981-04-05/1981-13-05', lazy=True)
+
+        self.assertIsInstance(resultinterval, Interval)
+        self.assertEqual(resultinterval.start, datetime.date(year=1981, month=4, day=5))
+        self.assertIs(resultinterval.start, resultinterval.start)
+
+        with self.assertRaises(ValueError):
+            resultinterval.end
+
+        with self.assertRaises(ValueError):
+            tuple(resultinterval)
+
+        resultinterval = Interval('1981-04-05T01:01:00Z/P1D1Y')
+
+        self.assertEqual(resultinterval.start, parse_datetime('1981-04-05T01:01:00Z'))
+
+        with self.assertRaises(ValueError):
+            resultinterval.duration
+
+        #Nothing is parsed until it is used
+        resultinterval = Interval('asdf')
+
+        with self.assertRaises(ValueError):
+            resultinterval.start
+
+    def test_interval_repr(self):
+        self.assertEqual(repr(Interval('1981-04-05/P1D')), "Interval('1981-04-05/P1D')")
+        self.assertEqual(repr(Interval('1981-04-05 01:00:00--P1D', intervaldelimiter='--', datetimedelimiter=' ', relative=True)),
+                         "Interval('1981-04-05 01:00:00--P1D', intervaldelimiter='--', datetimedelimiter=' ', relative=True)")
+
 class TestRepeatingIntervalParserFunctions(unittest.TestCase):
     def test_parse_repeating_interval(self):
         results = list(parse_repeating_interval('R3/1981-04-05/P1D'))
@@ -226,6 +305,10 @@ class TestRepeatingIntervalParserFunctions(unittest.TestCase):
         for dateindex in compat.range(0, 11):
              self.assertEqual(next(resultgenerator), datetime.datetime(year=1980, month=3, day=5, hour=1, minute=1) - dateindex * datetime.timedelta(hours=1, minutes=2))
 
+    def test_parse_repeating_interval_bytes(self):
+        self.assertEqual(list(parse_repeating_interval(b'R3/1981-04-05/P1D')), list(parse_repeating_interval('R3/1981-04-05/P1D')))
+        self.assertEqual(list(parse_repeating_interval(memoryview(b'R3/1981-04-05/P1D'))), list(parse_repeating_interval('R3/1981-04-05/P1D')))
+
     def test_parse_repeating_interval_suffixgarbage(self):
         #Don't allow garbage after the duration
         #https://bitbucket.org/nielsenb/aniso8601/issues/9/durations-with-trailing-garbage-are-parsed
@@ -276,6 +359,232 @@ class TestRepeatingIntervalParserFunctions(unittest.TestCase):
         with self.assertRaises(ValueError):
             parse_interval('R3/1981-04-05/P0003-06-04T12:30:05.5asdfasdf')
 
+class TestRepeatingInterval(unittest.TestCase):
+    def test_bounded(self):
+        result = parse_repeating_interval('R5/1981-04-05T01:01:00/PT1H2M')
+
+        self.assertEqual(len(result), 5)
+        self.assertTrue(result)
+        self.assertEqual(result[0], datetime.datetime(year=1981, month=4, day=5, hour=1, minute=1))
+        self.assertEqual(result[4], datetime.datetime(year=1981, month=4, day=5, hour=5, minute=9))
+        self.assertEqual(result[-1], result[4])
+        self.assertEqual(list(reversed(result)), list(result)[::-1])
+
+        with self.assertRaises(IndexError):
+            result[5]
+
+        with self.assertRaises(IndexError):
+            result[-6]
+
+        self.assertFalse(parse_repeating_interval('R0/1981-04-05/P1D'))
+        self.assertEqual(list(parse_repeating_interval('R0/1981-04-05/P1D')), [])
+
+    def test_slice(self):
+        result = parse_repeating_interval('R10/1981-04-05/P1D')
+        dates = list(result)
+
+        for testslice in [slice(2, 8), slice(None, None, 3), slice(-3, None), slice(None, None, -1), slice(8, 1, -2), slice(20, 30)]:
+            self.assertEqual(list(result[testslice]), dates[testslice])
+            self.assertEqual(len(result[testslice]), len(dates[testslice]))
+
+        self.assertEqual(result[2:8:2][1], datetime.date(year=1981, month=4, day=9))
+        self.assertEqual(list(reversed(result[2:8:2])), [datetime.date(year=1981, month=4, day=11), datetime.date(year=1981, month=4, day=9), datetime.date(year=1981, month=4, day=7)])
+
+        with self.assertRaises(ValueError):
+            result[::0]
+
+    def test_contains(self):
+        result = parse_repeating_interval('R1000000/1981-04-05T00:00:00/PT1M')
+
+        self.assertIn(datetime.datetime(year=1982, month=1, day=1), result)
+        self.assertEqual(result.index(datetime.datetime(year=1982, month=1, day=1)), 390240)
+        self.assertNotIn(datetime.datetime(year=1982, month=1, day=1, second=30), result)
+        self.assertNotIn(datetime.datetime(year=1990, month=1, day=1), result)
+        self.assertNotIn(datetime.date(year=1981, month=4, day=5), result)
+        self.assertNotIn('1981-04-05T00:00:00', result)
+
+        self.assertEqual(result[1::2].index(datetime.datetime(year=1981, month=4, day=5, minute=5)), 2)
+        self.assertNotIn(datetime.datetime(year=1981, month=4, day=5, minute=4), result[1::2])
+
+        with self.assertRaises(ValueError):
+            result.index(datetime.datetime(year=1981, month=4, day=4))
+
+        result = parse_repeating_interval('R/P1D/1981-04-05T01:01:00Z')
+
+        self.assertIn(parse_repeating_interval('R1/1980-04-05T01:01:00Z/P1D')[0], result)
+        self.assertNotIn(datetime.datetime(year=1980, month=4, day=5, hour=1, minute=1), result)
+
+    def test_unbounded(self):
+        result = parse_repeating_interval('R/PT1H2M/1980-03-05T01:01:00')
+
+        self.assertEqual(result[1000], datetime.datetime(year=1980, month=3, day=5, hour=1, minute=1) - 1000 * datetime.timedelta(hours=1, minutes=2))
+        self.assertEqual(list(result[10:13]), [result[10], result[11], result[12]])
+        self.assertEqual(list(result[2::-1]), [result[2], result[1], result[0]])
+        self.assertEqual(result.index(result[123456]), 123456)
+
+        with self.assertRaises(TypeError):
+            len(result)
+
+        with self.assertRaises(IndexError):
+            result[-1]
+
+        with self.assertRaises(IndexError):
+            result[::-1]
+
+        with self.assertRaises(TypeError):
+            reversed(result)
+
+    def test_relative(self):
+        #Each occurrence is a whole number of months from the start
+        result = parse_repeating_interval('R/2003-01-31/P1M', relative=True)
+
+        self.assertEqual(list(result[:4]), [datetime.date(year=2003, month=1, day=31), datetime.date(year=2003, month=2, day=28),
+                                            datetime.date(year=2003, month=3, day=31), datetime.date(year=2003, month=4, day=30)])
+        self.assertEqual(result[13], datetime.date(year=2004, month=2, day=29))
+        self.assertEqual(result.index(datetime.date(year=2103, month=1, day=31)), 1200)
+        self.assertNotIn(datetime.date(year=2003, month=3, day=28), result)
+
+        result = parse_repeating_interval('R5/P1Y1M/2000-02-29T12:00:00', relative=True)
+
+        self.assertEqual(result[4], datetime.datetime(year=1995, month=10, day=29, hour=12))
+        self.assertEqual(list(reversed(result)), list(result)[::-1])
+        self.assertEqual(result.index(datetime.datetime(year=1999, month=1, day=29, hour=12)), 1)
+
+        #A step with a time makes the occurrences after a date datetimes
+        result = parse_repeating_interval('R3/1981-04-05/P1MT12H', relative=True)
+
+        self.assertEqual(list(result), [datetime.date(year=1981, month=4, day=5), datetime.datetime(year=1981, month=5, day=5, hour=12),
+                                        datetime.datetime(year=1981, month=6, day=6)])
+
+    def test_stepping(self):
+        #The occurrences are those of adding the step over and over, where
+        #no day is clamped
+        for start, step in [(datetime.date(year=1981, month=4, day=5), datetime.timedelta(days=3, hours=20)),
+                            (datetime.datetime(year=1981, month=4, day=5, hour=1), -datetime.timedelta(days=1, seconds=1.5)),
+                            (datetime.date(year=1981, month=4, day=5), dateutil.relativedelta.relativedelta(months=14)),
+                            (datetime.datetime(year=1981, month=4, day=5), dateutil.relativedelta.relativedelta(years=-1, days=2, hours=3))]:
+            occurrences = []
+            occurrence = start
+
+            for _ in compat.range(50):
+                occurrences.append(occurrence)
+                occurrence += step
+
+            result = RepeatingInterval(start, step, 50)
+
+            self.assertEqual(list(result), occurrences)
+            self.assertEqual([result[index] for index in compat.range(50)], occurrences)
+            self.assertEqual([result.index(occurrence) for occurrence in occurrences], list(compat.range(50)))
+
+    def test_next_after(self):
+        result = parse_repeating_interval('R/2000-01-01T00:00:00Z/PT5M')
+        now = parse_datetime('2026-10-18T12:03:07Z')
+
+        self.assertEqual(result.next_after(now), result[2818801])
+        self.assertEqual(result.next_after(result[2818801]), result[2818802])
+        self.assertEqual(result.next_after(datetime.datetime(year=1999, month=1, day=1, tzinfo=now.tzinfo)), result[0])
+
+        result = parse_repeating_interval('R3/PT1H/1981-04-05T01:00:00')
+
+        self.assertEqual(result.next_after(datetime.datetime(year=1981, month=4, day=4, hour=23, minute=30)), result[1])
+        self.assertEqual(result.next_after(datetime.date(year=1981, month=4, day=5)), result[0])
+        self.assertIsNone(result.next_after(result[0]))
+
+        result = parse_repeating_interval('R/2003-01-31/P1M', relative=True)
+
+        self.assertEqual(result.next_after(datetime.date(year=2026, month=2, day=28)), datetime.date(year=2026, month=3, day=31))
+        self.assertEqual(result.next_after(datetime.datetime(year=2026, month=2, day=27, hour=12)), datetime.date(year=2026, month=2, day=28))
+        self.assertIsNone(parse_repeating_interval('R/9999-11-30/P1M', relative=True).next_after(datetime.date(year=9999, month=12, day=30)))
+
+    def test_previous_before(self):
+        result = parse_repeating_interval('R/2000-01-01T00:00:00Z/PT5M')
+        now = parse_datetime('2026-10-18T12:03:07Z')
+
+        self.assertEqual(result.previous_before(now), result[2818800])
+        self.assertEqual(result.previous_before(result[2818800]), result[2818799])
+        self.assertIsNone(result.previous_before(result[0]))
+
+        result = parse_repeating_interval('R3/PT1H/1981-04-05T01:00:00')
+
+        self.assertEqual(result.previous_before(datetime.datetime(year=1981, month=4, day=4, hour=23, minute=30)), result[2])
+        self.assertEqual(result.previous_before(datetime.datetime(year=1982, month=1, day=1)), result[0])
+        self.assertIsNone(result.previous_before(result[2]))
+
+        result = parse_repeating_interval('R/P1Y/2000-02-29', relative=True)
+
+        self.assertEqual(result.previous_before(datetime.date(year=1997, month=3, day=1)), datetime.date(year=1997, month=2, day=28))
+        self.assertEqual(result.previous_before(datetime.date(year=1996, month=2, day=29)), datetime.date(year=1995, month=2, day=28))
+
+        #Every occurrence is the same, and before the value
+        result = parse_repeating_interval('R/1981-04-05/PT0S')
+
+        self.assertEqual(result.previous_before(datetime.date(year=1982, month=1, day=1)), datetime.date(year=1981, month=4, day=5))
+        self.assertIsNone(result.previous_before(datetime.date(year=1981, month=4, day=5)))
+        self.assertIsNone(result.next_after(datetime.date(year=1982, month=1, day=1)))
+
+    def test_occurrences_between(self):
+        result = parse_repeating_interval('R/1981-04-05T00:00:00/PT1H')
+        between = result.occurrences_between(datetime.datetime(year=1981, month=4, day=6, minute=30), datetime.date(year=1981, month=4, day=7))
+
+        self.assertEqual(len(between), 23)
+        self.assertEqual(between[0], datetime.datetime(year=1981, month=4, day=6, hour=1))
+        self.assertEqual(between[-1], datetime.datetime(year=1981, month=4, day=6, hour=23))
+
+        self.assertEqual(list(result.occurrences_between(result[3], result[5])), [result[3], result[4]])
+        self.assertEqual(list(result.occurrences_between(result[5], result[3])), [])
+
+        #In the order of the repeating interval
+        result = parse_repeating_interval('R10/P1M/1981-04-05', relative=True)
+
+        self.assertEqual(list(result.occurrences_between(datetime.date(year=1980, month=9, day=5), datetime.date(year=1981, month=1, day=5))),
+                         [datetime.date(year=1980, month=12, day=5), datetime.date(year=1980, month=11, day=5), datetime.date(year=1980, month=10, day=5),
+                          datetime.date(year=1980, month=9, day=5)])
+        self.assertEqual(list(result[::-2].occurrences_between(datetime.date(year=1980, month=1, day=1), datetime.date(year=1990, month=1, day=1))),
+                         list(result[::-2]))
+
+    def test_limit_end(self):
+        result = parse_repeating_interval('R/1981-04-05/P1D', limit=3)
+
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result[-1], datetime.date(year=1981, month=4, day=7))
+        self.assertEqual(len(parse_repeating_interval('R2/1981-04-05/P1D', limit=3)), 2)
+
+        #Up to, but not including, the end, in the direction of the
+        #occurrences
+        result = parse_repeating_interval('R/PT1H/1981-04-05T01:00:00', end=datetime.datetime(year=1981, month=4, day=4, hour=23))
+
+        self.assertEqual(list(result), [datetime.datetime(year=1981, month=4, day=5, hour=1), datetime.datetime(year=1981, month=4, day=5)])
+        self.assertEqual(len(parse_repeating_interval('R/PT1H/1981-04-05T01:00:00', end=datetime.date(year=1981, month=4, day=4))), 25)
+        self.assertEqual(len(parse_repeating_interval('R/2003-01-31/P1M', relative=True, end=datetime.date(year=2004, month=1, day=31))), 12)
+        self.assertEqual(len(parse_repeating_interval('R/2003-01-31/P1M', relative=True, limit=5, end=datetime.date(year=2004, month=1, day=31))), 5)
+
+        with self.assertRaises(ValueError):
+            parse_repeating_interval('R/1981-04-05/P1D', limit=-1)
+
+    def test_last_date(self):
+        #There is no need to compute past the last occurrence
+        self.assertEqual(list(parse_repeating_interval('R2/9999-12-30/P1D')), [datetime.date(year=9999, month=12, day=30), datetime.date(year=9999, month=12, day=31)])
+
+        result = parse_repeating_interval('R/9999-11-30/P1M', relative=True)
+
+        self.assertEqual(result.index(datetime.date(year=9999, month=12, day=30)), 1)
+        self.assertNotIn(datetime.date(year=9999, month=12, day=31), result)
+
+        with self.assertRaises(ValueError):
+            result[2]
+
+    def test_next(self):
+        result = parse_repeating_interval('R2/1981-04-05/P1D')
+
+        self.assertEqual(next(result), datetime.date(year=1981, month=4, day=5))
+        self.assertEqual(next(result), datetime.date(year=1981, month=4, day=6))
+
+        with self.assertRaises(StopIteration):
+            next(result)
+
+        #Iterating starts from the first occurrence again
+        self.assertEqual(len(list(result)), 2)
+
 class TestIntervalPartParserFunctions(unittest.TestCase):
     def test_parse_interval_parts(self):
         resultinterval = _parse_interval_parts('P1M/1981-04-05T01:01:00')
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+import unittest
+import datetime
+
+from aniso8601.date import parse_date
+from aniso8601.time import parse_time, parse_datetime
+from aniso8601.duration import parse_duration
+from aniso8601.interval import parse_repeating_interval
+
+try:
+    import numpy
+
+    from aniso8601.numpy import parse_date_array, parse_time_array, parse_datetime_array, parse_duration_array, repeating_interval_array
+except ImportError:
+    numpy = None
+
+TEST_DATES = ['2013', '0001', '19', '1', '0000', '1981-04-05', '19810405', '1981-04', '1981-02-29', '1984-02-29',
+              '1900-02-29', '2000-02-29', '1981-13-01', '1981-00-01', '1981-04-31', '1981-04-00', '0000-01-01',
+              '9999-12-31', '2004-W53', '2004W53', '2009-W01-1', '2009W011', '2004-W53-6', '2009-W00-1', '2009-W53-7',
+              '2009-W54-9', '2009W000', '0001-W01-0', '9999-W52-7', '9999-W53-1', '1981-095', '1981095', '1981-366',
+              '1980-366', '1981-000', '1981-367', '9999-366', '1981-04-05T', '1981-04/05', '1981 04 05', '-1981',
+              '+01981', '198104', '']
+
+TEST_TIMES = ['01:23:45', '24:00:00', '23:21:28.512400', '14:43:59.9999997', '14:43:59.9999995', '23:59:59.9999995',
+              '01:23', '24:00', '01:23.4567', '01:60', '01:60.5', '01:61', '25:00', '012345', '0123', '01', '12.5',
+              '24.0', '24.5', '25', '23:21:28.512400+00:00', '01:23:45-12:34', '01:23:45+11:15', '01:23:45Z',
+              '01:23:45+0000', '01:23:45-1234', '01:23:45+00', '01:23:45-12', '01:23:45-00:00', '01:23:45-0000',
+              '01:23:45-00', '01:23:45+49:27', '23:21:60', '23:61:00', '24:00:01', '01:23:45.1234567890123',
+              '01:23:45,5', '1:23:45', '01:23:45+1', 'T01:23:45', '']
+
+TEST_DATETIMES = ['1981-04-05T23:21:28.512400Z', '1981-04-05T23:21:28+01:00', '1981-04-05T23:21:28.512400-12:34',
+                  '1981-04-05T24:00:00', '19810405T232128', '1981-095T23:21:28Z', '2004-W53-6T23:21:28-0530',
+                  '1981W536T23', '1981-04T23:21', '1981-13-05T23:21:28', '1981-04-05T25:21:28', '1981-04-05T23:21:28-00',
+                  '1981-04-05', '1981-04-05TT23:21:28', '9999-12-31T24:00:00']
+
+TEST_DURATIONS = ['P1Y2M3DT4H54M6S', 'P1Y2M3DT4H54M6.5S', 'P1Y2M3DT4H54M6,5S', 'P1Y2M3D', 'P1Y2M3.5D', 'P1Y2M3,5D',
+                  'PT4H54M6.5S', 'PT4H54M6,5S', 'PT15M', 'PT90M', 'PT25H', 'P1DT2H', 'P1Y', 'P1.5Y', 'P1.0Y', 'P1,5Y',
+                  'P1M', 'P1.5M', 'P1W', 'P1.5W', 'P1D', 'P1.5D', 'PT1H', 'PT36H', 'P0003-06-04T12:30:05',
+                  'P0003-06-04T12:30:05.5', 'P0003-13-04T12:30:05', 'P1Y2M3D4W', 'P1Y1M1Y', 'P1D1Y1M', 'PT1S1H',
+                  'P1Y2M3DT4H54M6SX', 'P1.5Y2M', 'P1H', 'P1X1Y', 'P-1Y', 'PT1Y', 'P1YT', 'PT', 'P', 'T1H', '',
+                  'P999999999999D', 'P99999999W', 'PT999999999999H', 'P0D']
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed.')
+class TestNumpyParserFunctions(unittest.TestCase):
+    def test_parse_date_array(self):
+        result = parse_date_array(TEST_DATES)
+
+        for index, testdate in enumerate(TEST_DATES):
+            self.assertEqual(self._expected_date(testdate), self._result_date(result, index), testdate)
+
+    def test_parse_time_array(self):
+        result = parse_time_array(TEST_TIMES)
+
+        for index, testtime in enumerate(TEST_TIMES):
+            self.assertEqual(self._expected_time(testtime), self._result_time(result, index), testtime)
+
+    def test_parse_datetime_array(self):
+        result = parse_datetime_array(TEST_DATETIMES)
+
+        for index, testdatetime in enumerate(TEST_DATETIMES):
+            self.assertEqual(self._expected_datetime(testdatetime, 'T'), self._result_datetime(result, index), testdatetime)
+
+    def test_parse_datetime_array_delimiter(self):
+        testdatetimes = [testdatetime.replace('T', ' ') for testdatetime in TEST_DATETIMES]
+
+        result = parse_datetime_array(testdatetimes, delimiter=' ')
+
+        for index, testdatetime in enumerate(testdatetimes):
+            self.assertEqual(self._expected_datetime(testdatetime, ' '), self._result_datetime(result, index), testdatetime)
+
+        #A delimiter with digits is parsed one string at a time
+        testdatetimes = [testdatetime.replace('T', '9') for testdatetime in TEST_DATETIMES]
+
+        result = parse_datetime_array(testdatetimes, delimiter='9')
+
+        for index, testdatetime in enumerate(testdatetimes):
+            self.assertEqual(self._expected_datetime(testdatetime, '9'), self._result_datetime(result, index), testdatetime)
+
+    def test_parse_datetime_array_bytes(self):
+        testdatetimes = numpy.array([testdatetime.encode('ascii') for testdatetime in TEST_DATETIMES])
+
+        result = parse_datetime_array(testdatetimes)
+
+        for index, testdatetime in enumerate(TEST_DATETIMES):
+            self.assertEqual(self._expected_datetime(testdatetime, 'T'), self._result_datetime(result, index), testdatetime)
+
+    def test_parse_datetime_array_buffer(self):
+        testdatetimes = [b'1981-04-05T23:21:28Z', b'1981-04-06T23:21:28Z', b'1981-04-31T23:21:28Z']
+
+        result = parse_datetime_array(b''.join(testdatetimes), width=20)
+
+        self.assertEqual(result.datetimes.tolist(), [datetime.datetime(1981, 4, 5, 23, 21, 28), datetime.datetime(1981, 4, 6, 23, 21, 28), None])
+        self.assertEqual(result.offsets.tolist(), [datetime.timedelta(0), datetime.timedelta(0), None])
+        self.assertEqual(result.valid.tolist(), [True, True, False])
+
+        with self.assertRaises(ValueError):
+            parse_datetime_array(b''.join(testdatetimes))
+
+    def test_parse_duration_array(self):
+        result = parse_duration_array(TEST_DURATIONS)
+
+        self.assertEqual(result.durations.dtype, numpy.dtype('m8[us]'))
+
+        for index, testduration in enumerate(TEST_DURATIONS):
+            self.assertEqual(self._expected_duration(testduration, False), self._result_duration(result, index), testduration)
+
+    def test_parse_duration_array_relative(self):
+        result = parse_duration_array(TEST_DURATIONS, relative=True)
+
+        self.assertEqual(result.durations.dtype.names, ('months', 'days', 'microseconds'))
+
+        for index, testduration in enumerate(TEST_DURATIONS):
+            self.assertEqual(self._expected_duration(testduration, True), self._result_duration(result, index), testduration)
+
+        result = parse_duration_array(['P1Y2M4DT25H30M', 'P3W'], relative=True)
+
+        self.assertEqual(result.durations.tolist(), [(14, 5, 5400000000), (0, 21, 0)])
+
+    def test_parse_array_shape(self):
+        result = parse_date_array([['1981-04-05', '1981095'], ['1981-W14-7', '1981-04-31']])
+
+        self.assertEqual(result.dates.shape, (2, 2))
+        self.assertEqual(result.dates.dtype, numpy.dtype('M8[D]'))
+        self.assertEqual(result.valid.tolist(), [[True, True], [True, False]])
+        self.assertEqual(result.dates[0, 1], numpy.datetime64('1981-04-05'))
+
+        result = parse_time_array([])
+
+        self.assertEqual(result.times.shape, (0,))
+        self.assertEqual(result.times.dtype, numpy.dtype('m8[us]'))
+        self.assertEqual(result.offsets.dtype, numpy.dtype('m8[us]'))
+
+    def test_parse_array_nonascii(self):
+        #Other digits are accepted by the scalar parser
+        testdates = [u'1981-04-05', u'١٩٨١-04-05', u'1981-04-05é']
+
+        result = parse_date_array(testdates)
+
+        self.assertEqual(result.valid.tolist(), [True, True, False])
+        self.assertEqual(result.dates[1], numpy.datetime64('1981-04-05'))
+
+    def test_parse_array_invalid(self):
+        with self.assertRaises(TypeError):
+            parse_date_array(numpy.arange(3))
+
+    def _expected_date(self, isodatestr):
+        try:
+            return parse_date(isodatestr)
+        except (ValueError, NotImplementedError, OverflowError):
+            return None
+
+    def _expected_time(self, isotimestr):
+        try:
+            result = parse_time(isotimestr)
+        except (ValueError, NotImplementedError, OverflowError):
+            return None
+
+        return (result.replace(tzinfo=None), self._offset(result.tzinfo))
+
+    def _expected_datetime(self, isodatetimestr, delimiter):
+        try:
+            result = parse_datetime(isodatetimestr, delimiter=delimiter)
+        except (ValueError, NotImplementedError, OverflowError):
+            return None
+
+        return (result.replace(tzinfo=None), self._offset(result.tzinfo))
+
+    def _expected_duration(self, isodurationstr, relative):
+        try:
+            result = parse_duration(isodurationstr, relative=relative)
+        except (ValueError, NotImplementedError, OverflowError, IndexError):
+            return None
+
+        if relative is False:
+            if abs(result) > datetime.timedelta(microseconds=numpy.iinfo(numpy.int64).max):
+                #Too long for a timedelta64[us]
+                return None
+
+            return result
+
+        #Months, and days and microseconds normalized as a timedelta
+        wholedays = int(result.days)
+        delta = datetime.timedelta(days=result.days - wholedays, hours=result.hours, minutes=result.minutes, seconds=result.seconds, microseconds=result.microseconds)
+
+        return (result.years * 12 + result.months, wholedays + delta.days, delta.seconds * 1000000 + delta.microseconds)
+
+    def _result_duration(self, result, index):
+        if result.valid[index] == False:
+            return None
+
+        if result.durations.dtype.names is None:
+            return result.durations[index].tolist()
+
+        return tuple(result.durations[index].tolist())
+
+    def _result_date(self, result, index):
+        if result.valid[index] == False:
+            self.assertTrue(numpy.isnat(result.dates[index]))
+            return None
+
+        return result.dates[index].tolist()
+
+    def _result_time(self, result, index):
+        if result.valid[index] == False:
+            self.assertTrue(numpy.isnat(result.times[index]))
+            self.assertTrue(numpy.isnat(result.offsets[index]))
+            return None
+
+        return ((datetime.datetime.min + result.times[index].tolist()).time(), self._nat_to_none(result.offsets[index]))
+
+    def _result_datetime(self, result, index):
+        if result.valid[index] == False:
+            self.assertTrue(numpy.isnat(result.datetimes[index]))
+            self.assertTrue(numpy.isnat(result.offsets[index]))
+            return None
+
+        return (result.datetimes[index].tolist(), self._nat_to_none(result.offsets[index]))
+
+    def _offset(self, tzinfo):
+        if tzinfo is None:
+            return None
+
+        #UTCOffset doesn't range check its offset, unlike time.utcoffset
+        return tzinfo.utcoffset(None)
+
+    def _nat_to_none(self, value):
+        if numpy.isnat(value):
+            return None
+
+        return value.tolist()
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed.')
+class TestNumpyRepeatingInterval(unittest.TestCase):
+    def test_repeating_interval_array(self):
+        for testtuple in [('R100/1981-04-05T01:01:00/PT1H2M', False), ('R100/PT36H/1981-04-05', False), ('R5/1981-04-05/1981-04-06T12:00:00', False),
+                          ('R100/2003-01-31/P1M', True), ('R100/P1Y1M2DT3H/2000-02-29T12:00:00+05:00', True), ('R100/1981-04-05/PT25H', True),
+                          ('R0/1981-04-05/P1D', False)]:
+            result = parse_repeating_interval(testtuple[0], relative=testtuple[1], as_array=True)
+            expected = [self._as_naive(occurrence) for occurrence in parse_repeating_interval(testtuple[0], relative=testtuple[1])]
+
+            self.assertEqual(result.tolist(), numpy.array(expected, dtype=result.dtype).tolist(), testtuple)
+
+    def test_repeating_interval_array_dtype(self):
+        self.assertEqual(parse_repeating_interval('R3/1981-04-05/P1D', as_array=True).dtype, numpy.dtype('M8[D]'))
+        self.assertEqual(parse_repeating_interval('R3/1981-04-05/PT1H', as_array=True).dtype, numpy.dtype('M8[D]'))
+        self.assertEqual(parse_repeating_interval('R3/1981-04-05/P1M', relative=True, as_array=True).dtype, numpy.dtype('M8[D]'))
+        self.assertEqual(parse_repeating_interval('R3/1981-04-05T00:00:00Z/P1D', as_array=True).dtype, numpy.dtype('M8[us]'))
+
+        #A step with a time makes the occurrences after a date datetimes
+        result = parse_repeating_interval('R3/1981-04-05/P1MT12H', relative=True, as_array=True)
+
+        self.assertEqual(result.dtype, numpy.dtype('M8[us]'))
+        self.assertEqual(result[1], numpy.datetime64('1981-05-05T12:00:00'))
+
+    def test_repeating_interval_array_slice(self):
+        repeatinginterval = parse_repeating_interval('R/2003-01-31/P1M', relative=True)
+
+        self.assertEqual(repeating_interval_array(repeatinginterval[90000:10:-7]).tolist(), list(repeatinginterval[90000:10:-7]))
+        self.assertEqual(repeating_interval_array(repeatinginterval[5:100:3]).tolist(), list(repeatinginterval[5:100:3]))
+
+    def test_repeating_interval_array_unbounded(self):
+        with self.assertRaises(ValueError):
+            parse_repeating_interval('R/1981-04-05/P1D', as_array=True)
+
+        result = parse_repeating_interval('R/1981-04-05/P1D', as_array=True, limit=3)
+
+        self.assertEqual(result.tolist(), [datetime.date(1981, 4, 5), datetime.date(1981, 4, 6), datetime.date(1981, 4, 7)])
+
+        result = parse_repeating_interval('R/P1M/1981-04-05T12:00:00', relative=True, as_array=True, end=datetime.date(1980, 12, 31))
+
+        self.assertEqual(len(result), 4)
+        self.assertEqual(result[-1], numpy.datetime64('1981-01-05T12:00:00'))
+
+    def test_repeating_interval_array_range(self):
+        #Occurrences out of range raise as they do when computed
+        for testtuple in [('R3/9999-12-30/P1D', False), ('R3/P1D/0001-01-02T00:00:00', False), ('R3/9999-11-30/P1M', True),
+                          ('R3/9999-11-30/P1M1D', True), ('R99999/9999-11-30/P1Y', True), ('R3/0001-01-01/P1M2000000D', True)]:
+            with self.assertRaises((ValueError, OverflowError)) as arraycontext:
+                parse_repeating_interval(testtuple[0], relative=testtuple[1], as_array=True)
+
+            with self.assertRaises((ValueError, OverflowError)) as scalarcontext:
+                list(parse_repeating_interval(testtuple[0], relative=testtuple[1]))
+
+            self.assertIs(type(arraycontext.exception), type(scalarcontext.exception), testtuple)
+
+    @staticmethod
+    def _as_naive(occurrence):
+        #datetime64 has no UTC offset, the occurrences are given as written
+        if isinstance(occurrence, datetime.datetime):
+            return occurrence.replace(tzinfo=None)
+
+        return occurrence
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+import unittest
+import datetime
+
+from aniso8601.date import parse_date
+from aniso8601.duration import parse_duration
+from aniso8601.time import parse_datetime
+
+try:
+    from aniso8601.parallel import parse_many, PARSE_MANY_INVALID
+except ImportError:
+    parse_many = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+@unittest.skipIf(parse_many is None, 'concurrent.futures is not available.')
+class TestParseMany(unittest.TestCase):
+    def test_parse_many(self):
+        isodatetimestrs = ['1977-06-10T12:{0:02d}:00.5+01:00'.format(minute) for minute in range(50)] + \
+                          ['1981-04-05T23:21:28', b'9999-12-31T23:59:59.999999Z', '0001-01-01T00:00:00Z']
+
+        expected = [parse_datetime(isodatetimestr, output='epoch_us') for isodatetimestr in isodatetimestrs]
+
+        for workers in (1, 2):
+            result = parse_many(isodatetimestrs, workers=workers, chunksize=7)
+
+            self.assertEqual(list(result), expected)
+            self.assertEqual(result.itemsize, 8)
+
+        self.assertEqual(parse_many(iter(isodatetimestrs), workers=2, chunksize=100).tolist(), expected)
+        self.assertEqual(parse_many([], workers=2).tolist(), [])
+
+    def test_parse_many_kind(self):
+        isodatestrs = ['1981-04-05', '2004-W53-6', '1981-095', '1970-01-01', '0001-01-01']
+        expected = [(parse_date(isodatestr) - datetime.date(1970, 1, 1)).days * 86400000000 for isodatestr in isodatestrs]
+
+        self.assertEqual(parse_many(isodatestrs, kind='date', workers=2, chunksize=2).tolist(), expected)
+
+        isodurationstrs = ['P1Y2M3DT4H54M6.5S', 'PT36H', 'P0003-06-04T12:30:05', 'PT0.000001S']
+        expected = [parse_duration(isodurationstr) // datetime.timedelta(microseconds=1) for isodurationstr in isodurationstrs]
+
+        self.assertEqual(parse_many(isodurationstrs, kind='duration', workers=2, chunksize=3).tolist(), expected)
+
+        self.assertEqual(parse_many(['1981-04-05 23:21:28Z'], delimiter=' ', workers=1).tolist(),
+                         [parse_datetime('1981-04-05T23:21:28Z', output='epoch_us')])
+
+    def test_parse_many_errors(self):
+        isodatetimestrs = ['1981-04-05T23:21:28', '1981-04-31T23:21:28', '1981-04-05T23:21:28Z', '1981-04-05T25:21:28']
+
+        for workers in (1, 2):
+            with self.assertRaises(ValueError) as e:
+                parse_many(isodatetimestrs, workers=workers, chunksize=2)
+
+            self.assertEqual(str(e.exception), 'day is out of range for month')
+
+            result = parse_many(isodatetimestrs, workers=workers, chunksize=3, errors='coerce')
+
+            self.assertEqual(result.tolist(), [parse_datetime(isodatetimestrs[0], output='epoch_us'), PARSE_MANY_INVALID,
+                                               parse_datetime(isodatetimestrs[2], output='epoch_us'), PARSE_MANY_INVALID])
+
+            result, failures = parse_many(isodatetimestrs, workers=workers, chunksize=3, errors='collect')
+
+            self.assertEqual(result[1], PARSE_MANY_INVALID)
+            self.assertEqual([index for index, _ in failures], [1, 3])
+            self.assertIsInstance(failures[1][1], ValueError)
+
+        #Items that aren't strings fail as they do in batch.py
+        with self.assertRaises(TypeError):
+            parse_many(['1981-04-05T23:21:28', None], workers=1)
+
+        for kind in ('datetime', 'date', 'duration'):
+            result = parse_many([None, 1981], kind=kind, workers=1, errors='coerce')
+
+            self.assertEqual(result.tolist(), [PARSE_MANY_INVALID, PARSE_MANY_INVALID])
+
+        result, failures = parse_many(['1981-04-05T23:21:28', None], workers=2, chunksize=1, errors='collect')
+
+        self.assertEqual(result.tolist(), [parse_datetime('1981-04-05T23:21:28', output='epoch_us'), PARSE_MANY_INVALID])
+        self.assertEqual([index for index, _ in failures], [1])
+        self.assertIsInstance(failures[0][1], TypeError)
+
+        #Strings laid out correctly, but out of range, fail on their own
+        self.assertEqual(parse_many(['2020-01-01', '9999-W53'], kind='date', workers=1, errors='coerce').tolist(),
+                         [parse_many(['2020-01-01'], kind='date', workers=1)[0], PARSE_MANY_INVALID])
+
+        with self.assertRaises(OverflowError):
+            parse_many(['9999-W52-6T00:00'], workers=1)
+
+        with self.assertRaises(ValueError):
+            parse_many(isodatetimestrs, kind='time')
+
+        with self.assertRaises(ValueError):
+            parse_many(isodatetimestrs, errors='ignore')
+
+        with self.assertRaises(ValueError):
+            parse_many(isodatetimestrs, workers=0)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed.')
+    def test_parse_many_numpy(self):
+        result = parse_many(['1977-06-10T12:00:00.5+01:00', '1977-06-31T12:00:00'], workers=1, errors='coerce')
+
+        self.assertEqual(numpy.frombuffer(result, dtype='M8[us]').tolist(),
+                         [datetime.datetime(1977, 6, 10, 11, 0, 0, 500000), None])
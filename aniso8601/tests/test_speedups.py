@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+import unittest
+import datetime
+import os
+
+from aniso8601 import speedups
+from aniso8601.date import parse_date
+from aniso8601.time import parse_time, parse_datetime, _parse_tzinfo
+from aniso8601.timezone import _parse_timezone, build_utcoffset
+
+TEST_DATES = ['2013', '0000', '0001', '9999', '19', '1', '1981-04-05', '19810405', '1981-04', '1981-02-29',
+              '1984-02-29', '1900-02-29', '2000-02-29', '1981-13-01', '1981-00-01', '1981-04-31', '1981-04-00',
+              '0000-01-01', '9999-12-31', '2004-W53', '2004W53', '2009-W01-1', '2009W011', '2004-W53-6',
+              '2009-W00-1', '2009-W53-7', '2009-W54-9', '2009W000', '0001-W01-0', '0001-W01-1', '9999-W52-7',
+              '9999-W53-1', '1981-095', '1981095', '1981-366', '1980-366', '1981-000', '1981-367', '9999-366',
+              '0001-001', '1981-04-05T', '1981-04/05', '1981 04 05', '1981-W14_7', '-1981', '+01981', '198104',
+              '1981-O4-05', u'١٩٨١-04-05', '']
+
+TEST_TIMES = ['01:23:45', '24:00:00', '24:30:00', '23:21:28.512400', '14:43:59.9999997', '14:43:59.9999995',
+              '14:43:59.9999985', '23:59:59.9999995', '01:23:45.123456789', '01:23:45.1234567890', '01:23',
+              '24:00', '01:23.4567', '01:60', '01:60.0', '01:60.5', '01:61', '25:00', '012345', '012345.5', '0123',
+              '0123.5', '01', '12.5', '12.999999999', '24.0', '24.5', '25', '23:21:28.512400+00:00',
+              '01:23:45-12:34', '01:23:45+11:15', '01:23:45Z', '01:23:45+0000', '01:23:45-1234', '01:23:45+00',
+              '01:23:45-12', '01:23:45-00:00', '01:23:45-0000', '01:23:45-00', '01:23:45+49:27', '01:23:45+12-34',
+              '01:23:45+1', '01:23:45+12:3', '01:23:45+12;34', '23:21:60', '23:61:00', '24:00:01', '01:23:45,5',
+              '01:23:45.', '01:23:45.5Z', '01.', '1:23:45', '01:2:345', 'T01:23:45', '01:23:45ZZ', u'01:23:4٥', '']
+
+TEST_DATETIMES = ['1981-04-05T23:21:28.512400Z', '1981-04-05T23:21:28+01:00', '1981-04-05T23:21:28.512400-12:34',
+                  '1981-04-05T24:00:00', '19810405T232128', '1981-095T23:21:28Z', '2004-W53-6T23:21:28-0530',
+                  '1981W536T23', '1981-04T23:21', '2013T23:21', '1981-13-05T23:21:28', '1981-04-05T25:21:28',
+                  '1981-04-05T23:21:28-00', '1981-04-05', '1981-04-05TT23:21:28', '9999-12-31T24:00:00', 'T23:21:28',
+                  '1981-04-05T']
+
+TEST_TIMEZONES = ['+00:00', '+01:00', '-01:00', '+00:12', '-00:12', '+0000', '+0100', '-0100', '+00', '+01', '-01',
+                  '-00:00', '-0000', '-00', '+24:00', '+99:99', '+1:00', '+01-00', '01:00', 'Z', '+', '']
+
+class TestSpeedupsFunctions(unittest.TestCase):
+    def setUp(self):
+        self._compiled = speedups.compiled
+
+    def tearDown(self):
+        speedups.compiled = self._compiled
+
+    def test_disable_speedups(self):
+        speedups.disable_speedups()
+
+        self.assertIsNone(speedups.compiled)
+        self.assertFalse(speedups.speedups_enabled())
+        self.assertEqual(parse_date('1981-04-05'), datetime.date(1981, 4, 5))
+
+    def test_enable_speedups(self):
+        if speedups.speedups_available() is True:
+            speedups.enable_speedups()
+
+            self.assertTrue(speedups.speedups_enabled())
+        else:
+            with self.assertRaises(ImportError):
+                speedups.enable_speedups()
+
+            self.assertFalse(speedups.speedups_enabled())
+
+@unittest.skipIf(speedups.speedups_available() is False, 'aniso8601._speedups is not built.')
+class TestSpeedupsParity(unittest.TestCase):
+    def setUp(self):
+        self._compiled = speedups.compiled
+
+    def tearDown(self):
+        speedups.compiled = self._compiled
+
+    def test_suite(self):
+        #Every other test is run with the pure Python parsers, and with the
+        #compiled parsers
+        testdir = os.path.dirname(os.path.abspath(__file__))
+
+        modulenames = ['aniso8601.tests.' + filename[:-3] for filename in sorted(os.listdir(testdir))
+                       if filename.startswith('test_') and filename.endswith('.py') and filename != 'test_speedups.py']
+
+        for enable in (speedups.disable_speedups, speedups.enable_speedups):
+            enable()
+
+            suite = unittest.defaultTestLoader.loadTestsFromNames(modulenames)
+            result = unittest.TestResult()
+
+            suite.run(result)
+
+            self.assertTrue(result.wasSuccessful(), '{0}: {1}'.format(enable.__name__, result.failures + result.errors))
+            self.assertGreater(result.testsRun, 0)
+
+    def test_parse_date(self):
+        for testdate in TEST_DATES:
+            self.assertCompiledEqual(parse_date, speedups._speedups.parse_date, testdate)
+
+    def test_parse_time(self):
+        for testtime in TEST_TIMES:
+            self.assertCompiledEqual(parse_time, self._compiled_parse_time, testtime)
+
+    def test_parse_datetime(self):
+        for testdatetime in TEST_DATETIMES:
+            self.assertCompiledEqual(parse_datetime, self._compiled_parse_datetime, testdatetime)
+
+            testdatetime = testdatetime.replace('T', ' ')
+
+            self.assertCompiledEqual(lambda isostr: parse_datetime(isostr, delimiter=' '),
+                                     lambda isostr: self._compiled_parse_datetime(isostr, delimiter=' '),
+                                     testdatetime)
+
+        #An empty delimiter is never handled
+        self.assertIsNone(speedups._speedups.parse_datetime('1981-04-05T23:21:28', '', None))
+
+    def test_parse_timezone(self):
+        for testtimezone in TEST_TIMEZONES:
+            self.assertCompiledEqual(_parse_timezone, self._compiled_parse_timezone, testtimezone)
+
+    def test_validate(self):
+        #The compiled validators handle exactly the strings the compiled
+        #parsers do
+        for testdate in TEST_DATES:
+            self.assertEqual(speedups._speedups.validate_date(testdate), speedups._speedups.parse_date(testdate) and True, testdate)
+
+        for testtime in TEST_TIMES:
+            self.assertEqual(speedups._speedups.validate_time(testtime), self._compiled_parse_time(testtime) and True, testtime)
+
+        for testdatetime in TEST_DATETIMES:
+            self.assertEqual(speedups._speedups.validate_datetime(testdatetime, 'T'), self._compiled_parse_datetime(testdatetime) and True, testdatetime)
+
+        self.assertIsNone(speedups._speedups.validate_date(19810405))
+        self.assertIsNone(speedups._speedups.validate_datetime('1981-04-05T23:21:28', ''))
+
+    def test_bytes(self):
+        #Bytes-like strings are read in place, with the same results as str
+        for testdate in TEST_DATES:
+            for testbytes in self._bytes(testdate):
+                self.assertEqual(speedups._speedups.parse_date(testbytes), speedups._speedups.parse_date(testdate), testdate)
+
+        for testtime in TEST_TIMES:
+            for testbytes in self._bytes(testtime):
+                self.assertEqual(repr(self._compiled_parse_time(testbytes)), repr(self._compiled_parse_time(testtime)), testtime)
+
+        for testdatetime in TEST_DATETIMES:
+            for testbytes in self._bytes(testdatetime):
+                self.assertEqual(repr(self._compiled_parse_datetime(testbytes)), repr(self._compiled_parse_datetime(testdatetime)), testdatetime)
+                self.assertEqual(repr(self._compiled_parse_datetime(testbytes, delimiter=b'T')), repr(self._compiled_parse_datetime(testdatetime)), testdatetime)
+
+        for testtimezone in TEST_TIMEZONES:
+            for testbytes in self._bytes(testtimezone):
+                self.assertEqual(speedups._speedups.parse_timezone(testbytes), speedups._speedups.parse_timezone(testtimezone), testtimezone)
+
+    def test_nonstring(self):
+        #Anything other than a str or a bytes-like object is never handled
+        self.assertIsNone(speedups._speedups.parse_date(19810405))
+        self.assertIsNone(speedups._speedups.parse_time(1, None))
+        self.assertIsNone(speedups._speedups.parse_datetime(None, 'T', None))
+        self.assertIsNone(speedups._speedups.parse_timezone(['+01:00']))
+
+    def assertCompiledEqual(self, purefunction, compiledfunction, isostr):
+        #The compiled function must return the result of the pure Python
+        #function, or None where it raises
+        speedups.disable_speedups()
+
+        try:
+            expected = purefunction(isostr)
+        except (ValueError, NotImplementedError, OverflowError):
+            expected = None
+
+        result = compiledfunction(isostr)
+
+        if result is not None:
+            self.assertEqual(repr(result), repr(expected), isostr)
+
+    def _compiled_parse_time(self, isotimestr):
+        return speedups._speedups.parse_time(isotimestr, _parse_tzinfo)
+
+    def _compiled_parse_datetime(self, isodatetimestr, delimiter='T'):
+        return speedups._speedups.parse_datetime(isodatetimestr, delimiter, _parse_tzinfo)
+
+    def _compiled_parse_timezone(self, tzstr):
+        utcdelta = speedups._speedups.parse_timezone(tzstr)
+
+        if utcdelta is None:
+            return None
+
+        return build_utcoffset(tzstr, utcdelta)
+
+    def _bytes(self, isostr):
+        isobytes = isostr.encode('utf-8')
+
+        return (isobytes, bytearray(isobytes), memoryview(isobytes))
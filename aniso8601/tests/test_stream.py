@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+import unittest
+import datetime
+import os
+import shutil
+import tempfile
+
+from aniso8601.stream import parse_datetime_stream, parse_datetime_file, _searchable
+from aniso8601.time import parse_datetime
+
+TEST_LOG = (b'1981-04-05T23:21:28.512400Z INFO started\n'
+            b'1981-04-05T23:21:29.000001Z WARN slow\r\n'
+            b'    at frame one\n'
+            b'1981-04-05T23:21:30-12:34 INFO stopped\n'
+            b'1981-04-05T23:21:60Z ERROR leap\n'
+            b'1981-04-05T24:00:00+00:00 INFO midnight\n'
+            b'\n'
+            b'19810406T0102 INFO basic')
+
+TEST_RESULTS = [(0, parse_datetime('1981-04-05T23:21:28.512400Z')),
+                (41, parse_datetime('1981-04-05T23:21:29.000001Z')),
+                (97, parse_datetime('1981-04-05T23:21:30-12:34')),
+                (168, parse_datetime('1981-04-05T24:00:00+00:00')),
+                (209, parse_datetime('19810406T0102'))]
+
+class TestStreamParserFunctions(unittest.TestCase):
+    def test_parse_datetime_stream(self):
+        results = list(parse_datetime_stream(TEST_LOG, errors='skip'))
+
+        self.assertEqual(results, TEST_RESULTS)
+
+        for (_, result), (_, expected) in zip(results, TEST_RESULTS):
+            self.assertEqual(result.tzinfo, expected.tzinfo)
+
+            if expected.tzinfo is not None:
+                self.assertEqual(result.tzinfo.tzname(None), expected.tzinfo.tzname(None))
+
+    def test_parse_datetime_stream_buffers(self):
+        self.assertEqual(list(parse_datetime_stream(bytearray(TEST_LOG), errors='skip')), TEST_RESULTS)
+        self.assertEqual(list(parse_datetime_stream(memoryview(TEST_LOG), errors='skip')), TEST_RESULTS)
+
+        #A memoryview of all of a buffer isn't copied, it is searched through
+        #the buffer, others are copied, and offsets are from the start of the
+        #memoryview
+        buffer = bytearray(TEST_LOG)
+
+        self.assertIs(_searchable(memoryview(buffer)), buffer)
+        self.assertIs(_searchable(memoryview(TEST_LOG)), TEST_LOG)
+        self.assertEqual(_searchable(memoryview(buffer)[41:]), TEST_LOG[41:])
+        self.assertEqual(_searchable(memoryview(buffer)[::-1]), TEST_LOG[::-1])
+
+        self.assertEqual(list(parse_datetime_stream(memoryview(buffer)[41:], errors='skip')),
+                         [(offset - 41, result) for offset, result in TEST_RESULTS if offset >= 41])
+
+    def test_parse_datetime_stream_errors(self):
+        with self.assertRaises(ValueError):
+            list(parse_datetime_stream(TEST_LOG))
+
+        results = list(parse_datetime_stream(TEST_LOG, errors='coerce'))
+
+        self.assertEqual([offset for offset, _ in results], [0, 41, 80, 97, 136, 168, 208, 209])
+        self.assertEqual([result for _, result in results if result is not None], [result for _, result in TEST_RESULTS])
+        self.assertEqual([offset for offset, result in results if result is None], [80, 136, 208])
+
+        with self.assertRaises(ValueError):
+            list(parse_datetime_stream(TEST_LOG, errors='collect'))
+
+    def test_parse_datetime_stream_sameshape(self):
+        #The plan for the shape is reused, the values must still be checked
+        results = list(parse_datetime_stream(b'1981-04-05T00:00:00\n1981-04-31T00:00:00\n1981-04-05T00:00:00-00:00\n1981-04-05T00:00:00+00:00\n', errors='coerce'))
+
+        self.assertEqual(results, [(0, datetime.datetime(1981, 4, 5)), (20, None), (40, None), (66, datetime.datetime(1981, 4, 5, tzinfo=parse_datetime('1981-04-05T00:00:00+00:00').tzinfo))])
+
+    def test_parse_datetime_stream_overflow(self):
+        #Date times laid out correctly, but out of range, fail on their own
+        testlog = b'9999-W52-5T00:00 first\n9999-W53T00:00 overflow\n9999-W52-6T00:00 overflow\n9999-W52-5T00:01 last\n'
+
+        self.assertEqual(list(parse_datetime_stream(testlog, errors='coerce')),
+                         [(0, datetime.datetime(9999, 12, 31)), (23, None), (47, None), (73, datetime.datetime(9999, 12, 31, 0, 1))])
+        self.assertEqual(len(list(parse_datetime_stream(testlog, errors='skip'))), 2)
+
+        with self.assertRaises(OverflowError):
+            list(parse_datetime_stream(testlog))
+
+    def test_parse_datetime_stream_column(self):
+        testlog = b'[1981-04-05 23:21:28Z] started\n[1981-04-06 23:21:28Z] stopped\n'
+        expected = [(0, parse_datetime('1981-04-05T23:21:28Z')), (31, parse_datetime('1981-04-06T23:21:28Z'))]
+
+        self.assertEqual(list(parse_datetime_stream(testlog, column=1, width=20, delimiter=' ')), expected)
+        self.assertEqual(list(parse_datetime_stream(testlog, prefix=b'[', width=20, delimiter=' ')), expected)
+
+    def test_parse_datetime_stream_prefix(self):
+        testlog = b'level=info ts=1981-04-05T23:21:28Z msg=started\nlevel=info msg=continued\nts=1981-04-06T23:21:28Z\n'
+
+        self.assertEqual(list(parse_datetime_stream(testlog, prefix='ts=', errors='coerce')),
+                         [(0, parse_datetime('1981-04-05T23:21:28Z')), (47, None), (72, parse_datetime('1981-04-06T23:21:28Z'))])
+
+        with self.assertRaises(ValueError):
+            list(parse_datetime_stream(testlog, prefix=b'ts='))
+
+    def test_parse_datetime_stream_nonascii(self):
+        testlog = u'١٩٨١-04-05T23:21:28Z started\n1981-04-05T23:21:28Zé\n'.encode('utf-8')
+
+        self.assertEqual(list(parse_datetime_stream(testlog, errors='coerce')), [(0, parse_datetime('1981-04-05T23:21:28Z')), (33, None)])
+
+    def test_parse_datetime_file(self):
+        tempdir = tempfile.mkdtemp()
+
+        try:
+            logname = os.path.join(tempdir, 'test.log')
+
+            with open(logname, 'wb') as logfile:
+                logfile.write(TEST_LOG)
+
+            self.assertEqual(list(parse_datetime_file(logname, errors='skip')), TEST_RESULTS)
+
+            emptyname = os.path.join(tempdir, 'empty.log')
+
+            open(emptyname, 'wb').close()
+
+            self.assertEqual(list(parse_datetime_file(emptyname)), [])
+        finally:
+            shutil.rmtree(tempdir)
@@ -327,6 +327,75 @@ class TestTimeParserFunctions(unittest.TestCase):
         self.assertEqual(tzinfoobject.utcoffset(None), -datetime.timedelta(hours=12, minutes=34))
         self.assertEqual(tzinfoobject.tzname(None), '-12:34')
 
+    def test_parse_datetime_output(self):
+        epoch = datetime.datetime(1970, 1, 1)
+
+        for testdatetime in ['1981-04-05T23:21:28.512400Z', '1981-04-05T23:21:28.5-01:30', '1981-04-05T24:00:00+01',
+                             '1970-01-01T00:00:00Z', '1969-12-31T23:59:59.999999', '0001-01-01T00:00:00+12',
+                             '9999-12-31T23:59:59.999999-12:00', '2004-W53-6T23:21', '1981095T23:21:28.5+0530',
+                             '1981-04-05T23:21:28+49:27']:
+            result = parse_datetime(testdatetime)
+
+            if result.tzinfo is None:
+                offset = None
+                delta = result - epoch
+            else:
+                #UTCOffset doesn't range check its offset, unlike utcoffset
+                utcoffset = result.tzinfo.utcoffset(None)
+                offset = utcoffset.days * 86400 + utcoffset.seconds
+                delta = result.replace(tzinfo=None) - epoch - utcoffset
+
+            self.assertEqual(parse_datetime(testdatetime, output='tuple'),
+                             (result.year, result.month, result.day, result.hour, result.minute, result.second, result.microsecond, offset))
+            self.assertEqual(parse_datetime(testdatetime, output='epoch_us'),
+                             (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+            self.assertEqual(parse_datetime(testdatetime.encode('ascii'), output='epoch_us'), parse_datetime(testdatetime, output='epoch_us'))
+
+        self.assertEqual(parse_datetime('1981-04-05 23:21:28Z', delimiter=' ', output='tuple'), (1981, 4, 5, 23, 21, 28, 0, 0))
+
+        for testdatetime in ['1981-04-05T23:21:60', '1981-04-05T23:21:28-00:00', '1981-04-31T23:21:28', '1981-04-05']:
+            with self.assertRaises(ValueError):
+                parse_datetime(testdatetime, output='tuple')
+
+            with self.assertRaises(ValueError):
+                parse_datetime(testdatetime, output='epoch_us')
+
+        #The time isn't built, but is range checked as it would be
+        for testdatetime in ['1981-04-05T25:21:28', '1981-04-05T23:60:28', '1981-04-05T25:21', '1981-04-05T25']:
+            with self.assertRaises(ValueError) as e:
+                parse_datetime(testdatetime)
+
+            for output in ('tuple', 'epoch_us'):
+                with self.assertRaises(ValueError) as outpute:
+                    parse_datetime(testdatetime, output=output)
+
+                self.assertEqual(str(outpute.exception), str(e.exception))
+
+        with self.assertRaises(ValueError):
+            parse_datetime('1981-04-05T23:21:28', output='date')
+
+    def test_parse_bytes(self):
+        for testtime in ['01:23:45', '23:21:28.512400', '14:43:58.9999997', '01:23.4567', '0123', '12.5', '01:23:45Z',
+                         '01:23:45-12:34', '232128.512400+00:00']:
+            for testbytes in (testtime.encode('ascii'), bytearray(testtime.encode('ascii')), memoryview(testtime.encode('ascii'))):
+                result = parse_time(testbytes)
+
+                self.assertEqual(result, parse_time(testtime))
+                self.assertEqual(result.tzinfo, parse_time(testtime).tzinfo)
+                self.assertEqual(get_time_resolution(testbytes), get_time_resolution(testtime))
+
+        for testdatetime in ['1981-04-05T23:21:28.512400Z', '1981-04-05T23:21:28-12:34', '2004-W53-6T23:21']:
+            for testbytes in (testdatetime.encode('ascii'), bytearray(testdatetime.encode('ascii')), memoryview(testdatetime.encode('ascii'))):
+                self.assertEqual(parse_datetime(testbytes), parse_datetime(testdatetime))
+
+        self.assertEqual(parse_datetime(b'1981-04-05 23:21:28Z', delimiter=b' '), parse_datetime('1981-04-05 23:21:28Z', delimiter=' '))
+
+        with self.assertRaises(ValueError):
+            parse_time(b'01:23:60')
+
+        with self.assertRaises(ValueError):
+            parse_datetime(b'1981-04-05T23:21:28-00:00')
+
     def test_parse_time_naive(self):
         time = _parse_time_naive('01:23:45')
         self.assertEqual(time.hour, 1)
@@ -516,10 +585,11 @@ class TestTimeParserFunctions(unittest.TestCase):
             _parse_second_time('00:61:00')
 
     def test_build_time(self):
-        self.assertEqual(_build_time(datetime.time(hour=1), datetime.timedelta(hours=1.1, minutes=2.2, seconds=3.3)), datetime.time(hour=2, minute=8, second=15, microsecond=300000))
+        self.assertEqual(_build_time(1, 0, 0, 4095300000), datetime.time(hour=2, minute=8, second=15, microsecond=300000))
 
         #Make sure it overflows correctly
-        self.assertEqual(_build_time(datetime.time.max, datetime.timedelta(microseconds=1)), datetime.time.min)
+        self.assertEqual(_build_time(23, 59, 59, 1000000), datetime.time.min)
+        self.assertEqual(_build_time(23, 60, 0, 0), datetime.time.min)
 
     def test_split_tz(self):
         self.assertEqual(_split_tz('01:23:45'), ('01:23:45', None))
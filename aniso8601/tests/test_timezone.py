@@ -10,7 +10,7 @@ import unittest
 import datetime
 import pickle
 
-from aniso8601.timezone import parse_timezone, build_utcoffset
+from aniso8601.timezone import parse_timezone, build_utcoffset, utcoffset_cache_info, clear_utcoffset_cache, UTCOffset, UTCOFFSET_CACHE_MAXSIZE
 
 class TestTimezoneParserFunctions(unittest.TestCase):
     def test_parse_timezone(self):
@@ -93,6 +93,28 @@ class TestTimezoneParserFunctions(unittest.TestCase):
         with self.assertRaises(ValueError):
             parse_timezone('-00')
 
+    def test_parse_timezone_messages(self):
+        #The fields are read as int() would read them, so its message is
+        #raised for those it can't
+        for testtimezone, message in (('+0a:00', 'invalid literal for int() with base 10: \'0a\''),
+                                      ('+01:0b', 'invalid literal for int() with base 10: \'0b\''),
+                                      ('-0x00', 'invalid literal for int() with base 10: \'0x\''),
+                                      ('+ab', 'invalid literal for int() with base 10: \'ab\''),
+                                      ('+1', 'String is not a valid ISO 8601 time offset.'),
+                                      ('-00:00', 'Negative ISO 8601 time offset cannot be 0.')):
+            with self.assertRaises(ValueError) as e:
+                parse_timezone(testtimezone)
+
+            self.assertEqual(str(e.exception), message)
+
+    def test_parse_timezone_bytes(self):
+        for testtimezone in ['+00:00', '-01:00', '+0530', '-12']:
+            for testbytes in (testtimezone.encode('ascii'), bytearray(testtimezone.encode('ascii')), memoryview(testtimezone.encode('ascii'))):
+                self.assertIs(parse_timezone(testbytes), parse_timezone(testtimezone))
+
+        with self.assertRaises(ValueError):
+            parse_timezone(b'-00:00')
+
     def test_pickle(self):
         #Make sure timezone objects are pickleable
         testutcoffset = build_utcoffset('UTC', datetime.timedelta(0))
@@ -104,6 +126,104 @@ class TestTimezoneParserFunctions(unittest.TestCase):
         self.assertEqual(resultutcoffset._name, testutcoffset._name)
         self.assertEqual(resultutcoffset._utcdelta, testutcoffset._utcdelta)
 
+    def test_pickle_interned(self):
+        #Unpickled offsets are the interned instance
+        testutcoffset = parse_timezone('+05:30')
+
+        resultutcoffset = pickle.loads(pickle.dumps(testutcoffset))
+
+        self.assertIs(resultutcoffset, testutcoffset)
+
+        resultdatetime = pickle.loads(pickle.dumps(datetime.datetime(1981, 4, 5, tzinfo=testutcoffset)))
+
+        self.assertIs(resultdatetime.tzinfo, testutcoffset)
+
+    def test_immutable(self):
+        tzinfoobject = parse_timezone('+01:00')
+
+        with self.assertRaises(AttributeError):
+            tzinfoobject._name = '+02:00'
+
+        with self.assertRaises(AttributeError):
+            tzinfoobject._utcdelta = datetime.timedelta(hours=2)
+
+        with self.assertRaises(AttributeError):
+            del tzinfoobject._name
+
+        with self.assertRaises(AttributeError):
+            tzinfoobject.other = None
+
+    def test_equality(self):
+        self.assertEqual(UTCOffset('+01:00', datetime.timedelta(hours=1)), UTCOffset('+01:00', datetime.timedelta(hours=1)))
+        self.assertEqual(hash(UTCOffset('+01:00', datetime.timedelta(hours=1))), hash(UTCOffset('+01:00', datetime.timedelta(hours=1))))
+
+        self.assertNotEqual(UTCOffset('+01:00', datetime.timedelta(hours=1)), UTCOffset('+0100', datetime.timedelta(hours=1)))
+        self.assertNotEqual(UTCOffset('+01:00', datetime.timedelta(hours=1)), UTCOffset('+01:00', datetime.timedelta(hours=2)))
+        self.assertNotEqual(UTCOffset('+01:00', datetime.timedelta(hours=1)), None)
+
+    def test_cache(self):
+        clear_utcoffset_cache()
+
+        self.assertEqual(utcoffset_cache_info(), (0, 0, UTCOFFSET_CACHE_MAXSIZE, 0))
+
+        tzinfoobject = parse_timezone('+01:00')
+
+        self.assertEqual(utcoffset_cache_info().hits, 0)
+        self.assertEqual(utcoffset_cache_info().misses, 1)
+
+        self.assertIs(parse_timezone('+01:00'), tzinfoobject)
+        self.assertIs(build_utcoffset('+01:00', datetime.timedelta(hours=1)), tzinfoobject)
+
+        self.assertEqual(utcoffset_cache_info().hits, 2)
+        self.assertEqual(utcoffset_cache_info().misses, 1)
+
+        #Same offset, different name, interned separately
+        self.assertIsNot(parse_timezone('+0100'), tzinfoobject)
+
+        self.assertEqual(utcoffset_cache_info().misses, 2)
+
+        #Each offset takes one entry, whether it was parsed or built
+        self.assertEqual(utcoffset_cache_info().currsize, 2)
+
+        clear_utcoffset_cache()
+
+        self.assertEqual(utcoffset_cache_info(), (0, 0, UTCOFFSET_CACHE_MAXSIZE, 0))
+
+    def test_cache_invalid(self):
+        #Invalid offsets must not be cached
+        clear_utcoffset_cache()
+
+        with self.assertRaises(ValueError):
+            parse_timezone('-00:00')
+
+        with self.assertRaises(ValueError):
+            parse_timezone('-00:00')
+
+        self.assertEqual(utcoffset_cache_info().currsize, 0)
+
+    def test_cache_bounded(self):
+        clear_utcoffset_cache()
+
+        for offsetminutes in range(UTCOFFSET_CACHE_MAXSIZE + 1):
+            build_utcoffset(str(offsetminutes), datetime.timedelta(minutes=offsetminutes))
+
+        self.assertEqual(utcoffset_cache_info().currsize, UTCOFFSET_CACHE_MAXSIZE)
+
+        clear_utcoffset_cache()
+
+        #Parsed offsets fill the cache as built ones do, those that don't
+        #fit are still parsed, and aren't found by their string
+        tzstrs = ['{0}{1:02d}{2:02d}'.format(sign, hours, minutes) for sign in '+-' for hours in range(24) for minutes in range(1, 60)]
+
+        for tzstr in tzstrs[:UTCOFFSET_CACHE_MAXSIZE + 1]:
+            parse_timezone(tzstr)
+
+        self.assertEqual(utcoffset_cache_info().currsize, UTCOFFSET_CACHE_MAXSIZE)
+        self.assertIs(parse_timezone(tzstrs[0]), parse_timezone(tzstrs[0]))
+        self.assertIsNot(parse_timezone(tzstrs[UTCOFFSET_CACHE_MAXSIZE]), parse_timezone(tzstrs[UTCOFFSET_CACHE_MAXSIZE]))
+
+        clear_utcoffset_cache()
+
     def test_string_representation(self):
         #Make sure UTC offsets can be printed out prettily
         tzinfoobject = parse_timezone('+00:00')
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+import unittest
+import datetime
+
+from aniso8601.date import parse_date
+from aniso8601.duration import parse_duration
+from aniso8601.error import ErrorCode
+from aniso8601.interval import parse_interval
+from aniso8601.time import parse_time, parse_datetime
+from aniso8601.timezone import parse_timezone
+from aniso8601.tryparse import ParseResult, try_parse_date, try_parse_time, try_parse_datetime, try_parse_timezone, \
+     try_parse_duration, try_parse_interval
+
+class TestTryParseFunctions(unittest.TestCase):
+    def test_try_parse_date(self):
+        self.assertEqual(try_parse_date('1981-04-05'), ParseResult(datetime.date(1981, 4, 5), None, None))
+        self.assertEqual(try_parse_date('2009W011'), ParseResult(datetime.date(2008, 12, 29), None, None))
+        self.assertEqual(try_parse_date(b'1981-095').value, datetime.date(1981, 4, 5))
+
+        self.assertEqual(try_parse_date('2009-W00-1'), ParseResult(None, ErrorCode.WeekZero, 6))
+        self.assertEqual(try_parse_date('1981-13-05'), ParseResult(None, ErrorCode.MonthOutOfRange, 5))
+        self.assertEqual(try_parse_date('9999-W53'), ParseResult(None, ErrorCode.DateOutOfRange, 0))
+        self.assertEqual(try_parse_date('+01981-04-05'), ParseResult(None, ErrorCode.ExtendedYear, 0))
+        self.assertEqual(try_parse_date(19810405), ParseResult(None, ErrorCode.NotString, 0))
+
+    def test_try_parse_time(self):
+        result = try_parse_time('23:21:28.512400+01:00')
+
+        self.assertEqual(result.value, datetime.time(23, 21, 28, 512400, tzinfo=parse_timezone('+01:00')))
+        self.assertIsNone(result.error)
+        self.assertIsNone(result.position)
+
+        self.assertEqual(try_parse_time('24:00').value, datetime.time(0, 0))
+        self.assertEqual(try_parse_time('12.5').value, datetime.time(12, 30))
+
+        self.assertEqual(try_parse_time('25:21:28'), ParseResult(None, ErrorCode.HourOutOfRange, 0))
+        self.assertEqual(try_parse_time('23:21:28-00:00'), ParseResult(None, ErrorCode.NegativeZeroOffset, 8))
+        self.assertEqual(try_parse_time('23:2x'), ParseResult(None, ErrorCode.InvalidTime, 4))
+
+    def test_try_parse_datetime(self):
+        self.assertEqual(try_parse_datetime('1981-04-05T23:21:28Z').value, parse_datetime('1981-04-05T23:21:28Z'))
+        self.assertEqual(try_parse_datetime('1981-04-05 23:21:28', delimiter=' ').value, datetime.datetime(1981, 4, 5, 23, 21, 28))
+
+        self.assertEqual(try_parse_datetime('1981-04-05 23:21:28'), ParseResult(None, ErrorCode.InvalidDatetime, 19))
+        self.assertEqual(try_parse_datetime('1981-04-31T23:21:28'), ParseResult(None, ErrorCode.DayOutOfRange, 8))
+
+    def test_try_parse_timezone(self):
+        self.assertEqual(try_parse_timezone('-05:30').value.utcoffset(None), -datetime.timedelta(hours=5, minutes=30))
+        self.assertIs(try_parse_timezone('+0100').value, parse_timezone('+0100'))
+
+        self.assertEqual(try_parse_timezone('-00'), ParseResult(None, ErrorCode.NegativeZeroOffset, 0))
+        self.assertEqual(try_parse_timezone('+1'), ParseResult(None, ErrorCode.InvalidTimezone, 0))
+        self.assertEqual(try_parse_timezone('Z'), ParseResult(None, ErrorCode.InvalidTimezone, 0))
+
+    def test_try_parse_duration(self):
+        self.assertEqual(try_parse_duration('P1Y2M3DT4H54M6.5S').value, parse_duration('P1Y2M3DT4H54M6.5S'))
+        self.assertEqual(try_parse_duration('P1W').value, datetime.timedelta(weeks=1))
+        self.assertEqual(try_parse_duration('P0003-06-04T12:30:05').value, parse_duration('P0003-06-04T12:30:05'))
+        self.assertEqual(try_parse_duration('P1Y2M', relative=True).value, parse_duration('P1Y2M', relative=True))
+
+        self.assertEqual(try_parse_duration('1Y'), ParseResult(None, ErrorCode.DurationPrefix, 0))
+        self.assertEqual(try_parse_duration('P1D1Y'), ParseResult(None, ErrorCode.DurationOrder, 4))
+        self.assertEqual(try_parse_duration('PT1H2D'), ParseResult(None, ErrorCode.DurationDateInTime, 5))
+        self.assertEqual(try_parse_duration('P1.5Y', relative=True), ParseResult(None, ErrorCode.DurationRelativeFraction, 0))
+
+    def test_try_parse_interval(self):
+        self.assertEqual(try_parse_interval('1981-04-05/P1M1D').value, parse_interval('1981-04-05/P1M1D'))
+        self.assertEqual(try_parse_interval('P1D/1981-04-05T01:01:00').value, parse_interval('P1D/1981-04-05T01:01:00'))
+        self.assertEqual(try_parse_interval(b'1981-04-05--1981-04-06', intervaldelimiter=b'--').value,
+                         (datetime.date(1981, 4, 5), datetime.date(1981, 4, 6)))
+
+        self.assertEqual(try_parse_interval('1981-04-05'), ParseResult(None, ErrorCode.InvalidInterval, 10))
+        self.assertEqual(try_parse_interval('9999-12-31/P1D'), ParseResult(None, ErrorCode.IntervalOutOfRange, 11))
+        self.assertEqual(try_parse_interval('1981-04-05T01:01:00Z/1981-04-05T01:02:00'), ParseResult(None, ErrorCode.IntervalTimezone, 21))
+
+    def test_try_parse_parity(self):
+        #The value is what the parser returns, and there is an error exactly
+        #when the parser raises
+        cases = ((try_parse_date, parse_date, ['1981-04-05', '1981-02-29', '1984-02-29', '1981-366', '1981-000', '2009-W53-7',
+                                               '2009W000', '0000-01-01', '9999-W52-6', '19', '1981-04-05T', '']),
+                 (try_parse_time, parse_time, ['24:00:00', '24:00:01', '14:43:59.9999995', '14:43:59.9999994', '01:60',
+                                               '01:23:45+49:27', '01:23:45.', '012345.5', '01:23.4567', '']),
+                 (try_parse_datetime, parse_datetime, ['1981-04-05T24:00:00', '2004-W53-6T23:21:28-0530', '1981W536T23',
+                                                       '1981-04-05TT23:21:28', '1981-04-05T']),
+                 (try_parse_duration, parse_duration, ['P1Y2M3DT4H5M6S', 'P', 'PT', 'P1,5W', 'P-1D', 'P0003-06-04T12:30:05.5',
+                                                       'P0003-13-04T12:30:05']),
+                 (try_parse_interval, parse_interval, ['/P1D', '1981-04-05/', 'P1D/P1D', 'P1D/9999-12-31T23:00:00',
+                                                       '1981-04-05T01:01:00+01:00/1981-04-05T01:02:00+0100']))
+
+        for tryparse, parse, testtuples in cases:
+            for testtuple in testtuples:
+                try:
+                    expected = parse(testtuple)
+                except (ValueError, NotImplementedError, OverflowError, TypeError, IndexError):
+                    expected = None
+
+                result = tryparse(testtuple)
+
+                self.assertEqual(result.value, expected, testtuple)
+                self.assertEqual(result.error is None, expected is not None, testtuple)
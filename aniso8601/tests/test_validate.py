@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+import unittest
+
+from aniso8601.date import parse_date
+from aniso8601.duration import parse_duration
+from aniso8601.error import ErrorCode
+from aniso8601.interval import parse_interval
+from aniso8601.time import parse_time, parse_datetime
+from aniso8601.validate import validate_date, validate_time, validate_datetime, validate_duration, validate_interval
+
+class TestValidateFunctions(unittest.TestCase):
+    def test_validate_date(self):
+        self.assertTrue(validate_date('1981-04-05'))
+        self.assertTrue(validate_date('19810405'))
+        self.assertTrue(validate_date('2004-W53-6'))
+        self.assertTrue(validate_date('1981-095'))
+        self.assertTrue(validate_date('19'))
+        self.assertIsNone(validate_date('1981-04-05', detail=True))
+
+        self.assertFalse(validate_date('1981-04-31'))
+        self.assertFalse(validate_date('1981-4-05'))
+
+        self.assertEqual(validate_date('1981-13-05', detail=True), (ErrorCode.MonthOutOfRange, 5))
+        self.assertEqual(validate_date('1981-04-31', detail=True), (ErrorCode.DayOutOfRange, 8))
+        self.assertEqual(validate_date('2009-W00-1', detail=True), (ErrorCode.WeekZero, 6))
+        self.assertEqual(validate_date('0000-W01', detail=True), (ErrorCode.YearOutOfRange, 0))
+        self.assertEqual(validate_date('9999-W53', detail=True), (ErrorCode.DateOutOfRange, 0))
+        self.assertEqual(validate_date('1981-4-05', detail=True), (ErrorCode.InvalidDate, 6))
+        self.assertEqual(validate_date('2009-W1-1', detail=True), (ErrorCode.InvalidWeekDate, 7))
+        self.assertEqual(validate_date('+01981-04-05', detail=True), (ErrorCode.ExtendedYear, 0))
+
+    def test_validate_time(self):
+        self.assertTrue(validate_time('23:21:28.512400'))
+        self.assertTrue(validate_time('232128'))
+        self.assertTrue(validate_time('24:00'))
+        self.assertTrue(validate_time('14:43:59.9999994+01:00'))
+        self.assertIsNone(validate_time('01:23:45Z', detail=True))
+
+        self.assertFalse(validate_time('25:21:28'))
+
+        self.assertEqual(validate_time('25:21:28', detail=True), (ErrorCode.HourOutOfRange, 0))
+        self.assertEqual(validate_time('23:61:28', detail=True), (ErrorCode.MinuteOutOfRange, 3))
+        self.assertEqual(validate_time('23:21:61', detail=True), (ErrorCode.SecondOutOfRange, 6))
+        self.assertEqual(validate_time('23:2x', detail=True), (ErrorCode.InvalidTime, 4))
+        self.assertEqual(validate_time('23:21:28+1', detail=True), (ErrorCode.InvalidTimezone, 8))
+        self.assertEqual(validate_time('23:21:28+01:0b', detail=True), (ErrorCode.TimezoneNotInteger, 12))
+        self.assertEqual(validate_time('23:21:28-00:00', detail=True), (ErrorCode.NegativeZeroOffset, 8))
+
+    def test_validate_datetime(self):
+        self.assertTrue(validate_datetime('1981-04-05T23:21:28.512400Z'))
+        self.assertTrue(validate_datetime('1981-04-05 23:21:28', delimiter=' '))
+        self.assertTrue(validate_datetime('9999-12-31T24:00:00'))
+
+        self.assertFalse(validate_datetime('1981-04-05 23:21:28'))
+
+        self.assertEqual(validate_datetime('1981-04-05 23:21:28', detail=True), (ErrorCode.InvalidDatetime, 19))
+        self.assertEqual(validate_datetime('1981-04-05T23:21:28T', detail=True), (ErrorCode.InvalidDatetime, 19))
+        self.assertEqual(validate_datetime('1981-04-31T23:21:28', detail=True), (ErrorCode.DayOutOfRange, 8))
+        self.assertEqual(validate_datetime('1981-04-05T23:21:28-00', detail=True), (ErrorCode.NegativeZeroOffset, 19))
+
+    def test_validate_duration(self):
+        self.assertTrue(validate_duration('P1Y2M3DT4H5M6S'))
+        self.assertTrue(validate_duration('P1,5Y'))
+        self.assertTrue(validate_duration('P0003-06-04T12:30:05'))
+        self.assertTrue(validate_duration('P1Y2M', relative=True))
+
+        self.assertEqual(validate_duration('1Y', detail=True), (ErrorCode.DurationPrefix, 0))
+        self.assertEqual(validate_duration('P1Y2X', detail=True), (ErrorCode.DurationEnd, 4))
+        self.assertEqual(validate_duration('P1.5Y2M', detail=True), (ErrorCode.DurationFractionEnd, 6))
+        self.assertEqual(validate_duration('P1W1D', detail=True), (ErrorCode.DurationWeek, 4))
+        self.assertEqual(validate_duration('P1H', detail=True), (ErrorCode.DurationTimeWithoutDesignator, 2))
+        self.assertEqual(validate_duration('PT1H2D', detail=True), (ErrorCode.DurationDateInTime, 5))
+        self.assertEqual(validate_duration('P1D1Y', detail=True), (ErrorCode.DurationOrder, 4))
+        self.assertEqual(validate_duration('P1000000000D', detail=True), (ErrorCode.DurationOutOfRange, 0))
+        self.assertEqual(validate_duration('P1.5Y', relative=True, detail=True), (ErrorCode.DurationRelativeFraction, 0))
+
+    def test_validate_interval(self):
+        self.assertTrue(validate_interval('1981-04-05T01:01:00/1981-04-05T01:02:00'))
+        self.assertTrue(validate_interval('1981-04-05/P1M1D'))
+        self.assertTrue(validate_interval('P1M1D/1981-04-05T01:01:00Z'))
+        self.assertTrue(validate_interval('1981-04-05T01:01:00Z--P1D', intervaldelimiter='--'))
+        self.assertTrue(validate_interval('1981-01-31/P1M', relative=True))
+
+        self.assertEqual(validate_interval('1981-04-05', detail=True), (ErrorCode.InvalidInterval, 10))
+        self.assertEqual(validate_interval('1981-04-05/1981-13-05', detail=True), (ErrorCode.MonthOutOfRange, 16))
+        self.assertEqual(validate_interval('1981-04-05/P1D1Y', detail=True), (ErrorCode.DurationOrder, 15))
+        self.assertEqual(validate_interval('1981-04-05T01:01:00Z/1981-04-05T01:02:00', detail=True), (ErrorCode.IntervalTimezone, 21))
+        self.assertEqual(validate_interval('9999-12-31/P1D', detail=True), (ErrorCode.IntervalOutOfRange, 11))
+        self.assertEqual(validate_interval('P1M/0001-01-15', relative=True, detail=True), (ErrorCode.IntervalOutOfRange, 0))
+
+    def test_validate_bytes(self):
+        self.assertTrue(validate_date(b'1981-04-05'))
+        self.assertTrue(validate_time(bytearray(b'23:21:28')))
+        self.assertTrue(validate_datetime(memoryview(b'1981-04-05T23:21:28Z')))
+        self.assertTrue(validate_datetime(b'1981-04-05 23:21:28', delimiter=b' '))
+        self.assertTrue(validate_duration(b'P1D'))
+        self.assertTrue(validate_interval(b'1981-04-05/P1D'))
+
+        self.assertEqual(validate_date(bytearray(b'1981-04-31'), detail=True), (ErrorCode.DayOutOfRange, 8))
+        self.assertEqual(validate_date(b'\xff1981', detail=True), (ErrorCode.InvalidEncoding, 0))
+
+    def test_validate_nonstring(self):
+        self.assertFalse(validate_date(19810405))
+        self.assertEqual(validate_time(None, detail=True), (ErrorCode.NotString, 0))
+        self.assertEqual(validate_duration(['P1D'], detail=True), (ErrorCode.NotString, 0))
+
+    def test_validate_parity(self):
+        #A string is valid exactly when the parser doesn't raise
+        cases = ((validate_date, parse_date, ['1981-04-05', '1981-02-29', '1984-02-29', '1981-366', '1981-000', '2009-W53-7',
+                                              '2009W000', '0000-01-01', '9999-W52-6', '1981-04-05T', '1', '', u'١٩٨١-04-05']),
+                 (validate_time, parse_time, ['24:00:00', '24:00:01', '14:43:59.9999995', '01:60', '01:23:45+49:27',
+                                              '01:23:45+12:3', '01:23:45.', '1:23:45', '012345.5', '']),
+                 (validate_datetime, parse_datetime, ['1981-04-05T24:00:00', '2004-W53-6T23:21:28-0530', '1981W536T23',
+                                                      '1981-04-05TT23:21:28', 'T23:21:28', '1981-04-05T']),
+                 (validate_duration, parse_duration, ['P1Y2M3DT4H5M6S', 'P', 'PT', 'P1YT', 'P0003-06-04T12:30:05.5',
+                                                      'P0003-13-04T12:30:05', 'P1.5W', 'P-1D', 'P1e3D', 'PinfD']),
+                 (validate_interval, parse_interval, ['/P1D', '1981-04-05/', 'P1D/P1D', 'P1D/9999-12-31T23:00:00',
+                                                      '0001-01-01/P-1D', '1981-04-05T01:01:00+01:00/1981-04-05T01:02:00+0100',
+                                                      '1981-04-05T01:01:00+25:00/1981-04-05T01:02:00+0100']))
+
+        for validate, parse, testtuples in cases:
+            for testtuple in testtuples:
+                try:
+                    parse(testtuple)
+                    expected = True
+                except (ValueError, NotImplementedError, OverflowError, TypeError, IndexError):
+                    expected = False
+
+                self.assertEqual(validate(testtuple), expected, testtuple)
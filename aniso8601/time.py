@@ -8,10 +8,15 @@
 
 import datetime
 
+from aniso8601 import compat, speedups
+from aniso8601.error import ErrorCode, build_exception
 from aniso8601.timezone import parse_timezone, build_utcoffset
 from aniso8601.date import parse_date
 from aniso8601.resolution import TimeResolution
 
+#The proleptic Gregorian ordinal of the Unix epoch, for output='epoch_us'
+_EPOCH_ORDINAL = 719163
+
 def get_time_resolution(isotimestr):
     #Valid time formats are:
     #
@@ -41,8 +46,19 @@ def get_time_resolution(isotimestr):
     #hhmm±hh
     #hh±hh
 
-    timestr = _split_tz(isotimestr)[0]
+    if isinstance(isotimestr, compat.str_types) is False:
+        isotimestr = compat.decode(isotimestr)
+
+    resolution = _time_resolution(_split_tz(isotimestr)[0])
+
+    if resolution is None:
+        raise build_exception(ErrorCode.InvalidTime)
 
+    return resolution
+
+def _time_resolution(timestr):
+    #Returns the TimeResolution of timestr, a time without a UTC offset, or
+    #None if it has none, without raising
     if timestr.count(':') == 2:
         #hh:mm:ss
         return TimeResolution.Seconds
@@ -67,8 +83,8 @@ def get_time_resolution(isotimestr):
     elif timestrlen == 2:
         #hh
         return TimeResolution.Hours
-    else:
-        raise ValueError('String is not a valid ISO 8601 time.')
+
+    return None
 
 def parse_time(isotimestr):
     #Given a string in any ISO 8601 time format, return a datetime.time object
@@ -100,22 +116,56 @@ def parse_time(isotimestr):
     #hh:mm±hh
     #hhmm±hh
     #hh±hh
+    if speedups.compiled is not None:
+        result = speedups.compiled.parse_time(isotimestr, _parse_tzinfo)
+
+        if result is not None:
+            return result
+
+    if isinstance(isotimestr, compat.str_types) is False:
+        isotimestr = compat.decode(isotimestr)
 
     (timestr, tzstr) = _split_tz(isotimestr)
 
     if tzstr is None:
         return _parse_time_naive(timestr)
-    elif tzstr == 'Z':
-        return _parse_time_naive(timestr).replace(tzinfo=build_utcoffset('UTC', datetime.timedelta(hours=0)))
     else:
-        return _parse_time_naive(timestr).replace(tzinfo=parse_timezone(tzstr))
+        return _parse_time_naive(timestr).replace(tzinfo=_parse_tzinfo(tzstr))
 
-def parse_datetime(isodatetimestr, delimiter='T'):
+def parse_datetime(isodatetimestr, delimiter='T', output='datetime'):
     #Given a string in ISO 8601 date time format, return a datetime.datetime
     #object that corresponds to the given date time.
     #By default, the ISO 8601 specified T delimiter is used to split the
     #date and time (<date>T<time>). Fixed offset tzdata will be included
     #if UTC offset is given in the input string.
+    #
+    #As with parse_date, the string may also be bytes-like
+    #
+    #The output argument determines what is returned:
+    #
+    #'datetime' - A datetime.datetime, this is the default
+    #'tuple' - A tuple of the year, month, day, hour, minute, second and
+    #          microsecond, and the UTC offset in seconds, None if no
+    #          offset was given
+    #'epoch_us' - The integer number of microseconds since the Unix epoch,
+    #             date times without a UTC offset are taken to be UTC
+    #
+    #The compiled parsers, if built, build the tuple or integer directly
+    #from the fields, without building any intermediate objects
+    if output != 'datetime':
+        return _parse_datetime_output(isodatetimestr, delimiter, output)
+
+    if speedups.compiled is not None:
+        result = speedups.compiled.parse_datetime(isodatetimestr, delimiter, _parse_tzinfo)
+
+        if result is not None:
+            return result
+
+    if isinstance(isodatetimestr, compat.str_types) is False:
+        isodatetimestr = compat.decode(isodatetimestr)
+
+    if isinstance(delimiter, compat.str_types) is False:
+        delimiter = compat.decode(delimiter)
 
     isodatestr, isotimestr = isodatetimestr.split(delimiter)
 
@@ -124,6 +174,64 @@ def parse_datetime(isodatetimestr, delimiter='T'):
 
     return datetime.datetime.combine(datepart, timepart)
 
+def _parse_datetime_output(isodatetimestr, delimiter, output):
+    if output == 'tuple':
+        if speedups.compiled is not None:
+            result = speedups.compiled.parse_datetime_tuple(isodatetimestr, delimiter)
+
+            if result is not None:
+                return result
+
+        datepart, hour, minute, second, microsecond, offset = _parse_datetime_fields(isodatetimestr, delimiter)
+
+        return (datepart.year, datepart.month, datepart.day, hour, minute, second, microsecond, offset)
+    elif output == 'epoch_us':
+        if speedups.compiled is not None:
+            result = speedups.compiled.parse_datetime_epoch(isodatetimestr, delimiter)
+
+            if result is not None:
+                return result
+
+        datepart, hour, minute, second, microsecond, offset = _parse_datetime_fields(isodatetimestr, delimiter)
+
+        return ((datepart.toordinal() - _EPOCH_ORDINAL) * 86400 + hour * 3600 + minute * 60 + second - (offset or 0)) * 1000000 + \
+               microsecond
+    else:
+        raise ValueError('output must be one of \'datetime\', \'tuple\' or \'epoch_us\'.')
+
+def _parse_datetime_fields(isodatetimestr, delimiter):
+    #Returns a tuple of the date, the hour, minute, second and microsecond,
+    #and the UTC offset in seconds, None if there is none, of the date time,
+    #parsed as parse_datetime does, without building a time or datetime,
+    #the date builders range check the date
+    if isinstance(isodatetimestr, compat.str_types) is False:
+        isodatetimestr = compat.decode(isodatetimestr)
+
+    if isinstance(delimiter, compat.str_types) is False:
+        delimiter = compat.decode(delimiter)
+
+    isodatestr, isotimestr = isodatetimestr.split(delimiter)
+
+    datepart = parse_date(isodatestr)
+
+    (timestr, tzstr) = _split_tz(isotimestr)
+
+    resolution = get_time_resolution(timestr)
+    hour, minute, second, microsecond = _fields_map[resolution](*_check_fields(_split_map[resolution](timestr)))
+
+    return (datepart, hour, minute, second, microsecond, _offset_seconds(_parse_tzinfo(tzstr)))
+
+def _offset_seconds(tzinfo):
+    #The seconds east of UTC of the UTC offset, None if there is none, the
+    #offset is taken from the tzinfo, since datetime.utcoffset would range
+    #check it
+    if tzinfo is None:
+        return None
+
+    utcoffset = tzinfo.utcoffset(None)
+
+    return utcoffset.days * 86400 + utcoffset.seconds
+
 def _parse_time_naive(timestr):
     #timestr is of the format hh:mm:ss, hh:mm, hhmmss, hhmm, hh
     #
@@ -135,66 +243,118 @@ def _parse_time_naive(timestr):
     #No tzinfo will be included
     return _resolution_map[get_time_resolution(timestr)](timestr)
 
+def _classify_time(timestr):
+    #Given timestr, a time without a UTC offset, returns a tuple of its
+    #TimeResolution, and the fields the builder for the resolution takes,
+    #without range checking them, or None if it isn't laid out as a time,
+    #without raising, the validators share it
+    resolution = _time_resolution(timestr)
+
+    if resolution is None:
+        return None
+
+    fields = _split_map[resolution](timestr)
+
+    if fields is None:
+        return None
+
+    return (resolution, fields)
+
 def _parse_hour(timestr):
     #Format must be hh or hh.
-    isohour = float(timestr)
+    return _build_hour_time(*_check_fields(_split_decimal(timestr)))
 
-    if isohour == 24:
-        return datetime.time(hour=0, minute=0)
+def _build_hour_time(isohour, fractionstr):
+    #fractionstr is the digits of the decimal fraction of the hour, if any
+    return datetime.time(*_hour_time_fields(isohour, fractionstr))
 
-    #Since the time constructor doesn't handle fractional hours, we put
-    #the hours in to a timedelta, and add it to the time before returning
-    hoursdelta = datetime.timedelta(hours=isohour)
+def _hour_time_fields(isohour, fractionstr):
+    #The _*_fields functions return a tuple of the hour, minute, second and
+    #microsecond their _build_* function builds a time from
+    if isohour == 24 and _fraction_is_zero(fractionstr) is True:
+        return (0, 0, 0, 0)
 
-    return _build_time(datetime.time(hour=0), hoursdelta)
+    if isohour > 24:
+        raise ValueError('ISO 8601 hour element cannot be greater than 24.')
+
+    #Since the time constructor doesn't handle fractional hours, the
+    #fraction is converted to microseconds and carried up
+    return _time_fields(isohour, 0, 0, _fraction_to_microseconds(fractionstr, 3600000000))
 
 def _parse_minute_time(timestr):
     #Format must be hhmm, hhmm., hh:mm or hh:mm.
+    return _build_minute_time(*_check_fields(_split_minute_time(timestr)))
+
+def _split_minute_time(timestr):
     if timestr.count(':') == 1:
         #hh:mm or hh:mm.
-        timestrarray = timestr.split(':')
-
-        isohour = int(timestrarray[0])
-        isominute = float(timestrarray[1])  #Minute may now be a fraction
+        hourstr, minutestr = timestr.split(':')
     else:
         #hhmm or hhmm.
-        isohour = int(timestr[0:2])
-        isominute = float(timestr[2:])
+        hourstr = timestr[0:2]
+        minutestr = timestr[2:]
 
-    if isominute > 60:
+    minute = _split_decimal(minutestr) #Minute may now be a fraction
+
+    if compat.isdecimal(hourstr) is False or minute is None:
+        return None
+
+    return (int(hourstr), minute[0], minute[1])
+
+def _build_minute_time(isohour, isominute, fractionstr):
+    #fractionstr is the digits of the decimal fraction of the minute, if any
+    return datetime.time(*_minute_time_fields(isohour, isominute, fractionstr))
+
+def _minute_time_fields(isohour, isominute, fractionstr):
+    if isominute > 60 or (isominute == 60 and _fraction_is_zero(fractionstr) is False):
         raise ValueError('ISO 8601 minute element cannot be greater than 60.')
 
     if isohour == 24:
-        return datetime.time(hour=0, minute=0)
+        return (0, 0, 0, 0)
 
-    #Since the time constructor doesn't handle fractional minutes, we put
-    #the minutes in to a timedelta, and add it to the time before returning
-    minutesdelta = datetime.timedelta(minutes = isominute)
+    if isohour > 24:
+        raise ValueError('ISO 8601 hour element cannot be greater than 24.')
 
-    return _build_time(datetime.time(hour=isohour), minutesdelta)
+    #Since the time constructor doesn't handle fractional minutes, the
+    #fraction is converted to microseconds and carried up
+    return _time_fields(isohour, isominute, 0, _fraction_to_microseconds(fractionstr, 60000000))
 
 def _parse_second_time(timestr):
     #Format must be hhmmss, hhmmss., hh:mm:ss or hh:mm:ss.
+    return _build_second_time(*_check_fields(_split_second_time(timestr)))
+
+def _split_second_time(timestr):
     if timestr.count(':') == 2:
         #hh:mm:ss or hh:mm:ss.
-        timestrarray = timestr.split(':')
-
-        isohour = int(timestrarray[0])
-        isominute = int(timestrarray[1])
-
-        #Since the time constructor doesn't handle fractional seconds, we put
-        #the seconds in to a timedelta, and add it to the time before returning
-        secondsdelta = datetime.timedelta(seconds = float(timestrarray[2]))
+        hourstr, minutestr, secondstr = timestr.split(':')
     else:
         #hhmmss or hhmmss.
-        isohour = int(timestr[0:2])
-        isominute = int(timestr[2:4])
+        hourstr = timestr[0:2]
+        minutestr = timestr[2:4]
+        secondstr = timestr[4:]
 
-        #Since the time constructor doesn't handle fractional seconds, we put
-        #the seconds in to a timedelta, and add it to the time before returning
-        secondsdelta = datetime.timedelta(seconds = float(timestr[4:]))
+    second = _split_decimal(secondstr)
 
-    if secondsdelta.seconds >= 60:
+    if compat.isdecimal(hourstr) is False or compat.isdecimal(minutestr) is False or second is None:
+        return None
+
+    return (int(hourstr), int(minutestr), second[0], second[1])
+
+def _build_second_time(isohour, isominute, isosecond, fractionstr):
+    #fractionstr is the digits of the decimal fraction of the second, if any
+    return datetime.time(*_second_time_fields(isohour, isominute, isosecond, fractionstr))
+
+def _second_time_fields(isohour, isominute, isosecond, fractionstr):
+    #Since the time constructor doesn't handle fractional seconds, the
+    #fraction is converted to microseconds, rounding may carry it in to
+    #the seconds
+    isomicrosecond = _fraction_to_microseconds(fractionstr, 1000000)
+
+    if isomicrosecond == 1000000:
+        isosecond += 1
+        isomicrosecond = 0
+
+    if isosecond >= 60:
         #https://bitbucket.org/nielsenb/aniso8601/issues/13/parsing-of-leap-second-gives-wildly
         raise ValueError('Seconds must be less than 60.')
 
@@ -203,16 +363,87 @@ def _parse_second_time(timestr):
 
     if isohour == 24:
         #Midnight, see 4.2.1, 4.2.3
-        return datetime.time(hour=0, minute=0)
+        return (0, 0, 0, 0)
+
+    #The hour and minute are range checked as the time constructor does
+    if isohour > 23:
+        raise ValueError('hour must be in 0..23')
+
+    if isominute > 59:
+        raise ValueError('minute must be in 0..59')
+
+    return (isohour, isominute, isosecond, isomicrosecond)
+
+def _build_time(hours, minutes, seconds, microseconds):
+    #Builds a time from the given elements, any overflow is carried up to
+    #the next element, times past midnight wrap around to the next day
+    return datetime.time(*_time_fields(hours, minutes, seconds, microseconds))
+
+def _time_fields(hours, minutes, seconds, microseconds):
+    carry, microseconds = divmod(microseconds, 1000000)
+    carry, seconds = divmod(seconds + carry, 60)
+    carry, minutes = divmod(minutes + carry, 60)
+
+    return ((hours + carry) % 24, minutes, seconds, microseconds)
 
-    return _build_time(datetime.time(hour=isohour, minute=isominute),
-                      secondsdelta)
+def _check_fields(fields):
+    #Raises if a _split_* function found the string wasn't a valid time
+    if fields is None:
+        raise build_exception(ErrorCode.InvalidTime)
 
-def _build_time(time, delta):
-    #Combine today's date (just so we have a date object), the time, the
-    #delta, and return the time component
-    base_datetime = datetime.datetime.combine(datetime.date.today(), time)
-    return (base_datetime + delta).time()
+    return fields
+
+def _split_decimal(valuestr):
+    #Splits the lowest order time element in to its integer value, and the
+    #digits of its decimal fraction, for instance, given:
+    #valuestr = '28.5124'
+    #
+    #returns (28, '5124')
+    #
+    #None is returned if either isn't digits, int() would also allow signs,
+    #whitespace and underscores
+    integerstr, _, fractionstr = valuestr.partition('.')
+
+    if compat.isdecimal(integerstr) is False or (fractionstr != '' and compat.isdecimal(fractionstr) is False):
+        return None
+
+    return (int(integerstr), fractionstr)
+
+def _fraction_is_zero(fractionstr):
+    #The builders are also given the digits of the fraction as bytes, by
+    #the stream parsers, so only len and int are used on them
+    return len(fractionstr) == 0 or int(fractionstr) == 0
+
+def _fraction_to_microseconds(fractionstr, unitmicroseconds):
+    #Given the digits of a decimal fraction of a unit unitmicroseconds long,
+    #returns the number of microseconds represented, rounded half to even
+    #as timedelta does
+    if len(fractionstr) == 0:
+        return 0
+
+    if unitmicroseconds == 1000000 and len(fractionstr) <= 6:
+        #A fraction of a second to microsecond precision or less is exact
+        return int(fractionstr) * 10 ** (6 - len(fractionstr))
+
+    microseconds, remainder = divmod(int(fractionstr) * unitmicroseconds, 10 ** len(fractionstr))
+
+    #Round half to even
+    remainder *= 2
+
+    if remainder > 10 ** len(fractionstr) or (remainder == 10 ** len(fractionstr) and microseconds % 2 == 1):
+        microseconds += 1
+
+    return microseconds
+
+def _parse_tzinfo(tzstr):
+    #tzstr is the UTC offset split from a time string, None if no offset was
+    #given, Z, or ±hh:mm, ±hhmm, ±hh
+    if tzstr is None:
+        return None
+    elif tzstr == 'Z':
+        return build_utcoffset('UTC', datetime.timedelta(hours=0))
+    else:
+        return parse_timezone(tzstr)
 
 def _split_tz(isotimestr):
     if isotimestr.find('+') != -1:
@@ -234,3 +465,21 @@ _resolution_map = {
     TimeResolution.Minutes: _parse_minute_time,
     TimeResolution.Seconds: _parse_second_time
 }
+
+_split_map = {
+    TimeResolution.Hours: _split_decimal,
+    TimeResolution.Minutes: _split_minute_time,
+    TimeResolution.Seconds: _split_second_time
+}
+
+_build_map = {
+    TimeResolution.Hours: _build_hour_time,
+    TimeResolution.Minutes: _build_minute_time,
+    TimeResolution.Seconds: _build_second_time
+}
+
+_fields_map = {
+    TimeResolution.Hours: _hour_time_fields,
+    TimeResolution.Minutes: _minute_time_fields,
+    TimeResolution.Seconds: _second_time_fields
+}
@@ -6,64 +6,211 @@
 # This software may be modified and distributed under the terms
 # of the BSD license.  See the LICENSE file for details.
 
+import collections
 import datetime
 
+from aniso8601 import compat, speedups
+from aniso8601.error import ErrorCode, build_exception
+
+#Offsets are interned, so repeated offset strings share a single UTCOffset.
+#They are interned by (name, utcdelta), the maximum size is the number of
+#offsets interned. Equal offsets with different names, '+01', '+0100' and
+#'+01:00', say, are intentionally interned separately, as their tzname()
+#differs, so they aren't equal. Interned offsets parsed from a string can
+#also be found by that string, which takes no more room. Once full, new
+#offsets are still built but no longer cached.
+UTCOFFSET_CACHE_MAXSIZE = 1024
+
+UTCOffsetCacheInfo = collections.namedtuple('UTCOffsetCacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+#The interned offsets, by (name, utcdelta), and those parsed from a string,
+#by the string
+_utcoffset_interned = {}
+_utcoffset_cache = {}
+_utcoffset_cache_hits = 0
+_utcoffset_cache_misses = 0
+
 def parse_timezone(tzstr):
     #tzstr can be ±hh:mm, ±hhmm, ±hh, the Z case is handled elsewhere
+    global _utcoffset_cache_hits
+
+    if isinstance(tzstr, compat.str_types) is False:
+        tzstr = compat.decode(tzstr)
+
+    utcoffset = _utcoffset_cache.get(tzstr)
+
+    if utcoffset is not None:
+        _utcoffset_cache_hits += 1
+        return utcoffset
+
+    utcoffset = _parse_timezone(tzstr)
+
+    #The name is tzstr, so there is at most one string for each interned
+    #offset
+    if _utcoffset_interned.get((tzstr, utcoffset._utcdelta)) is utcoffset:
+        _utcoffset_cache[tzstr] = utcoffset
+
+    return utcoffset
+
+def _parse_timezone(tzstr):
+    if speedups.compiled is not None:
+        utcdelta = speedups.compiled.parse_timezone(tzstr)
+
+        if utcdelta is not None:
+            return build_utcoffset(tzstr, utcdelta)
+
+    fields = _split_timezone(tzstr)
+
+    if fields is None:
+        field = _timezone_field_error(tzstr)
+
+        if field is not None:
+            #int() can't read the field, its message is raised, as it
+            #always has been
+            raise build_exception(ErrorCode.TimezoneNotInteger, field[0])
+
+        raise build_exception(ErrorCode.InvalidTimezone)
+
+    sign, tzhour, tzminute = fields
+
+    if sign == '+':
+        return build_utcoffset(tzstr, datetime.timedelta(hours=tzhour, minutes=tzminute))
+    else:
+        if tzhour == 0 and tzminute == 0:
+            raise build_exception(ErrorCode.NegativeZeroOffset)
+        else:
+            return build_utcoffset(tzstr, -datetime.timedelta(hours=tzhour, minutes=tzminute))
+
+def _split_timezone(tzstr):
+    #Returns a tuple of the sign, hours and minutes of tzstr, ±hh:mm, ±hhmm
+    #or ±hh, or None if it isn't laid out as an offset, without raising, the
+    #validators share it
+    #
+    #The fields are read with int(), so, as they always have been, signs,
+    #whitespace and underscores are allowed in them
+    fields = _timezone_fields(tzstr)
+
+    if fields is None:
+        return None
+
+    hourstr, minutestr, _ = fields
+
+    if compat.isint(hourstr) is False or compat.isint(minutestr) is False:
+        return None
+
+    return (tzstr[0], int(hourstr), int(minutestr))
+
+def _timezone_field_error(tzstr):
+    #Returns a tuple of the first field of tzstr int() can't read, and its
+    #position, or None if tzstr isn't laid out as an offset, or it can read
+    #them all
+    fields = _timezone_fields(tzstr)
+
+    if fields is None:
+        return None
+
+    hourstr, minutestr, minuteposition = fields
+
+    if compat.isint(hourstr) is False:
+        return (hourstr, 1)
+
+    if compat.isint(minutestr) is False:
+        return (minutestr, minuteposition)
 
+    return None
+
+def _timezone_fields(tzstr):
+    #Returns a tuple of the text of the hour and minute fields of tzstr,
+    #and the position of the minute field, or None if it isn't laid out as
+    #an offset
     tzstrlen = len(tzstr)
 
     if tzstrlen == 6:
         #±hh:mm
-        tzhour = int(tzstr[1:3])
-        tzminute = int(tzstr[4:6])
-
-        if tzstr[0] == '+':
-            return build_utcoffset(tzstr, datetime.timedelta(hours=tzhour, minutes=tzminute))
-        else:
-            if tzhour == 0 and tzminute == 0:
-                raise ValueError('Negative ISO 8601 time offset cannot be 0.')
-            else:
-                return build_utcoffset(tzstr, -datetime.timedelta(hours=tzhour, minutes=tzminute))
+        return (tzstr[1:3], tzstr[4:6], 4)
     elif tzstrlen == 5:
         #±hhmm
-        tzhour = int(tzstr[1:3])
-        tzminute = int(tzstr[3:5])
-
-        if tzstr[0] == '+':
-            return build_utcoffset(tzstr, datetime.timedelta(hours=tzhour, minutes=tzminute))
-        else:
-            if tzhour == 0 and tzminute == 0:
-                raise ValueError('Negative ISO 8601 time offset cannot be 0.')
-            else:
-                return build_utcoffset(tzstr, -datetime.timedelta(hours=tzhour, minutes=tzminute))
+        return (tzstr[1:3], tzstr[3:5], 3)
     elif tzstrlen == 3:
         #±hh
-        tzhour = int(tzstr[1:3])
+        return (tzstr[1:3], '0', 3)
 
-        if tzstr[0] == '+':
-            return build_utcoffset(tzstr, datetime.timedelta(hours=tzhour))
-        else:
-            if tzhour == 0:
-                raise ValueError('Negative ISO 8601 time offset cannot be 0.')
-            else:
-                return build_utcoffset(tzstr, -datetime.timedelta(hours=tzhour))
-    else:
-        raise ValueError('String is not a valid ISO 8601 time offset.')
+    return None
 
 def build_utcoffset(name, utcdelta):
-    #We build an offset in this manner since the
-    #tzinfo class must have an init that can
-    #"method that can be called with no arguments"
+    #Returns the interned UTCOffset with the given name and delta, building
+    #it if it hasn't been seen before
+    global _utcoffset_cache_hits, _utcoffset_cache_misses
+
+    key = (name, utcdelta)
+    utcoffset = _utcoffset_interned.get(key)
+
+    if utcoffset is not None:
+        _utcoffset_cache_hits += 1
+        return utcoffset
+
+    _utcoffset_cache_misses += 1
+
+    utcoffset = UTCOffset(name, utcdelta)
+
+    if len(_utcoffset_interned) < UTCOFFSET_CACHE_MAXSIZE:
+        _utcoffset_interned[key] = utcoffset
 
-    returnoffset = UTCOffset()
+    return utcoffset
 
-    returnoffset.setname(name)
-    returnoffset.setutcdelta(utcdelta)
+def utcoffset_cache_info():
+    #Returns the hits, misses, maximum size and current size of the
+    #UTCOffset cache
+    return UTCOffsetCacheInfo(_utcoffset_cache_hits, _utcoffset_cache_misses, UTCOFFSET_CACHE_MAXSIZE, len(_utcoffset_interned))
 
-    return returnoffset
+def clear_utcoffset_cache():
+    #Empties the UTCOffset cache and resets its statistics
+    global _utcoffset_cache_hits, _utcoffset_cache_misses
+
+    _utcoffset_interned.clear()
+    _utcoffset_cache.clear()
+    _utcoffset_cache_hits = 0
+    _utcoffset_cache_misses = 0
 
 class UTCOffset(datetime.tzinfo):
+    #UTCOffset objects are immutable, so they can be shared, build_utcoffset
+    #should be used to get one
+    __slots__ = ('_name', '_utcdelta')
+
+    def __init__(self, name=None, utcdelta=None):
+        #The tzinfo class must have an init that can be called with no
+        #arguments
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_utcdelta', utcdelta)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('UTCOffset objects are immutable.')
+
+    def __delattr__(self, name):
+        raise AttributeError('UTCOffset objects are immutable.')
+
+    def __reduce__(self):
+        #Unpickled offsets are interned as well
+        return (build_utcoffset, (self._name, self._utcdelta))
+
+    def __eq__(self, other):
+        if isinstance(other, UTCOffset) is False:
+            return NotImplemented
+
+        return self._name == other._name and self._utcdelta == other._utcdelta
+
+    def __ne__(self, other):
+        #Python 2 doesn't derive __ne__ from __eq__
+        result = self.__eq__(other)
+
+        if result is NotImplemented:
+            return result
+
+        return not result
+
+    def __hash__(self):
+        return hash((self._name, self._utcdelta))
+
     def __repr__(self):
         if self._utcdelta >= datetime.timedelta(hours=0):
             return '+{0} UTC'.format(self._utcdelta)
@@ -93,12 +240,6 @@ class UTCOffset(datetime.tzinfo):
                 else:
                     return '-{0} days, {1}:{2:02}:{3:02} UTC'.format(correctedDays, hours, minutes, seconds)
 
-    def setname(self, name):
-        self._name = name
-
-    def setutcdelta(self, utcdelta):
-        self._utcdelta = utcdelta
-
     def utcoffset(self, dt):
         return self._utcdelta
 
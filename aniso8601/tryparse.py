@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+#The try_parse_* functions parse a string as the matching parse_* function
+#would, but return a ParseResult rather than raising. For a string that
+#would be parsed, its value is the parsed value, and its error and position
+#are None. Otherwise, its value is None, and its error and position are the
+#ErrorCode, and the offset of the character, of the first problem the
+#parser would find, as the validators report them, see validate.py.
+#
+#The string is scanned, and only built once it is known to be valid, so no
+#exception is raised, or caught, for an invalid string.
+
+import collections
+import datetime
+
+from aniso8601 import compat, speedups
+from aniso8601.date import _resolution_map as _date_build_map
+from aniso8601.duration import _build_duration_prescribed, _has_any_component, _parse_duration_combined, \
+     _split_duration_prescribed
+from aniso8601.error import ErrorCode
+from aniso8601.interval import _parse_interval_parts
+from aniso8601.time import _build_map as _time_build_map, _parse_tzinfo
+from aniso8601.timezone import parse_timezone
+from aniso8601.validate import _check_duration_values, _check_timezone, _decode, _duration_values, _scan_date, \
+     _scan_datetime, _scan_duration_combined, _scan_interval, _scan_time
+
+ParseResult = collections.namedtuple('ParseResult', ['value', 'error', 'position'])
+
+_new_result = tuple.__new__
+
+def try_parse_date(isodatestr):
+    #Parses isodatestr as parse_date would, returning a ParseResult
+    if speedups.compiled is not None:
+        result = speedups.compiled.parse_date(isodatestr)
+
+        if result is not None:
+            return _success(result)
+
+    isodatestr, error = _decode(isodatestr)
+
+    if error is None:
+        error, classification = _scan_date(isodatestr)
+
+        if error is None:
+            return _success(_build_date(classification))
+
+    return _failure(error)
+
+def try_parse_time(isotimestr):
+    #Parses isotimestr as parse_time would, returning a ParseResult
+    if speedups.compiled is not None:
+        result = speedups.compiled.parse_time(isotimestr, _parse_tzinfo)
+
+        if result is not None:
+            return _success(result)
+
+    isotimestr, error = _decode(isotimestr)
+
+    if error is None:
+        error, classification, tzstr = _scan_time(isotimestr)
+
+        if error is None:
+            return _success(_build_time(classification, tzstr))
+
+    return _failure(error)
+
+def try_parse_datetime(isodatetimestr, delimiter='T'):
+    #Parses isodatetimestr as parse_datetime would, returning a ParseResult
+    if speedups.compiled is not None:
+        result = speedups.compiled.parse_datetime(isodatetimestr, delimiter, _parse_tzinfo)
+
+        if result is not None:
+            return _success(result)
+
+    isodatetimestr, error = _decode(isodatetimestr)
+
+    if error is None:
+        error, dateclassification, timeparts = _scan_datetime(isodatetimestr, compat.decode(delimiter))
+
+        if error is None:
+            return _success(datetime.datetime.combine(_build_date(dateclassification), _build_time(*timeparts)))
+
+    return _failure(error)
+
+def try_parse_timezone(tzstr):
+    #Parses tzstr, ±hh:mm, ±hhmm or ±hh, as parse_timezone would, returning
+    #a ParseResult
+    tzstr, error = _decode(tzstr)
+
+    if error is None:
+        if tzstr == 'Z':
+            #parse_timezone leaves Z to the time parsers
+            error = (ErrorCode.InvalidTimezone, 0)
+        else:
+            error = _check_timezone(tzstr)
+
+        if error is None:
+            return _success(parse_timezone(tzstr))
+
+    return _failure(error)
+
+def try_parse_duration(isodurationstr, relative=False):
+    #Parses isodurationstr as parse_duration would, returning a ParseResult
+    isodurationstr, error = _decode(isodurationstr)
+
+    if error is None:
+        if isodurationstr[:1] != 'P':
+            error = (ErrorCode.DurationPrefix, 0)
+        elif _has_any_component(isodurationstr, ['Y', 'M', 'D', 'H', 'S', 'W']) is True:
+            error, dateelements, timeelements = _split_duration_prescribed(isodurationstr)
+
+            if error is None:
+                error, values = _duration_values(isodurationstr, dateelements, timeelements)
+
+                if error is None:
+                    error = _check_duration_values(values, relative)[0]
+
+                    if error is None:
+                        return _success(_build_duration_prescribed(*(values + (relative,))))
+        else:
+            error = _scan_duration_combined(isodurationstr, relative)[0]
+
+            if error is None:
+                return _success(_parse_duration_combined(isodurationstr, relative))
+
+    return _failure(error)
+
+def try_parse_interval(isointervalstr, intervaldelimiter='/', datetimedelimiter='T', relative=False):
+    #Parses isointervalstr as parse_interval would, returning a ParseResult
+    #of the (start, end) tuple
+    isointervalstr, error = _decode(isointervalstr)
+
+    if error is None:
+        intervaldelimiter = compat.decode(intervaldelimiter)
+        datetimedelimiter = compat.decode(datetimedelimiter)
+
+        error = _scan_interval(isointervalstr, intervaldelimiter, datetimedelimiter, relative)
+
+        if error is None:
+            interval_parts = _parse_interval_parts(isointervalstr, intervaldelimiter, datetimedelimiter, relative)
+
+            return _success((interval_parts[0], interval_parts[1]))
+
+    return _failure(error)
+
+def _success(value):
+    #The results are built with tuple.__new__, which is faster than
+    #ParseResult's own constructor
+    return _new_result(ParseResult, (value, None, None))
+
+def _failure(error):
+    return _new_result(ParseResult, (None, error[0], error[1]))
+
+def _build_date(classification):
+    #Builds the date the scanner has checked
+    resolution, fields = classification
+
+    return _date_build_map[resolution](*fields)
+
+def _build_time(classification, tzstr):
+    #Builds the time the scanner has checked, with its UTC offset
+    resolution, fields = classification
+    result = _time_build_map[resolution](*fields)
+
+    if tzstr is None:
+        return result
+
+    return result.replace(tzinfo=_parse_tzinfo(tzstr))
@@ -0,0 +1,750 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016, Brandon Nielsen
+# All rights reserved.
+#
+# This software may be modified and distributed under the terms
+# of the BSD license.  See the LICENSE file for details.
+
+#The validate_* functions check a string as the matching parse_* function
+#would, sharing its grammar, but without building any date, time or
+#duration objects, and without raising. They return True if the string
+#would be parsed, False otherwise, or, with detail=True, None if the
+#string would be parsed, and an (ErrorCode, position) tuple of the first
+#problem the parser would find otherwise. The position is the offset of
+#the character the problem was found at, see error.py for the codes.
+#
+#Bytes-like strings are checked as the parsers would decode them, the
+#position is then the offset of the decoded character.
+#
+#Dates, times and date times the compiled parsers handle, see speedups.py,
+#are accepted by them, everything else is scanned in pure Python.
+
+import math
+import re
+
+from aniso8601 import compat, speedups
+from aniso8601.date import _classify_date, _date_layout_error, _MAX_ORDINAL
+from aniso8601.duration import _has_any_component, _split_duration_prescribed
+from aniso8601.error import ErrorCode
+from aniso8601.resolution import DateResolution, TimeResolution
+from aniso8601.time import _classify_time, _fraction_is_zero, _fraction_to_microseconds, _split_tz
+from aniso8601.timezone import _split_timezone, _timezone_field_error, _utcoffset_cache
+
+#A timedelta can't be longer than 999999999 days
+_MAX_TIMEDELTA_SECONDS = 999999999 * 86400
+
+_DAYS_BEFORE_MONTH = (None, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+_DAYS_IN_MONTH = (None, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+#The starts of the layouts of the date formats, 0 is any digit, a string
+#that isn't a date is reported at the first character none of them match
+_DATE_LAYOUT_PREFIXES = frozenset([layout[:index] for layout in ('0000-00-00', '00000000', '0000-00', '0000-W00-0', '0000W000', '0000-W00',
+                                                                  '0000W00', '0000-000', '0000000', '0000')
+                                   for index in compat.range(len(layout) + 1)])
+
+#Digits are 0 in the shape of a date, as isdecimal finds them
+_DIGIT_RE = re.compile(r'\d', re.UNICODE)
+
+#The positions of the fields of each date resolution, by string length
+_DATE_FIELD_POSITIONS = {
+    (DateResolution.Month, 7): (0, 5),
+    (DateResolution.Week, 8): (0, 6),
+    (DateResolution.Week, 7): (0, 5),
+    (DateResolution.Weekday, 10): (0, 6, 9),
+    (DateResolution.Weekday, 8): (0, 5, 7),
+    (DateResolution.Day, 10): (0, 5, 8),
+    (DateResolution.Day, 8): (0, 4, 6),
+    (DateResolution.Ordinal, 8): (0, 5),
+    (DateResolution.Ordinal, 7): (0, 4)
+}
+
+def validate_date(isodatestr, detail=False):
+    #Checks isodatestr as parse_date would parse it
+    if speedups.compiled is not None and speedups.compiled.validate_date(isodatestr) is True:
+        return _result(None, detail)
+
+    isodatestr, error = _decode(isodatestr)
+
+    if error is None:
+        error = _scan_date(isodatestr)[0]
+
+    return _result(error, detail)
+
+def validate_time(isotimestr, detail=False):
+    #Checks isotimestr as parse_time would parse it
+    if speedups.compiled is not None and speedups.compiled.validate_time(isotimestr) is True:
+        return _result(None, detail)
+
+    isotimestr, error = _decode(isotimestr)
+
+    if error is None:
+        error = _scan_time(isotimestr)[0]
+
+    return _result(error, detail)
+
+def validate_datetime(isodatetimestr, delimiter='T', detail=False):
+    #Checks isodatetimestr as parse_datetime would parse it
+    if speedups.compiled is not None and speedups.compiled.validate_datetime(isodatetimestr, delimiter) is True:
+        return _result(None, detail)
+
+    isodatetimestr, error = _decode(isodatetimestr)
+
+    if error is None:
+        error = _scan_datetime(isodatetimestr, compat.decode(delimiter))[0]
+
+    return _result(error, detail)
+
+def validate_duration(isodurationstr, relative=False, detail=False):
+    #Checks isodurationstr as parse_duration would parse it
+    isodurationstr, error = _decode(isodurationstr)
+
+    if error is None:
+        error = _scan_duration(isodurationstr, relative)[0]
+
+    return _result(error, detail)
+
+def validate_interval(isointervalstr, intervaldelimiter='/', datetimedelimiter='T', relative=False, detail=False):
+    #Checks isointervalstr as parse_interval would parse it, including that
+    #the other end of the interval is a valid date or datetime, and that
+    #the ends can be subtracted from each other
+    isointervalstr, error = _decode(isointervalstr)
+
+    if error is None:
+        error = _scan_interval(isointervalstr, compat.decode(intervaldelimiter), compat.decode(datetimedelimiter), relative)
+
+    return _result(error, detail)
+
+def _result(error, detail):
+    if detail is True:
+        return error
+
+    return error is None
+
+def _decode(isostr):
+    #Returns a tuple of the string, decoded as the parsers would decode it,
+    #and the problem decoding it, None if there is none
+    if isinstance(isostr, compat.str_types) is True:
+        return (isostr, None)
+
+    if isinstance(isostr, compat.bytes_types) is False:
+        return (None, (ErrorCode.NotString, 0))
+
+    if isinstance(isostr, memoryview) is True:
+        isostr = isostr.tobytes()
+
+    #Invalid UTF-8 is replaced, rather than raised on, a replacement
+    #character that doesn't encode back to the same bytes was invalid
+    decodedstr = isostr.decode('utf-8', 'replace')
+    index = decodedstr.find(u'\ufffd')
+
+    if index != -1 and decodedstr.encode('utf-8') != isostr:
+        return (None, (ErrorCode.InvalidEncoding, index))
+
+    return (decodedstr, None)
+
+def _offset(error, position):
+    #Moves an error found in a part of a string to its position in the
+    #whole string
+    if error is None:
+        return None
+
+    return (error[0], error[1] + position)
+
+def _scan_date(isodatestr):
+    #Returns a tuple of the first problem with isodatestr, None if there is
+    #none, and the tuple classify_date returns for it
+    classification = _classify_date(isodatestr)
+
+    if classification is None:
+        errorcode = _date_layout_error(isodatestr)
+
+        if errorcode == ErrorCode.ExtendedYear:
+            return ((errorcode, 0), None)
+
+        #Only the first 10 characters can match a layout
+        shape = _DIGIT_RE.sub('0', isodatestr[:10])
+        position = len(shape)
+
+        while shape[:position] not in _DATE_LAYOUT_PREFIXES:
+            position -= 1
+
+        return ((errorcode, position), None)
+
+    return (_check_date_fields(classification, len(isodatestr)), classification)
+
+def _check_date_fields(classification, isodatestrlen):
+    #Returns the first value the date builders would raise on, None if
+    #there is none
+    resolution, fields = classification
+    positions = _DATE_FIELD_POSITIONS.get((resolution, isodatestrlen), (0,))
+    year = fields[0]
+
+    if resolution == DateResolution.Week or resolution == DateResolution.Weekday:
+        #As _build_week and _build_week_day check them
+        if fields[1] == 0:
+            return (ErrorCode.WeekZero, positions[1])
+
+        if year == 0:
+            return (ErrorCode.YearOutOfRange, positions[0])
+
+        ordinal = _date_ordinal(resolution, fields)
+
+        if ordinal < 1 or ordinal > _MAX_ORDINAL:
+            return (ErrorCode.DateOutOfRange, positions[0])
+
+        return None
+
+    if resolution == DateResolution.Ordinal:
+        #As _build_ordinal_date checks them
+        if fields[1] < 1 or fields[1] > 366:
+            return (ErrorCode.DayOutOfRange, positions[1])
+
+        if year == 0:
+            return (ErrorCode.YearOutOfRange, positions[0])
+
+        if _date_ordinal(resolution, fields) > _MAX_ORDINAL:
+            return (ErrorCode.DateOutOfRange, positions[0])
+
+        return None
+
+    #As the date constructor checks them, the year, then the month, then
+    #the day
+    if year == 0:
+        return (ErrorCode.YearOutOfRange, positions[0])
+
+    if resolution == DateResolution.Year:
+        return None
+
+    month = fields[1]
+
+    if month < 1 or month > 12:
+        return (ErrorCode.MonthOutOfRange, positions[1])
+
+    if resolution == DateResolution.Month:
+        return None
+
+    if fields[2] < 1 or fields[2] > _days_in_month(year, month):
+        return (ErrorCode.DayOutOfRange, positions[2])
+
+    return None
+
+def _scan_time(isotimestr):
+    #Returns a tuple of the first problem with isotimestr, None if there is
+    #none, the tuple of its TimeResolution and fields, and its UTC offset,
+    #None if it has none
+    timestr, tzstr = _split_tz(isotimestr)
+    classification = _classify_time(timestr)
+
+    if classification is None:
+        return ((ErrorCode.InvalidTime, _time_layout_position(timestr)), None, None)
+
+    #The time is built before the UTC offset is parsed
+    error = _check_time_fields(classification, timestr)
+
+    if error is None and tzstr is not None:
+        error = _offset(_check_timezone(tzstr), len(timestr))
+
+    return (error, classification, tzstr)
+
+def _time_layout_position(timestr):
+    #Returns the position of the first character that can't be part of a
+    #time, or the end of the string, if they all can be
+    for index, character in enumerate(timestr):
+        if character != ':' and character != '.' and compat.isdecimal(character) is False:
+            return index
+
+    return len(timestr)
+
+def _time_field_position(timestr, fieldindex):
+    integerstr = timestr.partition('.')[0]
+
+    if integerstr.find(':') == -1:
+        #hhmmss, hhmm, hh
+        return fieldindex * 2
+
+    #hh:mm:ss, hh:mm, the fields may be of any width
+    return sum([len(fieldstr) + 1 for fieldstr in integerstr.split(':')[:fieldindex]])
+
+def _check_time_fields(classification, timestr):
+    #Returns the first value the time builders would raise on, None if
+    #there is none
+    resolution, fields = classification
+
+    if resolution == TimeResolution.Hours:
+        #As _build_hour_time checks them
+        if fields[0] > 24:
+            return (ErrorCode.HourOutOfRange, 0)
+
+        return None
+
+    if resolution == TimeResolution.Minutes:
+        #As _build_minute_time checks them
+        hour, minute, fractionstr = fields
+
+        if minute > 60 or (minute == 60 and _fraction_is_zero(fractionstr) is False):
+            return (ErrorCode.MinuteOutOfRange, _time_field_position(timestr, 1))
+
+        if hour > 24:
+            return (ErrorCode.HourOutOfRange, 0)
+
+        return None
+
+    #As _build_second_time checks them, a fraction may round up in to the
+    #seconds
+    hour, minute, second, fractionstr = fields
+
+    if _fraction_to_microseconds(fractionstr, 1000000) == 1000000:
+        second += 1
+
+    if second >= 60:
+        return (ErrorCode.SecondOutOfRange, _time_field_position(timestr, 2))
+
+    if minute > 60:
+        return (ErrorCode.MinuteOutOfRange, _time_field_position(timestr, 1))
+
+    if hour == 24:
+        #Midnight
+        return None
+
+    #As the time constructor checks them
+    if hour > 23:
+        return (ErrorCode.HourOutOfRange, 0)
+
+    if minute == 60:
+        return (ErrorCode.MinuteOutOfRange, _time_field_position(timestr, 1))
+
+    return None
+
+def _check_timezone(tzstr):
+    #Returns the problem with the UTC offset, None if there is none, only
+    #offsets that have been parsed are cached
+    if tzstr == 'Z' or tzstr in _utcoffset_cache:
+        return None
+
+    fields = _split_timezone(tzstr)
+
+    if fields is None:
+        field = _timezone_field_error(tzstr)
+
+        if field is not None:
+            return (ErrorCode.TimezoneNotInteger, field[1])
+
+        return (ErrorCode.InvalidTimezone, 0)
+
+    sign, tzhour, tzminute = fields
+
+    if sign != '+' and tzhour == 0 and tzminute == 0:
+        return (ErrorCode.NegativeZeroOffset, 0)
+
+    return None
+
+def _scan_datetime(isodatetimestr, delimiter):
+    #Returns a tuple of the first problem with isodatetimestr, None if
+    #there is none, and the scanned date and time
+    if delimiter == '':
+        return ((ErrorCode.InvalidDatetime, 0), None, None)
+
+    #There must be exactly one delimiter
+    delimiterindex = isodatetimestr.find(delimiter)
+
+    if delimiterindex == -1:
+        return ((ErrorCode.InvalidDatetime, len(isodatetimestr)), None, None)
+
+    timestart = delimiterindex + len(delimiter)
+    extraindex = isodatetimestr.find(delimiter, timestart)
+
+    if extraindex != -1:
+        return ((ErrorCode.InvalidDatetime, extraindex), None, None)
+
+    error, dateclassification = _scan_date(isodatetimestr[:delimiterindex])
+
+    if error is not None:
+        return (error, None, None)
+
+    error, timeclassification, tzstr = _scan_time(isodatetimestr[timestart:])
+
+    if error is not None:
+        return (_offset(error, timestart), None, None)
+
+    return (None, dateclassification, (timeclassification, tzstr))
+
+def _scan_duration(isodurationstr, relative):
+    #Returns a tuple of the first problem with isodurationstr, None if there
+    #is none, and a tuple of the years, months and seconds of the duration,
+    #the years and months are always 0 unless relative is True
+    if isodurationstr[:1] != 'P':
+        return ((ErrorCode.DurationPrefix, 0), None)
+
+    if _has_any_component(isodurationstr, ['Y', 'M', 'D', 'H', 'S', 'W']) is True:
+        return _scan_duration_prescribed(isodurationstr, relative)
+
+    return _scan_duration_combined(isodurationstr, relative)
+
+def _scan_duration_prescribed(durationstr, relative):
+    error, dateelements, timeelements = _split_duration_prescribed(durationstr)
+
+    if error is not None:
+        return (error, None)
+
+    return _scan_duration_elements(durationstr, dateelements, timeelements, relative)
+
+def _scan_duration_elements(durationstr, dateelements, timeelements, relative):
+    #Returns what _scan_duration does, given the text of the elements of the
+    #date and time halves of the duration
+    error, values = _duration_values(durationstr, dateelements, timeelements)
+
+    if error is not None:
+        return (error, None)
+
+    return _check_duration_values(values, relative)
+
+def _duration_values(durationstr, dateelements, timeelements):
+    #Returns a tuple of the first element of the duration float won't
+    #convert, None if there is none, and a tuple of the years, months,
+    #weeks, days, hours, minutes and seconds of the duration
+    if timeelements is None:
+        timeelements = {}
+
+    values = []
+
+    for elements, designator in ((dateelements, 'Y'), (dateelements, 'M'), (dateelements, 'W'), (dateelements, 'D'),
+                                 (timeelements, 'H'), (timeelements, 'M'), (timeelements, 'S')):
+        valuestr = elements.get(designator)
+
+        if valuestr is None:
+            values.append(0)
+            continue
+
+        valuestr = valuestr.replace(',', '.')
+
+        #Most elements are whole numbers, which float always converts
+        if compat.isdecimal(valuestr) is False and compat.isfloat(valuestr) is False:
+            #The element ends at the first of its designator in its half
+            if elements is dateelements:
+                position = durationstr.find(designator)
+            else:
+                position = durationstr.find(designator, durationstr.find('T'))
+
+            return ((ErrorCode.InvalidDuration, position - len(valuestr)), None)
+
+        values.append(float(valuestr))
+
+    return (None, tuple(values))
+
+def _check_duration_values(values, relative):
+    #Returns a tuple of the first problem building the duration from the
+    #values of its elements, None if there is none, and a tuple of its
+    #years, months and seconds, as _scan_duration does
+    years, months, weeks, days, hours, minutes, seconds = values
+
+    days += weeks * 7
+    seconds += hours * 3600 + minutes * 60
+
+    if relative is True:
+        #int() raises on infinite years or months, anything else is kept
+        #as is by relativedelta
+        if _isfinite(years) is False or _isfinite(months) is False:
+            return ((ErrorCode.DurationOutOfRange, 0), None)
+
+        if int(years) != years or int(months) != months:
+            return ((ErrorCode.DurationRelativeFraction, 0), None)
+
+        return (None, (int(years), int(months), days * 86400 + seconds))
+
+    seconds += (years * 365 + months * 30 + days) * 86400
+
+    if not -_MAX_TIMEDELTA_SECONDS <= seconds < _MAX_TIMEDELTA_SECONDS + 86400:
+        return ((ErrorCode.DurationOutOfRange, 0), None)
+
+    return (None, (0, 0, seconds))
+
+def _scan_duration_combined(durationstr, relative):
+    #P<date>T<time>, there must be exactly one T
+    timeindex = durationstr.find('T')
+
+    if timeindex == -1:
+        return ((ErrorCode.InvalidDuration, len(durationstr)), None)
+
+    extraindex = durationstr.find('T', timeindex + 1)
+
+    if extraindex != -1:
+        return ((ErrorCode.InvalidDuration, extraindex), None)
+
+    error, dateclassification = _scan_date(durationstr[1:timeindex])
+
+    if error is not None:
+        return (_offset(error, 1), None)
+
+    error, timeclassification, _ = _scan_time(durationstr[timeindex + 1:])
+
+    if error is not None:
+        return (_offset(error, timeindex + 1), None)
+
+    #The fields of the built date and time are used
+    year, month, day = _ymd(_date_ordinal(*dateclassification))
+    seconds = _time_microseconds(timeclassification) / 1000000.0
+
+    if relative is True:
+        return (None, (year, month, day * 86400 + seconds))
+
+    return (None, (0, 0, (year * 365 + month * 30 + day) * 86400 + seconds))
+
+def _scan_interval(isointervalstr, intervaldelimiter, datetimedelimiter, relative):
+    #Returns the first problem with isointervalstr, None if there is none,
+    #in the order _parse_interval_parts would find it
+    if intervaldelimiter == '':
+        return (ErrorCode.InvalidInterval, 0)
+
+    #There must be exactly one delimiter
+    delimiterindex = isointervalstr.find(intervaldelimiter)
+
+    if delimiterindex == -1:
+        return (ErrorCode.InvalidInterval, len(isointervalstr))
+
+    secondstart = delimiterindex + len(intervaldelimiter)
+    extraindex = isointervalstr.find(intervaldelimiter, secondstart)
+
+    if extraindex != -1:
+        return (ErrorCode.InvalidInterval, extraindex)
+
+    firstpart = isointervalstr[:delimiterindex]
+    secondpart = isointervalstr[secondstart:]
+
+    if firstpart == '':
+        return (ErrorCode.InvalidInterval, 0)
+
+    if firstpart[0] == 'P':
+        #<duration>/<end>, the duration is parsed first
+        error, duration = _scan_duration(firstpart, relative)
+
+        if error is not None:
+            return error
+
+        error, end = _scan_endpoint(secondpart, datetimedelimiter)
+
+        if error is not None:
+            return _offset(error, secondstart)
+
+        if end[1] is None and firstpart.find(datetimedelimiter) != -1:
+            #The end is converted to a datetime to preserve the resolution
+            end = (end[0], 0, None)
+
+        return _check_shift(end, duration, -1, relative)
+
+    if secondpart == '':
+        return (ErrorCode.InvalidInterval, secondstart)
+
+    if secondpart[0] == 'P':
+        #<start>/<duration>, the duration is parsed first
+        error, duration = _scan_duration(secondpart, relative)
+
+        if error is not None:
+            return _offset(error, secondstart)
+
+        error, start = _scan_endpoint(firstpart, datetimedelimiter)
+
+        if error is not None:
+            return error
+
+        if start[1] is None and secondpart.find(datetimedelimiter) != -1:
+            start = (start[0], 0, None)
+
+        return _offset(_check_shift(start, duration, 1, relative), secondstart)
+
+    #<start>/<end>
+    error, start = _scan_endpoint(firstpart, datetimedelimiter)
+
+    if error is not None:
+        return error
+
+    error, end = _scan_endpoint(secondpart, datetimedelimiter)
+
+    if error is not None:
+        return _offset(error, secondstart)
+
+    #A date is combined with midnight, which is naive, and naive and aware
+    #datetimes can't be subtracted
+    startaware = start[2] is not None
+    endaware = end[2] is not None
+
+    if startaware is not endaware:
+        return (ErrorCode.IntervalTimezone, secondstart)
+
+    if startaware is True and start[2] != end[2]:
+        #The ends have different UTCOffsets, so the offsets are checked
+        #by datetime
+        if _check_utcoffset(start[2]) is False:
+            return (ErrorCode.IntervalTimezone, 0)
+
+        if _check_utcoffset(end[2]) is False:
+            return (ErrorCode.IntervalTimezone, secondstart)
+
+    return None
+
+def _scan_endpoint(isostr, datetimedelimiter):
+    #Returns a tuple of the first problem with a date or datetime end of an
+    #interval, None if there is none, and a tuple of its ordinal, the
+    #microseconds since midnight, None for a date, and its UTC offset, None
+    #if it has none
+    if isostr.find(datetimedelimiter) == -1:
+        error, classification = _scan_date(isostr)
+
+        if error is not None:
+            return (error, None)
+
+        return (None, (_date_ordinal(*classification), None, None))
+
+    if speedups.compiled is not None:
+        fields = speedups.compiled.parse_datetime_tuple(isostr, datetimedelimiter)
+
+        if fields is not None:
+            year, month, day, hour, minute, second, microsecond, _ = fields
+            tzstr = _split_tz(isostr[isostr.find(datetimedelimiter) + len(datetimedelimiter):])[1]
+
+            return (None, (_ordinal(year, month, day), ((hour * 60 + minute) * 60 + second) * 1000000 + microsecond, tzstr))
+
+    error, dateclassification, timeparts = _scan_datetime(isostr, datetimedelimiter)
+
+    if error is not None:
+        return (error, None)
+
+    timeclassification, tzstr = timeparts
+
+    return (None, (_date_ordinal(*dateclassification), _time_microseconds(timeclassification), tzstr))
+
+def _check_shift(endpoint, duration, sign, relative):
+    #Returns the problem adding sign times the duration to the end of an
+    #interval, as the date, datetime, timedelta and relativedelta addition
+    #would raise on it, None if there is none
+    ordinal, microseconds, _ = endpoint
+    years, months, seconds = duration
+
+    if _isfinite(seconds) is False:
+        return (ErrorCode.IntervalOutOfRange, 0)
+
+    if years != 0 or months != 0:
+        #relativedelta replaces the year and month, the day is clamped to
+        #the end of the month, the rest is added as a timedelta
+        year, month, day = _ymd(ordinal)
+        year, month = divmod(year * 12 + month - 1 + sign * (years * 12 + months), 12)
+        month += 1
+
+        if year < 1 or year > 9999:
+            return (ErrorCode.IntervalOutOfRange, 0)
+
+        ordinal = _ordinal(year, month, min(day, _days_in_month(year, month)))
+
+    if microseconds is None:
+        #Only the days of a timedelta are added to a date, subtracting a
+        #timedelta subtracts its days, a relativedelta is negated first
+        if relative is True:
+            ordinal += int(math.floor(sign * seconds / 86400))
+        else:
+            ordinal += sign * int(math.floor(seconds / 86400))
+
+        if ordinal < 1 or ordinal > _MAX_ORDINAL:
+            return (ErrorCode.IntervalOutOfRange, 0)
+
+        return None
+
+    microseconds += (ordinal - 1) * 86400000000 + sign * int(round(seconds * 1000000))
+
+    if microseconds < 0 or microseconds >= _MAX_ORDINAL * 86400000000:
+        return (ErrorCode.IntervalOutOfRange, 0)
+
+    return None
+
+def _check_utcoffset(tzstr):
+    #Returns True if the UTC offset is within a day, as datetime requires
+    #it to be when it's used
+    if tzstr == 'Z':
+        return True
+
+    _, tzhour, tzminute = _split_timezone(tzstr)
+
+    return abs(tzhour * 60 + tzminute) < 1440
+
+def _date_ordinal(resolution, fields):
+    #Returns the ordinal of the date the builder for the resolution builds
+    #from the fields, once they've been checked
+    if resolution == DateResolution.Year:
+        return _ordinal(fields[0], 1, 1)
+    elif resolution == DateResolution.Month:
+        return _ordinal(fields[0], fields[1], 1)
+    elif resolution == DateResolution.Day:
+        return _ordinal(fields[0], fields[1], fields[2])
+    elif resolution == DateResolution.Ordinal:
+        return _ordinal(fields[0], 1, 1) + fields[1] - 1
+
+    #The ISO year starts on the Monday of the week containing the 4th of
+    #January
+    fourthjanuary = _ordinal(fields[0], 1, 4)
+    ordinal = fourthjanuary - (fourthjanuary + 6) % 7 + (fields[1] - 1) * 7
+
+    if resolution == DateResolution.Weekday:
+        ordinal += fields[2] - 1
+
+    return ordinal
+
+def _time_microseconds(classification):
+    #Returns the microseconds since midnight of the time the builder for
+    #the resolution builds from the fields, once they've been checked
+    resolution, fields = classification
+
+    if fields[0] == 24 and (resolution != TimeResolution.Hours or _fraction_is_zero(fields[1]) is True):
+        #Midnight
+        return 0
+
+    if resolution == TimeResolution.Hours:
+        microseconds = fields[0] * 3600000000 + _fraction_to_microseconds(fields[1], 3600000000)
+    elif resolution == TimeResolution.Minutes:
+        microseconds = fields[0] * 3600000000 + fields[1] * 60000000 + _fraction_to_microseconds(fields[2], 60000000)
+    else:
+        microseconds = fields[0] * 3600000000 + fields[1] * 60000000 + fields[2] * 1000000 + _fraction_to_microseconds(fields[3], 1000000)
+
+    #Times past midnight wrap around, as _build_time does
+    return microseconds % 86400000000
+
+def _ordinal(year, month, day):
+    #The ordinal of the date, as date.toordinal returns it
+    lastyear = year - 1
+
+    return lastyear * 365 + lastyear // 4 - lastyear // 100 + lastyear // 400 + _DAYS_BEFORE_MONTH[month] + (month > 2 and _isleap(year)) + day
+
+def _ymd(ordinal):
+    #The year, month and day of the ordinal, as date.fromordinal finds them
+    ordinal -= 1
+
+    n400, ordinal = divmod(ordinal, 146097)
+    n100, ordinal = divmod(ordinal, 36524)
+    n4, ordinal = divmod(ordinal, 1461)
+    n1, ordinal = divmod(ordinal, 365)
+
+    year = n400 * 400 + n100 * 100 + n4 * 4 + n1 + 1
+
+    if n1 == 4 or n100 == 4:
+        #The last day of a leap year
+        return (year - 1, 12, 31)
+
+    leapyear = n1 == 3 and (n4 != 24 or n100 == 3)
+    month = (ordinal + 50) >> 5
+    preceding = _DAYS_BEFORE_MONTH[month] + (month > 2 and leapyear)
+
+    if preceding > ordinal:
+        month -= 1
+        preceding -= _DAYS_IN_MONTH[month] + (month == 2 and leapyear)
+
+    return (year, month, ordinal - preceding + 1)
+
+def _days_in_month(year, month):
+    if month == 2 and _isleap(year) is True:
+        return 29
+
+    return _DAYS_IN_MONTH[month]
+
+def _isleap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+def _isfinite(value):
+    return math.isinf(value) is False and math.isnan(value) is False
@@ -1,7 +1,7 @@
 try:
-    from setuptools import setup
+    from setuptools import setup, Extension
 except ImportError:
-    from distutils import setup
+    from distutils.core import setup, Extension
 
 readme = open('README.rst', 'r')
 README_TEXT = readme.read()
@@ -16,7 +16,11 @@ setup(
     author_email='nielsenb@jetfuse.net',
     url='https://bitbucket.org/nielsenb/aniso8601',
     install_requires=['python-dateutil'],
+    extras_require={'numpy': ['numpy']},
     packages=['aniso8601'],
+    #The compiled parsers are optional, the pure Python parsers are used if
+    #they fail to build
+    ext_modules=[Extension('aniso8601._speedups', ['aniso8601/_speedups.c'], optional=True)],
     classifiers=[
         'Intended Audience :: Developers',
         'License :: OSI Approved :: BSD License',